@@ -0,0 +1,303 @@
+import argparse    # Opciones de línea de comandos
+import csv         # Salida en CSV
+import datetime    # Fechas de las filas sintéticas
+import os          # Tamaños de archivo, fsync y /dev/null
+import random      # Generación reproducible de las filas sintéticas
+import shutil      # Para borrar la carpeta temporal al terminar
+import statistics  # Mediana de las repeticiones
+import tempfile    # Carpeta temporal para los archivos generados
+import time        # perf_counter para medir
+from datetime import timezone
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List
+from benchmarks.bench_sorts import commit_actual, guardar_json, _zipf
+from export.pipeline import ESCRITORES, escritor
+from export.compresion import CODECS
+from load.loadcsv import iter_csv_cantidad, load_csv_cantidad
+from load.csv_paralelo import load_csv_cantidad_paralelo
+from load.loadjson import iter_json_cantidad, load_json_cantidad
+from load.loadcolumnar import iter_columnar_cantidad
+from load.column_cache import load_cantidad_cache
+
+# Filas de las tablas sintéticas por defecto
+FILAS = (10_000, 100_000, 1_000_000)
+
+# Filas por lote, como las que entrega iter_batches
+TAM_LOTE = 10_000
+
+REPETICIONES = 1
+SEMILLA = 42
+
+FORMAS_PAGO = ("Efectivo", "Tarjeta", "Transferencia", "Cheque")
+
+MB = 1024 * 1024
+
+
+def filas_sinteticas(n: int, semilla: int = SEMILLA, batch_size: int = TAM_LOTE) -> Iterable[list[tuple]]:
+    """
+    Genera por lotes `n` filas con las mismas columnas y tipos que devuelve MySQL para
+    UN.VENTAS (int, date, Decimal, None, str), para medir sin conexión a la base de datos.
+    CANTIDAD sigue una distribución tipo Zipf, como la columna real.
+    """
+    rng = random.Random(semilla)
+    inicio = datetime.date(2020, 1, 1)
+    for desde in range(0, n, batch_size):
+        m = min(batch_size, n - desde)
+        cantidades = _zipf(m, rng)
+        yield [
+            (
+                desde + i + 1,                                     # ID_VENTA
+                inicio + datetime.timedelta(days=rng.randrange(1500)),  # FECHA_VENTA
+                rng.randint(1, 50_000),                            # ID_CLIENTE
+                rng.randint(1, 500),                               # ID_EMPLEADO
+                rng.randint(1, 5_000),                             # ID_PRODUCTO
+                cantidades[i],                                     # CANTIDAD
+                Decimal(rng.randint(100, 1_000_000)) / 100,        # PRECIO_UNITARIO
+                None if rng.random() < 0.7 else Decimal(rng.randint(1, 50)),  # DESCUENTO
+                rng.choice(FORMAS_PAGO),                           # FORMA_PAGO
+            )
+            for i in range(m)
+        ]
+
+
+def _contar(bloques) -> int:
+    """
+    Consume un iterable de bloques y cuenta los valores leídos.
+    """
+    return sum(len(bloque) for bloque in bloques)
+
+
+# Cargadores de la columna CANTIDAD por formato: nombre → función (path) que devuelve
+# la cantidad de valores leídos. La caché se mide aparte (fría y caliente).
+LECTORES: Dict[str, Dict[str, Callable[[str], int]]] = {
+    "CSV": {
+        "iter_csv_cantidad": lambda path: _contar(iter_csv_cantidad(path, "CANTIDAD")),
+        "load_csv_cantidad": lambda path: len(load_csv_cantidad(path, "CANTIDAD")),
+        "load_csv_cantidad_paralelo": lambda path: len(load_csv_cantidad_paralelo(path, "CANTIDAD")),
+    },
+    "JSON": {
+        "iter_json_cantidad": lambda path: _contar(iter_json_cantidad(path, "CANTIDAD")),
+        "load_json_cantidad": lambda path: len(load_json_cantidad(path, "CANTIDAD")),
+    },
+    "JSON_LEGIBLE": {
+        "iter_json_cantidad": lambda path: _contar(iter_json_cantidad(path, "CANTIDAD")),
+    },
+    "NDJSON": {
+        "iter_json_cantidad": lambda path: _contar(iter_json_cantidad(path, "CANTIDAD")),
+        "load_json_cantidad": lambda path: len(load_json_cantidad(path, "CANTIDAD")),
+    },
+    "JSON_COLUMNAR": {
+        "iter_json_cantidad": lambda path: _contar(iter_json_cantidad(path, "CANTIDAD")),
+    },
+    "NPZ": {
+        "iter_columnar_cantidad": lambda path: _contar(iter_columnar_cantidad(path, "CANTIDAD")),
+    },
+}
+
+
+def _cronometrar(funcion: Callable, repeticiones: int, preparar: Callable | None = None):
+    """
+    Ejecuta `funcion` `repeticiones` veces y devuelve (mediana de los tiempos, último resultado).
+    `preparar` se llama antes de cada repetición, fuera de la medición.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        start = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - start)
+    return statistics.median(tiempos), resultado
+
+
+def _fila(formato: str, n: int, etapa: str, tiempo: float, filas: int, bytes_: int | None) -> dict:
+    """
+    Arma una fila de resultados con filas/s y MB/s de una etapa.
+    """
+    fila = {
+        "formato": formato, "n": n, "etapa": etapa, "tiempo": tiempo,
+        "filas_s": filas / tiempo if tiempo > 0 else None,
+        "mb_s": None,
+    }
+    if bytes_ is not None and tiempo > 0:
+        fila["mb_s"] = bytes_ / MB / tiempo
+    print(f"[BenchIO] {formato:<5} n={n:<9} {etapa:<32} {tiempo:9.4f} s"
+          + (f"  {fila['filas_s']:12,.0f} filas/s" if fila["filas_s"] else "")
+          + (f"  {fila['mb_s']:8.2f} MB/s" if fila["mb_s"] else ""))
+    return fila
+
+
+def medir_formato(
+    formato: str,
+    lotes: List[list[tuple]],
+    n: int,
+    carpeta: str,
+    repeticiones: int = REPETICIONES,
+    compresion: str | None = None
+) -> List[dict]:
+    """
+    Mide por separado las etapas de un formato sobre lotes ya cargados en memoria:
+    - convertir: el escritor completo hacia /dev/null (conversión de tipos y codificación,
+      sin escritura real a disco).
+    - serializar: el escritor completo hacia un archivo (incluye la conversión; la
+      diferencia con "convertir" es el costo de escribir en el sistema de archivos).
+    - fsync: forzar a disco lo escrito por "serializar".
+    - leer/<cargador>: releer la columna CANTIDAD con cada cargador de LECTORES[formato].
+    - leer/cache_fria y leer/cache_caliente: load_cantidad_cache construyendo la caché
+      desde cero y reutilizándola.
+    Con `compresion` ("gzip", "bz2" o "lzma") el formato se escribe comprimido (ver
+    export.pipeline.escritor) y se informa como "FORMATO+códec".
+    """
+    escribir, nombre = escritor(formato, compresion)
+    path = os.path.join(carpeta, nombre)
+    lectores = LECTORES[formato]
+    if compresion:
+        formato = f"{formato}+{compresion}"
+    filas: List[dict] = []
+
+    # 1. Conversión y codificación, sin disco
+    tiempo, _ = _cronometrar(lambda: escribir(iter(lotes), os.devnull), repeticiones)
+    filas.append(_fila(formato, n, "convertir", tiempo, n, None))
+
+    # 2. Escritura al archivo (sin fsync: los datos pueden quedar en la caché del sistema)
+    tiempo, _ = _cronometrar(lambda: escribir(iter(lotes), path), repeticiones)
+    tamano = os.path.getsize(path)
+    filas.append(_fila(formato, n, "serializar", tiempo, n, tamano))
+
+    # 3. fsync del archivo recién escrito
+    def sincronizar():
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+    tiempo, _ = _cronometrar(sincronizar, 1)
+    filas.append(_fila(formato, n, "fsync", tiempo, n, tamano))
+
+    # 4. Relectura con cada cargador
+    for nombre_lector, leer in lectores.items():
+        tiempo, leidos = _cronometrar(lambda: leer(path), repeticiones)
+        if leidos != n:
+            print(f"[BenchIO] {formato} {nombre_lector}: se leyeron {leidos} valores de {n}")
+        filas.append(_fila(formato, n, f"leer/{nombre_lector}", tiempo, leidos, tamano))
+
+    # 5. Caché mapeada en memoria: primera lectura (parsea y escribe) y siguientes (mmap)
+    dir_cache = os.path.join(carpeta, "cache")
+    tiempo, _ = _cronometrar(
+        lambda: len(load_cantidad_cache(path, "CANTIDAD", dir_cache=dir_cache)),
+        repeticiones,
+        preparar=lambda: shutil.rmtree(dir_cache, ignore_errors=True)
+    )
+    filas.append(_fila(formato, n, "leer/cache_fria", tiempo, n, tamano))
+    tiempo, _ = _cronometrar(
+        lambda: sum(load_cantidad_cache(path, "CANTIDAD", dir_cache=dir_cache)), repeticiones
+    )
+    filas.append(_fila(formato, n, "leer/cache_caliente", tiempo, n, tamano))
+
+    return filas
+
+
+def ejecutar_benchmark_io(
+    tamanos=FILAS,
+    formatos=tuple(ESCRITORES),
+    repeticiones: int = REPETICIONES,
+    semilla: int = SEMILLA,
+    batch_size: int = TAM_LOTE,
+    carpeta: str | None = None,
+    compresiones=(None,)
+) -> dict:
+    """
+    Para cada tamaño genera una tabla sintética (etapa "generar", el equivalente sin
+    MySQL de la consulta) y mide las etapas de cada formato con medir_formato.
+
+    Parámetros:
+    - tamanos: Cantidades de filas de las tablas sintéticas.
+    - formatos: Formatos a medir (claves de export.pipeline.ESCRITORES).
+    - repeticiones: Repeticiones de cada etapa (se informa la mediana).
+    - semilla: Semilla de las filas sintéticas.
+    - batch_size: Filas por lote.
+    - carpeta: Carpeta para los archivos generados (por defecto, una temporal que se borra).
+    - compresiones: Códecs con que se mide cada formato (None: sin comprimir).
+
+    Retorno:
+    - Diccionario { "meta": {...}, "resultados": [ {formato, n, etapa, tiempo, filas_s, mb_s}, ... ] }
+    """
+    for formato in formatos:
+        if formato not in ESCRITORES:
+            raise ValueError(f"Formato desconocido: {formato!r}. Opciones: {list(ESCRITORES)}")
+
+    meta = {
+        "commit": commit_actual(),
+        "fecha": datetime.datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeticiones": repeticiones,
+        "semilla": semilla,
+        "batch_size": batch_size,
+        "compresiones": list(compresiones),
+    }
+    resultados: List[dict] = []
+    temporal = carpeta is None
+    carpeta = carpeta or tempfile.mkdtemp(prefix="bench_io_")
+    try:
+        for n in sorted(tamanos):
+            # 1. "Consulta": generamos los lotes y los dejamos en memoria, para que las
+            #    etapas siguientes no incluyan el costo de producirlos
+            tiempo, lotes = _cronometrar(lambda: list(filas_sinteticas(n, semilla, batch_size)), 1)
+            resultados.append(_fila("-", n, "generar", tiempo, n, None))
+
+            # 2. Etapas de cada formato
+            for formato in formatos:
+                for compresion in compresiones:
+                    resultados.extend(medir_formato(formato, lotes, n, carpeta, repeticiones, compresion))
+            del lotes
+    finally:
+        if temporal:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+    return {"meta": meta, "resultados": resultados}
+
+
+def guardar_csv(reporte: dict, path: str) -> None:
+    """
+    Escribe el resumen del reporte en CSV, con el commit en cada fila.
+    """
+    columnas = ["commit", "formato", "n", "etapa", "tiempo", "filas_s", "mb_s"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columnas)
+        writer.writeheader()
+        for fila in reporte["resultados"]:
+            writer.writerow({"commit": reporte["meta"]["commit"], **fila})
+
+
+def main(argv: List[str] | None = None) -> None:
+    """
+    Punto de entrada: python -m benchmarks.bench_io [opciones] (desde src/).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark por etapas de exportación y carga.")
+    parser.add_argument("--filas", type=lambda s: [int(float(x)) for x in s.split(",")],
+                        default=list(FILAS), help="Tamaños de tabla separados por coma (p.ej. 1e4,1e5)")
+    parser.add_argument("--formatos", type=lambda s: s.split(","), default=list(ESCRITORES),
+                        help=f"Opciones: {','.join(ESCRITORES)}")
+    parser.add_argument("--compresion", type=lambda s: [None if c == "ninguna" else c for c in s.split(",")],
+                        default=[None], help=f"Códecs separados por coma: ninguna,{','.join(CODECS)}")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--lote", type=int, default=TAM_LOTE, help="Filas por lote")
+    parser.add_argument("--carpeta", default=None, help="Carpeta para los archivos (por defecto, temporal)")
+    parser.add_argument("--json", default="bench_io.json", help="Ruta de la salida JSON")
+    parser.add_argument("--csv", default="bench_io.csv", help="Ruta de la salida CSV")
+    args = parser.parse_args(argv)
+
+    reporte = ejecutar_benchmark_io(
+        tamanos=args.filas,
+        formatos=args.formatos,
+        repeticiones=args.repeticiones,
+        semilla=args.semilla,
+        batch_size=args.lote,
+        carpeta=args.carpeta,
+        compresiones=args.compresion,
+    )
+    guardar_json(reporte, args.json)
+    guardar_csv(reporte, args.csv)
+    print(f"[BenchIO] Resultados en {args.json} y {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import argparse    # Opciones de línea de comandos
+import csv         # Salida en CSV
+import gc          # Para que el recolector de basura no interrumpa una medición
+import json        # Salida en JSON
+import os          # Para ubicar el repositorio al consultar git
+import platform    # Versión de Python y sistema, para comparar corridas
+import random      # Generación reproducible de los datos de entrada
+import statistics  # Mediana y percentiles
+import subprocess  # Para leer el commit actual de git
+import time        # perf_counter para medir
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+from sort_algorithms.Sort import get_algorithms, backends
+
+# Tamaños de entrada por defecto (de 1e3 a 1e7 elementos)
+TAMANOS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Valor máximo de las distribuciones "uniforme", "ordenada" e "inversa"
+VALOR_MAX = 1_000_000
+
+# Cantidad de valores distintos en "pocos_unicos"
+VALORES_UNICOS = 10
+
+# Distribución tipo Zipf: valores 1..ZIPF_MAX con probabilidad proporcional a 1/k^ZIPF_S.
+# Se parece a la columna CANTIDAD real: muchas ventas de pocas unidades y pocas grandes.
+ZIPF_MAX = 1_000
+ZIPF_S = 1.2
+
+# Corridas por medición: las de calentamiento no se cuentan
+CALENTAMIENTO = 1
+REPETICIONES = 5
+
+# Si la mediana de un algoritmo supera este tiempo (s), no se prueba con tamaños mayores
+LIMITE_SEGUNDOS = 60.0
+
+SEMILLA = 42
+
+
+def _zipf(n: int, rng: random.Random) -> List[int]:
+    """
+    Genera n valores tipo Zipf en 1..ZIPF_MAX.
+    """
+    valores = range(1, ZIPF_MAX + 1)
+    pesos = [1 / k ** ZIPF_S for k in valores]
+    return rng.choices(valores, weights=pesos, k=n)
+
+
+# Registro de distribuciones: nombre → función (n, rng) que genera la lista de entrada
+DISTRIBUCIONES: Dict[str, Callable[[int, random.Random], List[int]]] = {
+    "uniforme": lambda n, rng: [rng.randint(0, VALOR_MAX) for _ in range(n)],
+    "ordenada": lambda n, rng: sorted(rng.randint(0, VALOR_MAX) for _ in range(n)),
+    "inversa": lambda n, rng: sorted((rng.randint(0, VALOR_MAX) for _ in range(n)), reverse=True),
+    "pocos_unicos": lambda n, rng: [rng.randrange(VALORES_UNICOS) for _ in range(n)],
+    "zipf": _zipf,
+}
+
+
+def commit_actual() -> str | None:
+    """
+    Hash del commit de git actual, para saber con qué versión del código se midió.
+    Retorna None si no se puede obtener (p.ej. fuera de un repositorio).
+    """
+    try:
+        salida = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(func: Callable, data: List[int], calentamiento: int, repeticiones: int) -> List[float]:
+    """
+    Ejecuta `func` sobre una copia nueva de `data` calentamiento + repeticiones veces y
+    devuelve los tiempos (perf_counter) de las repeticiones. La copia se hace fuera de la
+    medición y el recolector de basura se desactiva mientras corre el algoritmo.
+    """
+    tiempos = []
+    for i in range(calentamiento + repeticiones):
+        copia = list(data)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func(copia)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if i >= calentamiento:
+            tiempos.append(elapsed)
+    return tiempos
+
+
+def resumir(tiempos: List[float]) -> dict:
+    """
+    Estadísticos de una lista de tiempos: mínimo, mediana, p10, p90, media y desviación.
+    """
+    if len(tiempos) > 1:
+        deciles = statistics.quantiles(tiempos, n=10, method="inclusive")
+        p10, p90 = deciles[0], deciles[-1]
+        desviacion = statistics.stdev(tiempos)
+    else:
+        p10 = p90 = tiempos[0]
+        desviacion = 0.0
+    return {
+        "minimo": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "p10": p10,
+        "p90": p90,
+        "media": statistics.fmean(tiempos),
+        "desviacion": desviacion,
+    }
+
+
+def ejecutar_benchmark(
+    tamanos=TAMANOS,
+    distribuciones=tuple(DISTRIBUCIONES),
+    algoritmos: List[str] | None = None,
+    backend: str = "python",
+    calentamiento: int = CALENTAMIENTO,
+    repeticiones: int = REPETICIONES,
+    limite_segundos: float = LIMITE_SEGUNDOS,
+    semilla: int = SEMILLA,
+    verificar: bool = True
+) -> dict:
+    """
+    Mide cada algoritmo de Sort.backends[backend] con cada tamaño y distribución.
+
+    Parámetros:
+    - tamanos: Tamaños de entrada, de menor a mayor.
+    - distribuciones: Nombres de DISTRIBUCIONES a usar.
+    - algoritmos: Nombres de los algoritmos a medir (por defecto, todos los del backend).
+    - backend: "python", "numpy", ...
+    - calentamiento / repeticiones: Corridas descartadas y corridas medidas.
+    - limite_segundos: Si la mediana de un algoritmo lo supera, se omiten los tamaños mayores
+      para ese algoritmo y distribución.
+    - semilla: Semilla de los datos (mismo valor → mismas entradas en cada corrida).
+    - verificar: Si es True, comprueba una vez que el resultado esté ordenado.
+
+    Retorno:
+    - Diccionario { "meta": {...}, "resultados": [ {algoritmo, distribucion, n, mediana, ...}, ... ] }
+    """
+    disponibles = get_algorithms(backend)
+    algoritmos = list(algoritmos or disponibles)
+    for nombre in algoritmos:
+        if nombre not in disponibles:
+            raise ValueError(f"Algoritmo desconocido: {nombre!r}. Opciones: {list(disponibles)}")
+    for distribucion in distribuciones:
+        if distribucion not in DISTRIBUCIONES:
+            raise ValueError(f"Distribución desconocida: {distribucion!r}. Opciones: {list(DISTRIBUCIONES)}")
+
+    meta = {
+        "commit": commit_actual(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "backend": backend,
+        "calentamiento": calentamiento,
+        "repeticiones": repeticiones,
+        "semilla": semilla,
+    }
+    resultados = []
+
+    for distribucion in distribuciones:
+        omitidos = set()  # Algoritmos que ya superaron limite_segundos en esta distribución
+        for n in sorted(tamanos):
+            # 1. Los mismos datos para todos los algoritmos de este (distribución, n)
+            rng = random.Random(f"{semilla}-{distribucion}-{n}")
+            data = DISTRIBUCIONES[distribucion](n, rng)
+            esperado = sorted(data) if verificar else None
+
+            for nombre in algoritmos:
+                fila = {"algoritmo": nombre, "distribucion": distribucion, "n": n}
+                if nombre in omitidos:
+                    resultados.append({**fila, "estado": "omitido"})
+                    continue
+
+                # 2. Medimos
+                func = disponibles[nombre]
+                try:
+                    if verificar and list(func(list(data))) != esperado:
+                        raise AssertionError("el resultado no está ordenado")
+                    tiempos = medir(func, data, calentamiento, repeticiones)
+                except Exception as e:
+                    print(f"[Bench] {nombre} / {distribucion} / n={n}: error: {e}")
+                    resultados.append({**fila, "estado": f"error: {e}"})
+                    omitidos.add(nombre)
+                    continue
+
+                # 3. Resumimos y mostramos el avance
+                resumen = resumir(tiempos)
+                resultados.append({**fila, "estado": "ok", **resumen, "tiempos": tiempos})
+                print(f"[Bench] {nombre:<18} {distribucion:<13} n={n:<10} "
+                      f"mediana={resumen['mediana']:.6f} s  p90={resumen['p90']:.6f} s")
+                if resumen["mediana"] > limite_segundos:
+                    omitidos.add(nombre)
+
+    return {"meta": meta, "resultados": resultados}
+
+
+# Columnas de la salida CSV (una fila por algoritmo, distribución y tamaño)
+COLUMNAS_CSV = [
+    "commit", "backend", "algoritmo", "distribucion", "n", "estado",
+    "minimo", "mediana", "p10", "p90", "media", "desviacion",
+]
+
+
+def guardar_json(reporte: dict, path: str) -> None:
+    """
+    Escribe el reporte completo (metadatos y tiempos de cada repetición) en JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, indent=2)
+
+
+def guardar_csv(reporte: dict, path: str) -> None:
+    """
+    Escribe el resumen del reporte en CSV, con el commit y el backend en cada fila
+    para poder concatenar corridas de distintas versiones.
+    """
+    meta = reporte["meta"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNAS_CSV, extrasaction="ignore")
+        writer.writeheader()
+        for fila in reporte["resultados"]:
+            writer.writerow({"commit": meta["commit"], "backend": meta["backend"], **fila})
+
+
+def main(argv: List[str] | None = None) -> None:
+    """
+    Punto de entrada: python -m benchmarks.bench_sorts [opciones] (desde src/).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de los algoritmos de ordenamiento.")
+    parser.add_argument("--tamanos", type=lambda s: [int(float(x)) for x in s.split(",")],
+                        default=list(TAMANOS), help="Tamaños separados por coma (p.ej. 1e3,1e4,1e5)")
+    parser.add_argument("--distribuciones", type=lambda s: s.split(","),
+                        default=list(DISTRIBUCIONES), help=f"Opciones: {','.join(DISTRIBUCIONES)}")
+    parser.add_argument("--algoritmos", type=lambda s: s.split(","), default=None,
+                        help="Algoritmos separados por coma (por defecto, todos)")
+    parser.add_argument("--backend", choices=list(backends), default="python")
+    parser.add_argument("--calentamiento", type=int, default=CALENTAMIENTO)
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--limite", type=float, default=LIMITE_SEGUNDOS,
+                        help="Mediana (s) a partir de la cual se omiten los tamaños mayores")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--sin-verificar", action="store_true", help="No comprobar los resultados")
+    parser.add_argument("--json", default="bench_sorts.json", help="Ruta de la salida JSON")
+    parser.add_argument("--csv", default="bench_sorts.csv", help="Ruta de la salida CSV")
+    args = parser.parse_args(argv)
+
+    reporte = ejecutar_benchmark(
+        tamanos=args.tamanos,
+        distribuciones=args.distribuciones,
+        algoritmos=args.algoritmos,
+        backend=args.backend,
+        calentamiento=args.calentamiento,
+        repeticiones=args.repeticiones,
+        limite_segundos=args.limite,
+        semilla=args.semilla,
+        verificar=not args.sin_verificar,
+    )
+    guardar_json(reporte, args.json)
+    guardar_csv(reporte, args.csv)
+    print(f"[Bench] Resultados en {args.json} y {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import queue                  # Colas acotadas entre cada partición y el consumidor
+import threading              # Para cancelar las lecturas si el consumidor se detiene
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+from database.sql_connection import get_connection, iter_batches, tam_pool, TAM_LOTE
+
+# Consulta de cada partición: rango de claves [desde, hasta) recorrido por la clave primaria
+CONSULTA_PARTICION = (
+    "SELECT * FROM UN.VENTAS WHERE ID_VENTA >= %s AND ID_VENTA < %s ORDER BY ID_VENTA"
+)
+
+# Lotes que cada partición puede adelantar antes de esperar al consumidor
+TAM_COLA = 8
+
+# Particiones por hilo lector: con más particiones que hilos, una partición con
+# muchas filas no deja al resto de los hilos sin trabajo.
+PARTICIONES_POR_HILO = 4
+
+# Marca de fin de partición
+FIN = None
+
+
+def validar_paralelismo(paralelismo: int) -> None:
+    """
+    Cada lector paralelo retiene una conexión del pool durante toda su partición: con más
+    lectores que conexiones, los que no consiguen una esperan ESPERA_POOL y fallan.
+    Lanza ValueError si `paralelismo` no está entre 1 y el tamaño del pool.
+    """
+    if not 1 <= paralelismo <= tam_pool():
+        raise ValueError(f"paralelismo debe estar entre 1 y el tamaño del pool ({tam_pool()}), no {paralelismo}.")
+
+
+def rangos_id_venta(n_particiones: int) -> list[tuple[int, int]]:
+    """
+    Divide el rango de ID_VENTA de UN.VENTAS en `n_particiones` rangos contiguos
+    de igual ancho.
+
+    Parámetros:
+    - n_particiones: Cantidad de rangos a generar.
+
+    Retorno:
+    - Lista de tuplas (desde, hasta) con `desde` incluido y `hasta` excluido,
+      ordenadas de menor a mayor. Lista vacía si la tabla no tiene filas.
+    """
+    conn = get_connection()
+    if conn is None:
+        raise ConnectionError("No se pudo obtener una conexión para calcular los rangos de ID_VENTA.")
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(ID_VENTA), MAX(ID_VENTA) FROM UN.VENTAS")
+        minimo, maximo = cursor.fetchone()
+        cursor.close()
+    finally:
+        conn.close()
+
+    if minimo is None:
+        return []
+
+    # Ancho de cada rango (redondeado hacia arriba para cubrir hasta el máximo)
+    total = maximo - minimo + 1
+    ancho = -(-total // max(1, n_particiones))
+    return [(desde, min(desde + ancho, maximo + 1)) for desde in range(minimo, maximo + 1, ancho)]
+
+
+def leer_particion(desde: int, hasta: int, batch_size: int = TAM_LOTE) -> Iterator[list[tuple]]:
+    """
+    Entrega por lotes las filas de UN.VENTAS con desde <= ID_VENTA < hasta, en orden
+    de ID_VENTA, usando su propia conexión del pool.
+    """
+    conn = get_connection()
+    if conn is None:
+        raise ConnectionError(f"No se pudo obtener una conexión para la partición [{desde}, {hasta}).")
+    lotes = iter_batches(conn, CONSULTA_PARTICION, batch_size, (desde, hasta))
+    try:
+        yield from lotes
+    finally:
+        lotes.close()  # Cierra el cursor antes de devolver la conexión
+        conn.close()
+
+
+def _poner(cola: queue.Queue, item, cancelado: threading.Event) -> bool:
+    """
+    Pone `item` en la cola esperando si está llena, salvo que se cancele la lectura.
+    Retorna False si se canceló.
+    """
+    while not cancelado.is_set():
+        try:
+            cola.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _leer_en_cola(
+    desde: int,
+    hasta: int,
+    batch_size: int,
+    cola: queue.Queue,
+    cancelado: threading.Event
+) -> None:
+    """
+    Tarea de cada hilo lector: copia los lotes de una partición a su cola.
+    Los errores se pasan por la misma cola para que el consumidor los relance.
+    """
+    if cancelado.is_set():
+        return
+    try:
+        for lote in leer_particion(desde, hasta, batch_size):
+            if not _poner(cola, lote, cancelado):
+                return
+    except Exception as e:
+        _poner(cola, e, cancelado)
+    finally:
+        _poner(cola, FIN, cancelado)
+
+
+def iter_particionado(
+    paralelismo: int = 4,
+    batch_size: int = TAM_LOTE,
+    n_particiones: int | None = None,
+    tam_cola: int = TAM_COLA
+) -> Iterator[list[tuple]]:
+    """
+    Extracción paralela de UN.VENTAS: divide la tabla en rangos de ID_VENTA y los lee
+    a la vez con `paralelismo` hilos, cada uno con su propia conexión del pool.
+    Entrega los lotes en el mismo orden que una lectura secuencial ordenada por ID_VENTA,
+    así que puede pasarse directamente como `lotes` a escribir_csv, escribir_json o
+    exportar_formatos.
+
+    Parámetros:
+    - paralelismo: Cantidad de consultas simultáneas (y de conexiones usadas). No puede
+      superar el tamaño del pool (tam_pool()): las particiones adelantadas podrían tomar
+      todas las conexiones y dejar sin ninguna a la que el consumidor espera.
+    - batch_size: Número de filas por lote.
+    - n_particiones: Cantidad de rangos (por defecto, PARTICIONES_POR_HILO por hilo).
+    - tam_cola: Lotes que cada partición puede adelantar antes de esperar al consumidor.
+      La memoria usada queda acotada por paralelismo × tam_cola × batch_size filas.
+
+    Retorno:
+    - Generador de listas de tuplas.
+    """
+    validar_paralelismo(paralelismo)
+    rangos = rangos_id_venta(n_particiones or paralelismo * PARTICIONES_POR_HILO)
+    colas = [queue.Queue(maxsize=tam_cola) for _ in rangos]
+    cancelado = threading.Event()
+
+    # Las particiones se envían en orden: la que el consumidor necesita primero
+    # siempre está entre las que se están leyendo, así que nunca se bloquean todas.
+    with ThreadPoolExecutor(max_workers=paralelismo, thread_name_prefix="Particion") as pool:
+        for (desde, hasta), cola in zip(rangos, colas):
+            pool.submit(_leer_en_cola, desde, hasta, batch_size, cola, cancelado)
+
+        try:
+            # Reensamblamos: todas las filas de la partición 0, luego la 1, etc.
+            for cola in colas:
+                while True:
+                    item = cola.get()
+                    if item is FIN:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+        finally:
+            # Si el consumidor se detuvo antes (o hubo un error), liberamos a los lectores
+            # y descartamos las particiones que todavía no empezaron
+            cancelado.set()
+            pool.shutdown(cancel_futures=True)
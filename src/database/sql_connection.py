@@ -2,42 +2,136 @@
 from dotenv import load_dotenv
 # Para conectar a MySQL y capturar errores relacionados
 from mysql.connector import connect, errorcode, Error
+# Pool de conexiones reutilizables de mysql-connector
+from mysql.connector.pooling import MySQLConnectionPool, PoolError
 # Para acceder a las variables de entorno del sistema
 from os import environ
-# Para manejar datos en formato de tabla (DataFrame)
-import pandas as pd
+# Para crear el pool una sola vez aunque varios hilos lo pidan a la vez
+import threading
+# Para esperar una conexión libre cuando el pool está agotado
+import time
+# Para anotar los generadores de lotes
+from typing import Iterator
+# Tiempo de lectura y filas leídas de la base de datos
+from instrumentacion.metricas import medir
 
 
-# 1. Cargamos variables del archivo .env
-# load_dotenv() busca un archivo llamado ".env" en el directorio actual
-# y carga las variables definidas allí en el entorno de Python.
-load_dotenv()
+# Nada de este módulo toca la red al importarse: el archivo .env se lee y el pool
+# se crea recién cuando se pide la primera conexión (get_connection).
 
+# Tamaño del pool por defecto (se puede cambiar con DATABASE_POOL_SIZE o configurar())
+TAM_POOL = 5
 
-# 2. Configuramos la conexión
+# Segundos que get_connection espera por una conexión libre antes de rendirse
+ESPERA_POOL = 30.0
 
-# Aquí creamos un diccionario con las claves necesarias para conectarse
-# a la base de datos MySQL. Las claves (DATABASE_USERNAME, etc.) deben
-# estar definidas en el archivo .env.
-config = {
-    "user": environ['DATABASE_USERNAME'],       # Nombre de usuario de la BD
-    "password": environ['DATABASE_PASSWORD'],   # Contraseña de la BD
-    "host": environ['DATABASE_HOST'],           # Dirección del servidor MySQL (p.ej. 'localhost')
-    "database": environ['DATABASE_NAME'],       # Nombre de la base de datos a usar
-    "charset": 'utf8'                           # Codificación de caracteres
-}
+_config: dict | None = None         # Configuración de conexión (se arma al primer uso)
+_tam_pool: int | None = None        # Tamaño del pool elegido con configurar()
+_pool: MySQLConnectionPool | None = None
+_pool_lock = threading.Lock()
 
 
-# 3. Obtenemnos la conexión
-def get_connection():
+# 1. Cargamos la configuración de forma perezosa
+def get_config() -> dict:
     """
-    Intenta establecer una conexión con la base de datos MySQL usando
-    los parámetros definidos en 'config'. Si hay un error de autenticación
-    o la base de datos no existe, lo informa por pantalla y retorna None.
+    Devuelve el diccionario de conexión. La primera vez carga el archivo .env
+    con load_dotenv() y lee de allí las credenciales (DATABASE_USERNAME, etc.),
+    salvo que se haya indicado otra configuración con configurar().
     """
+    global _config
+    if _config is None:
+        # load_dotenv() busca un archivo llamado ".env" en el directorio actual
+        # y carga las variables definidas allí en el entorno de Python.
+        load_dotenv()
+        _config = {
+            "user": environ['DATABASE_USERNAME'],       # Nombre de usuario de la BD
+            "password": environ['DATABASE_PASSWORD'],   # Contraseña de la BD
+            "host": environ['DATABASE_HOST'],           # Dirección del servidor MySQL (p.ej. 'localhost')
+            "database": environ['DATABASE_NAME'],       # Nombre de la base de datos a usar
+            "charset": 'utf8'                           # Codificación de caracteres
+        }
+    return _config
+
+
+# 2. Configuración explícita (opcional)
+def configurar(pool_size: int | None = None, **config) -> None:
+    """
+    Reemplaza la configuración leída del .env y/o el tamaño del pool, por ejemplo
+    para apuntar a un MySQL local de pruebas. No abre ninguna conexión: el pool
+    se vuelve a crear con los nuevos valores en la siguiente llamada a get_connection().
+
+    Debe llamarse antes de pedir conexiones (o cuando ya se devolvieron todas): el pool
+    anterior se descarta sin cerrar las conexiones que estén en uso. Esas conexiones
+    siguen funcionando, pero al cerrarlas vuelven al pool descartado, no al nuevo.
+
+    Parámetros:
+    - pool_size: Cantidad de conexiones del pool.
+    - config: Argumentos de conexión de mysql.connector (user, password, host, port, database, ...).
+    """
+    global _config, _tam_pool, _pool
+    with _pool_lock:
+        if config:
+            _config = {"charset": 'utf8', **config}
+        if pool_size is not None:
+            _tam_pool = pool_size
+        _pool = None
+
+
+def tam_pool() -> int:
+    """
+    Cantidad de conexiones del pool: la de configurar(), la de DATABASE_POOL_SIZE o TAM_POOL.
+    """
+    return _tam_pool or int(environ.get("DATABASE_POOL_SIZE", TAM_POOL))
+
+
+def get_pool() -> MySQLConnectionPool:
+    """
+    Devuelve el pool de conexiones, creándolo la primera vez que se pide.
+    Al crearse, el pool abre sus `pool_size` conexiones contra el servidor.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            # Revisamos de nuevo: otro hilo pudo crearlo mientras esperábamos el lock
+            if _pool is None:
+                _pool = MySQLConnectionPool(
+                    pool_name="ventas",
+                    pool_size=tam_pool(),
+                    pool_reset_session=True,
+                    **get_config()
+                )
+    return _pool
+
+
+# 3. Obtenemos una conexión del pool
+def get_connection(espera: float = ESPERA_POOL):
+    """
+    Entrega una conexión del pool (lo crea si todavía no existe). Al llamar a
+    .close() sobre ella, la conexión vuelve al pool en lugar de cerrarse.
+    Antes de entregarla se verifica con ping() que siga viva; si se había caído,
+    se reconecta. Si el pool está agotado, espera hasta `espera` segundos a que
+    otra parte del programa devuelva una conexión.
+    Si hay un error de autenticación o la base de datos no existe, lo informa
+    por pantalla y retorna None. Si la conexión ya se había tomado del pool (p.ej. falló
+    el ping), se devuelve al pool antes de retornar, para no agotarlo.
+    """
+    limite = time.monotonic() + espera
+    conn = None
     try:
-        # connect(**config) descompone el diccionario y lo pasa como argumentos.
-        return connect(**config)
+        while True:
+            try:
+                conn = get_pool().get_connection()
+                break
+            except PoolError:
+                # Todas las conexiones están en uso: esperamos un momento y reintentamos
+                if time.monotonic() >= limite:
+                    print("Error: no hay conexiones libres en el pool.")
+                    return None
+                time.sleep(0.05)
+
+        # Chequeo de salud: si el servidor cerró la conexión, ping la reabre
+        conn.ping(reconnect=True, attempts=3, delay=1)
+        return conn
     except Error as err:
         # Si el error es por credenciales incorrectas
         if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
@@ -48,6 +142,11 @@ def get_connection():
         else:
             # Otros errores genéricos de MySQL
             print(err)
+        if conn is not None:
+            try:
+                conn.close()  # Vuelve al pool aunque falle el reinicio de la sesión
+            except Error:
+                pass
         return None
 
 
@@ -68,42 +167,91 @@ def get_data(connection: connect, query: str):
     return data
 
 
-# 5. Establecemos la conexión y verificar
-cnx = get_connection()
+# Nombres de las columnas de UN.VENTAS, en el orden en que las devuelve "SELECT *"
+COLUMNAS_VENTAS = [
+    'ID_VENTA',       # Identificador único de la venta
+    'FECHA_VENTA',    # Fecha en que se realizó la venta
+    'ID_CLIENTE',     # Identificador del cliente
+    'ID_EMPLEADO',    # Identificador del empleado que registró la venta
+    'ID_PRODUCTO',    # Identificador del producto vendido
+    'CANTIDAD',       # Cantidad de unidades vendidas
+    'PRECIO_UNITARIO',# Precio por unidad en el momento de la venta
+    'DESCUENTO',      # Porcentaje o valor de descuento aplicado
+    'FORMA_PAGO'      # Forma de pago utilizada (p.ej. 'Efectivo', 'Tarjeta')
+]
+
+# Cantidad de filas por lote por defecto en iter_batches
+TAM_LOTE = 10000
 
-# Si la conexión se estableció correctamente, imprimimos un mensaje.
-# Si get_connection() devolvió None, no hay conexión válida.
-if cnx:
-    print("Conexión establecida exitosamente")
-else:
-    print("No se pudo conectar a la base de datos")
+
+# 4b. Ejecutamos una consulta y entregamos los resultados por lotes
+@medir("db/iter_batches", filas=len)
+def iter_batches(
+    connection: connect,
+    query: str,
+    batch_size: int = TAM_LOTE,
+    params: tuple | None = None
+) -> Iterator[list[tuple]]:
+    """
+    Versión por streaming de get_data: ejecuta la consulta con un cursor sin buffer
+    (las filas se quedan en el servidor hasta que se piden) y entrega los resultados
+    en lotes de hasta `batch_size` tuplas usando fetchmany().
+    La memoria usada depende del tamaño del lote y no del tamaño de la tabla.
+    El tiempo de lectura (consulta y fetchmany) y las filas leídas quedan en el registro
+    de métricas como "db/iter_batches".
+
+    Parámetros:
+    - connection: Conexión activa a MySQL.
+    - query: Consulta SQL (p.ej. "SELECT * FROM UN.VENTAS").
+    - batch_size: Número de filas por lote.
+    - params: Parámetros opcionales de la consulta (para marcadores %s).
+
+    Retorno:
+    - Generador de listas de tuplas.
+    """
+    # buffered=False: el cliente no descarga todo el resultado al ejecutar la consulta
+    my_cursor = connection.cursor(buffered=False)
+    try:
+        my_cursor.execute(query, params)
+        while True:
+            lote = my_cursor.fetchmany(batch_size)
+            if not lote:
+                break
+            yield lote
+    finally:
+        # Si el consumidor se detuvo antes del final, descartamos las filas pendientes
+        # para dejar la conexión lista para otra consulta
+        if getattr(connection, "unread_result", False):
+            connection.consume_results()
+        my_cursor.close()
 
 
-# 6. Obtenemos datos de la tabla UN.VENTAS
-# En este ejemplo, limitamos la consulta a 1000 filas para no sobrecargar la memoria.
-data = get_data(cnx, "SELECT * FROM UN.VENTAS LIMIT 1000")
+if __name__ == "__main__":
+    # Solo se ejecuta si el archivo se invoca directamente: prueba rápida de conexión.
+    # Para manejar datos en formato de tabla (DataFrame)
+    import pandas as pd
 
+    # 5. Establecemos la conexión y verificar
+    cnx = get_connection()
 
-# 7. Crear un DataFrame de pandas con los resultados
-# Convertimos la lista de tuplas 'data' en un DataFrame y asignamos nombres
-# de columna para cada campo de la tabla UN.VENTAS.
-df = pd.DataFrame(
-    data,
-    columns=[
-        'ID_VENTA',       # Identificador único de la venta
-        'FECHA_VENTA',    # Fecha en que se realizó la venta
-        'ID_CLIENTE',     # Identificador del cliente
-        'ID_EMPLEADO',    # Identificador del empleado que registró la venta
-        'ID_PRODUCTO',    # Identificador del producto vendido
-        'CANTIDAD',       # Cantidad de unidades vendidas
-        'PRECIO_UNITARIO',# Precio por unidad en el momento de la venta
-        'DESCUENTO',      # Porcentaje o valor de descuento aplicado
-        'FORMA_PAGO'      # Forma de pago utilizada (p.ej. 'Efectivo', 'Tarjeta')
-    ]
-)
+    # Si la conexión se estableció correctamente, imprimimos un mensaje.
+    # Si get_connection() devolvió None, no hay conexión válida.
+    if cnx:
+        print("Conexión establecida exitosamente")
+    else:
+        print("No se pudo conectar a la base de datos")
+        raise SystemExit(1)
 
+    # 6. Obtenemos datos de la tabla UN.VENTAS
+    # En este ejemplo, limitamos la consulta a 1000 filas para no sobrecargar la memoria.
+    data = get_data(cnx, "SELECT * FROM UN.VENTAS LIMIT 1000")
+    cnx.close()  # Devuelve la conexión al pool
 
-# 8. Mostrar el DataFrame por pantalla
-# Esto permite verificar que los datos se cargaron correctamente.
-print(df)
+    # 7. Crear un DataFrame de pandas con los resultados
+    # Convertimos la lista de tuplas 'data' en un DataFrame y asignamos nombres
+    # de columna para cada campo de la tabla UN.VENTAS.
+    df = pd.DataFrame(data, columns=COLUMNAS_VENTAS)
 
+    # 8. Mostrar el DataFrame por pantalla
+    # Esto permite verificar que los datos se cargaron correctamente.
+    print(df)
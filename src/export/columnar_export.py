@@ -0,0 +1,180 @@
+import json                   # Para los metadatos del archivo (tipos y grupos de filas)
+import os                     # Para interactuar con el sistema de archivos (tamaño de archivo)
+import time                   # Para medir el tiempo de ejecución
+import zipfile                # Contenedor del formato: un miembro comprimido por columna y grupo
+from typing import Iterable
+import numpy as np            # Columnas tipadas y serialización .npy
+from instrumentacion.metricas import medir, contar
+from database.sql_connection import get_connection, iter_batches, COLUMNAS_VENTAS, TAM_LOTE
+from export.destino import escritura_atomica
+
+# Tipo de NumPy de cada una de las nueve columnas de UN.VENTAS
+TIPOS_COLUMNAS = {
+    'ID_VENTA': 'int64',
+    'FECHA_VENTA': 'datetime64[D]',
+    'ID_CLIENTE': 'int32',
+    'ID_EMPLEADO': 'int32',
+    'ID_PRODUCTO': 'int32',
+    'CANTIDAD': 'int32',
+    'PRECIO_UNITARIO': 'float64',
+    'DESCUENTO': 'float64',   # Los NULL se guardan como NaN
+    'FORMA_PAGO': 'str',      # Texto Unicode de ancho fijo (el máximo de cada grupo)
+}
+
+# Códecs de compresión disponibles (los mismos que admite zipfile). "gzip" es un alias de
+# "deflate", para aceptar los mismos nombres que export.compresion.CODECS.
+COMPRESIONES = {
+    "ninguna": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "gzip": zipfile.ZIP_DEFLATED,
+    "bz2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# Filas por grupo: cada grupo guarda sus columnas por separado, así un lector
+# puede avanzar grupo a grupo sin cargar la tabla completa
+FILAS_POR_GRUPO = 100_000
+
+# Nombre del miembro con los metadatos dentro del archivo
+META = "meta.json"
+
+
+def nombre_miembro(grupo: int, columna: str) -> str:
+    """
+    Nombre del miembro que guarda la columna `columna` del grupo `grupo`
+    (p.ej. "g00000/CANTIDAD.npy").
+    """
+    return f"g{grupo:05d}/{columna}.npy"
+
+
+def columna_tipada(valores: tuple, columna: str) -> np.ndarray:
+    """
+    Convierte los valores de una columna (tal como los entrega MySQL) en un arreglo
+    con el tipo definido en TIPOS_COLUMNAS.
+    """
+    tipo = TIPOS_COLUMNAS[columna]
+    if tipo == 'str':
+        return np.array(["" if v is None else v for v in valores], dtype=str)
+    if tipo == 'float64':
+        return np.array([np.nan if v is None else float(v) for v in valores], dtype=np.float64)
+    return np.array(valores, dtype=tipo)
+
+
+def _escribir_grupo(zf: zipfile.ZipFile, grupo: int, filas: list[tuple]) -> None:
+    """
+    Escribe un grupo de filas: transpone las tuplas a columnas y guarda cada columna
+    como un miembro .npy independiente (comprimido por separado).
+    """
+    for columna, valores in zip(COLUMNAS_VENTAS, zip(*filas)):
+        arreglo = columna_tipada(valores, columna)
+        with zf.open(nombre_miembro(grupo, columna), "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, arreglo, allow_pickle=False)
+
+
+@medir("export/npz", filas=int)
+def escribir_columnar(
+    lotes: Iterable[list[tuple]],
+    path: str,
+    compresion: str = "deflate",
+    nivel: int | None = None,
+    filas_por_grupo: int = FILAS_POR_GRUPO
+) -> int:
+    """
+    Escribe UN.VENTAS en formato columnar binario: un archivo zip (compatible con
+    np.load) con un miembro .npy tipado por columna y por grupo de filas, más un
+    miembro "meta.json" con los tipos y el tamaño de cada grupo.
+
+    Parámetros:
+    - lotes: Iterable de listas de tuplas (p.ej. el generador de iter_batches).
+    - path: Ruta del archivo de destino (p.ej. "ventas.npz").
+    - compresion: "ninguna", "deflate" (o "gzip"), "bz2" o "lzma".
+    - nivel: Nivel de compresión (depende del códec; None usa el valor por defecto).
+    - filas_por_grupo: Filas de cada grupo.
+
+    Retorno:
+    - Número de filas escritas.
+    """
+    if compresion not in COMPRESIONES:
+        raise ValueError(f"compresion debe ser una de {list(COMPRESIONES)}, no {compresion!r}.")
+
+    filas = 0
+    grupos: list[int] = []  # Filas de cada grupo escrito
+    pendientes: list[tuple] = []
+
+    with zipfile.ZipFile(path, "w", compression=COMPRESIONES[compresion], compresslevel=nivel) as zf:
+        # 1. Acumulamos filas hasta completar un grupo y lo escribimos
+        for lote in lotes:
+            pendientes.extend(lote)
+            while len(pendientes) >= filas_por_grupo:
+                _escribir_grupo(zf, len(grupos), pendientes[:filas_por_grupo])
+                grupos.append(filas_por_grupo)
+                del pendientes[:filas_por_grupo]
+            filas += len(lote)
+
+        # 2. Último grupo parcial
+        if pendientes:
+            _escribir_grupo(zf, len(grupos), pendientes)
+            grupos.append(len(pendientes))
+
+        # 3. Metadatos: columnas, tipos y filas por grupo
+        meta = {
+            "columnas": {columna: TIPOS_COLUMNAS[columna] for columna in COLUMNAS_VENTAS},
+            "grupos": grupos,
+            "filas": filas,
+            "compresion": compresion,
+        }
+        zf.writestr(META, json.dumps(meta))
+
+    contar("export/npz.bytes", os.path.getsize(path))
+    return filas
+
+
+def export_columnar(
+    batch_size: int = TAM_LOTE,
+    compresion: str = "deflate",
+    nivel: int | None = None
+):
+    """
+    Extrae todos los registros de la tabla UN.VENTAS desde MySQL por lotes
+    y los escribe en formato columnar binario ("ventas.npz").
+    Retorna un diccionario con:
+      - formato: "NPZ"
+      - tiempo: tiempo total de exportación (en segundos, con 4 decimales)
+      - tamano_kb: tamaño del archivo resultante (en KB, con 2 decimales)
+    o None si no se pudo conectar a la base de datos.
+
+    Parámetros:
+    - batch_size: Número de filas que se piden a la base de datos en cada lote.
+    - compresion: "ninguna", "deflate" (o "gzip"), "bz2" o "lzma".
+    - nivel: Nivel de compresión.
+    """
+
+    # 1. Marcamos inicio para medir tiempo total
+    start = time.perf_counter()
+
+    # 2. Leemos UN.VENTAS lote por lote y la escribimos por grupos de columnas.
+    #    Se escribe a un temporal que reemplaza al archivo solo si la exportación termina
+    #    bien: sin conexión, o si la lectura se corta, el archivo anterior queda intacto.
+    path = "ventas.npz"
+    conn = get_connection()  # Toma una conexión del pool
+    if conn is None:
+        print("Error: no se pudo conectar a la base de datos; no se exportó el NPZ.")
+        return None
+    lotes = iter_batches(conn, "SELECT * FROM UN.VENTAS", batch_size)
+    try:
+        with escritura_atomica(path) as temporal:
+            escribir_columnar(lotes, temporal, compresion, nivel)
+    finally:
+        lotes.close()  # Cierra el cursor antes de devolver la conexión
+        conn.close()  # Devuelve la conexión al pool
+
+    # 3. Se mide tiempo final y se calcula el tamaño del archivo en kilobytes
+    end = time.perf_counter()
+    size_kb = os.path.getsize(path) / 1024
+
+    # 4. Construir y retornar el diccionario con la información solicitada
+    return {
+        "formato": "NPZ",
+        "tiempo": round(end - start, 4),    # Tiempo total de exportación (s)
+        "tamano_kb": round(size_kb, 2)      # Tamaño del archivo en KB
+    }
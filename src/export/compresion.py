@@ -0,0 +1,92 @@
+import bz2                    # Códec bz2 (más lento, buena compresión de texto)
+import gzip                   # Códec gzip (deflate: rápido, compresión media)
+import lzma                   # Códec xz (el más lento, la mejor compresión)
+import os                     # Extensión del archivo
+
+# Códecs de compresión por streaming de la biblioteca estándar:
+# nombre → (módulo, extensión que se agrega al archivo, nivel por defecto).
+# Los niveles por defecto de gzip y lzma son los de las herramientas de línea de comandos
+# (gzip.open usaría 9, mucho más lento y casi sin ganancia sobre 6).
+CODECS = {
+    "gzip": (gzip, ".gz", 6),
+    "bz2": (bz2, ".bz2", 9),
+    "lzma": (lzma, ".xz", 6),
+}
+
+# Primeros bytes de un archivo comprimido con cada códec (para detectarlo al leer)
+FIRMAS = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "lzma",
+}
+
+
+def validar_compresion(compresion: str | None) -> None:
+    """
+    Lanza ValueError si `compresion` no es None ni uno de CODECS.
+    """
+    if compresion is not None and compresion not in CODECS:
+        raise ValueError(f"compresion debe ser None o una de {list(CODECS)}, no {compresion!r}.")
+
+
+def ruta_comprimida(path: str, compresion: str | None) -> str:
+    """
+    Ruta con la extensión del códec agregada ("ventas.csv" → "ventas.csv.gz").
+    """
+    validar_compresion(compresion)
+    return path + CODECS[compresion][1] if compresion else path
+
+
+def extension_base(path: str) -> str:
+    """
+    Extensión del archivo sin la del códec ("ventas.csv.gz" → ".csv"), en minúsculas.
+    """
+    base, extension = os.path.splitext(path)
+    if any(extension.lower() == sufijo for _, sufijo, _ in CODECS.values()):
+        base, extension = os.path.splitext(base)
+    return extension.lower()
+
+
+def detectar_compresion(path: str) -> str | None:
+    """
+    Códec con que está comprimido `path` según sus primeros bytes, o None si no lo está.
+    """
+    with open(path, "rb") as f:
+        comienzo = f.read(max(map(len, FIRMAS)))
+    for firma, compresion in FIRMAS.items():
+        if comienzo.startswith(firma):
+            return compresion
+    return None
+
+
+def abrir(path: str, modo: str = "r", compresion: str | None = None, nivel: int | None = None, **kwargs):
+    """
+    Abre `path` como open(), comprimiendo o descomprimiendo por streaming: los datos pasan
+    por el códec a medida que se escriben o leen, sin un archivo intermedio.
+
+    Parámetros:
+    - path: Ruta del archivo.
+    - modo: "r", "w", "rb" o "wb" (sin "b", en modo texto, como open()).
+    - compresion: Códec de CODECS o None. Al escribir, None escribe sin comprimir; al leer,
+      None detecta el códec por los primeros bytes del archivo.
+    - nivel: Nivel de compresión al escribir (1 a 9; None usa el de CODECS).
+    - kwargs: encoding, newline, etc., como en open().
+
+    Retorno:
+    - Objeto archivo (se usa con `with`).
+    """
+    validar_compresion(compresion)
+    if "r" in modo and compresion is None and os.path.exists(path):
+        compresion = detectar_compresion(path)
+    if compresion is None:
+        return open(path, modo, **kwargs)
+
+    modulo, _, nivel_defecto = CODECS[compresion]
+    # Los módulos de compresión abren en binario salvo que se pida "t" explícitamente
+    modo_codec = modo if "b" in modo else modo + "t"
+    if "w" in modo:
+        nivel = nivel_defecto if nivel is None else nivel
+        if compresion == "lzma":
+            return lzma.open(path, modo_codec, preset=nivel, **kwargs)
+        return modulo.open(path, modo_codec, compresslevel=nivel, **kwargs)
+    return modulo.open(path, modo_codec, **kwargs)
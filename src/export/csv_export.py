@@ -1,54 +1,99 @@
-import pandas as pd           # Para manejar datos en formato de tablas (DataFrame)
+import csv                    # Para escribir el CSV fila a fila, lote por lote
 import time                   # Para medir el tiempo de ejecución
 import os                     # Para interactuar con el sistema de archivos (tamaño de archivo)
-from database.sql_connection import get_connection, get_data
+from typing import Iterable
+from instrumentacion.metricas import medir, contar
+from export.compresion import abrir, ruta_comprimida
+from export.destino import escritura_atomica
+from database.sql_connection import get_connection, iter_batches, COLUMNAS_VENTAS, TAM_LOTE
+from database.partitioned_extract import iter_particionado
 # get_connection(): devuelve una conexión a la base de datos MySQL a partir de las credenciales
-# get_data(conn, query): ejecuta una consulta SQL y devuelve los resultados como lista de tuplas
+# iter_batches(conn, query, batch_size): ejecuta una consulta SQL y entrega los resultados por lotes
 
-def export_csv():
+
+@medir("export/csv", filas=int)
+def escribir_csv(
+    lotes: Iterable[list[tuple]],
+    csv_path: str,
+    compresion: str | None = None,
+    nivel: int | None = None
+) -> int:
+    """
+    Escribe en `csv_path` el encabezado de UN.VENTAS y luego cada lote de filas
+    a medida que llega, sin juntar toda la tabla en memoria.
+
+    Parámetros:
+    - lotes: Iterable de listas de tuplas (p.ej. el generador de iter_batches).
+    - csv_path: Ruta del archivo CSV de destino.
+    - compresion: None, "gzip", "bz2" o "lzma": cada lote pasa por el códec al escribirse
+      (ver export.compresion).
+    - nivel: Nivel de compresión (None usa el del códec).
+
+    Retorno:
+    - Número de filas escritas.
+    """
+    filas = 0
+    with abrir(csv_path, "w", compresion, nivel, newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        # Encabezado con los nombres de las columnas
+        escritor.writerow(COLUMNAS_VENTAS)
+        # Cada lote se escribe apenas se recibe de la base de datos
+        for lote in lotes:
+            escritor.writerows(lote)
+            filas += len(lote)
+    contar("export/csv.bytes", os.path.getsize(csv_path))
+    return filas
+
+
+def export_csv(batch_size: int = TAM_LOTE, paralelismo: int = 1, compresion: str | None = None,
+               nivel: int | None = None):
     """
-    Extrae todos los registros de la tabla UN.VENTAS desde MySQL,
-    los convierte en DataFrame de pandas y los exporta a un archivo CSV.
+    Extrae todos los registros de la tabla UN.VENTAS desde MySQL por lotes
+    y los va escribiendo en un archivo CSV.
     Retorna un diccionario con:
       - formato: "CSV"
       - tiempo: tiempo total de exportación (en segundos, con 4 decimales)
       - tamano_kb: tamaño del archivo CSV resultante (en KB, con 2 decimales)
+    o None si no se pudo conectar a la base de datos.
+
+    Parámetros:
+    - batch_size: Número de filas que se piden a la base de datos en cada lote.
+    - paralelismo: Si es mayor que 1, la tabla se lee por rangos de ID_VENTA con esa
+      cantidad de conexiones simultáneas (ver database.partitioned_extract).
+    - compresion / nivel: Códec y nivel (ver escribir_csv); p.ej. "gzip" escribe "ventas.csv.gz".
     """
 
     # 1. Marcamos inicio para medir tiempo total
-    start = time.time()
-
-    # 2. Nos conectamos  a la base de datos y obtenemos todos los registros de UN.VENTAS
-    conn = get_connection()  # Crea/levanta la conexión MySQL
-    data = get_data(conn, "SELECT * FROM UN.VENTAS")  # Ejecuta la consulta SQL
-    conn.close()  # Cierra la conexión para liberar recursos
-
-    # 3. Definir los nombres de las columnas que devolverá la consulta
-    columnas = [
-        'ID_VENTA',        # Identificador único de la venta
-        'FECHA_VENTA',     # Fecha en que se realizó la venta
-        'ID_CLIENTE',      # Identificador del cliente
-        'ID_EMPLEADO',     # Identificador del empleado que procesó la venta
-        'ID_PRODUCTO',     # Identificador del producto vendido
-        'CANTIDAD',        # Cantidad de unidades vendidas
-        'PRECIO_UNITARIO', # Precio por unidad al momento de la venta
-        'DESCUENTO',       # Descuento aplicado (porcentaje o valor)
-        'FORMA_PAGO'       # Método de pago utilizado (p.ej., 'Efectivo', 'Tarjeta')
-    ]
-
-    # 4. Convertimos los datos (lista de tuplas) en un DataFrame de pandas
-    df = pd.DataFrame(data, columns=columnas)
-
-    # 5. Definimos la ruta y nombre del archivo CSV de destino
-    csv_path = "ventas.csv"
-    # Guardamos el DataFrame en formato CSV, sin incluir índice de pandas
-    df.to_csv(csv_path, index=False)
-
-    # 6. Se mide tiempo final y se calcula el tamaño del archivo en kilobytes
-    end = time.time()  # Marca el momento después de guardar el CSV
+    start = time.perf_counter()
+
+    # 2. Nos conectamos a la base de datos y escribimos UN.VENTAS lote por lote.
+    #    La memoria usada depende de batch_size, no del tamaño de la tabla.
+    csv_path = ruta_comprimida("ventas.csv", compresion)
+    #    Se escribe a un temporal que reemplaza al archivo solo si la exportación termina
+    #    bien: sin conexión, o si la lectura se corta, el archivo anterior queda intacto.
+    conn = None
+    if paralelismo > 1:
+        # Lectura paralela por rangos de ID_VENTA, reensamblada en orden
+        lotes = iter_particionado(paralelismo, batch_size)
+    else:
+        conn = get_connection()  # Toma una conexión del pool
+        if conn is None:
+            print("Error: no se pudo conectar a la base de datos; no se exportó el CSV.")
+            return None
+        lotes = iter_batches(conn, "SELECT * FROM UN.VENTAS", batch_size)
+    try:
+        with escritura_atomica(csv_path) as temporal:
+            escribir_csv(lotes, temporal, compresion, nivel)
+    finally:
+        lotes.close()  # Cierra el cursor (o los lectores) antes de devolver la conexión
+        if conn is not None:
+            conn.close()  # Devuelve la conexión al pool
+
+    # 3. Se mide tiempo final y se calcula el tamaño del archivo en kilobytes
+    end = time.perf_counter()  # Marca el momento después de guardar el CSV
     size_kb = os.path.getsize(csv_path) / 1024  # Tamaño en bytes, dividido por 1024 → KB
 
-    # 7. Construir y retornar el diccionario con la información solicitada
+    # 4. Construir y retornar el diccionario con la información solicitada
     return {
         "formato": "CSV",
         "tiempo": round(end - start, 4),    # Tiempo total de exportación (s)
@@ -0,0 +1,43 @@
+import os                     # Reemplazo atómico y borrado del archivo temporal
+from contextlib import contextmanager
+from typing import Iterator
+
+# Sufijo de los archivos que se escriben mientras dura una exportación
+SUFIJO_TEMPORAL = ".tmp"
+
+
+def ruta_temporal(path: str) -> str:
+    """
+    Ruta donde se escribe `path` hasta que la exportación termina bien.
+    """
+    return path + SUFIJO_TEMPORAL
+
+
+def publicar(path: str, completo: bool) -> None:
+    """
+    Si `completo` es True, el temporal de `path` lo reemplaza (os.replace, atómico);
+    si no, el temporal se borra (si existe) y `path` queda como estaba.
+    """
+    temporal = ruta_temporal(path)
+    if completo:
+        os.replace(temporal, path)
+    elif os.path.exists(temporal):
+        os.remove(temporal)
+
+
+@contextmanager
+def escritura_atomica(path: str) -> Iterator[str]:
+    """
+    Entrega la ruta temporal de `path` para escribir en ella. Si el bloque termina bien,
+    el temporal reemplaza a `path`; si lanza una excepción (p.ej. se cae la conexión a
+    mitad de la lectura), se borra y el archivo exportado antes queda intacto:
+
+        with escritura_atomica("ventas.csv") as temporal:
+            escribir_csv(lotes, temporal)
+    """
+    completo = False
+    try:
+        yield ruta_temporal(path)
+        completo = True
+    finally:
+        publicar(path, completo)
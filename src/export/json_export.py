@@ -1,61 +1,181 @@
-import pandas as pd           # Para manejar datos en formato de tablas (DataFrame)
 import time                   # Para medir el tiempo de ejecución
 import os                     # Para interactuar con el sistema de archivos (tamaño de archivo)
-import json                   # Para manejo de datos JSON (aunque pandas se encarga de la escritura)
-from database.sql_connection import get_connection, get_data
+import json                   # Para serializar cada registro a JSON
+import datetime
+from decimal import Decimal
+from typing import Iterable
+from instrumentacion.metricas import medir, contar
+from export.compresion import abrir, ruta_comprimida
+from export.destino import escritura_atomica
+from database.sql_connection import get_connection, iter_batches, COLUMNAS_VENTAS, TAM_LOTE
+from database.partitioned_extract import iter_particionado
 # get_connection(): devuelve una conexión a la base de datos MySQL
-# get_data(conn, query): ejecuta una consulta SQL y devuelve resultados como lista de tuplas
+# iter_batches(conn, query, batch_size): ejecuta una consulta SQL y entrega los resultados por lotes
 
-def export_json():
+
+def _valor_json(valor):
+    """
+    Convierte los tipos que devuelve MySQL y que json no sabe serializar:
+    fechas → texto ISO ("2024-05-31"), Decimal → float.
     """
-    Extrae todos los registros de la tabla UN.VENTAS desde MySQL,
-    los convierte a un DataFrame de pandas y los exporta a un archivo JSON.
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+# Modos de escritura de escribir_json:
+# - "legible":  lista de objetos con sangría de 4 (el formato original, el más grande).
+# - "compacto": lista de objetos, uno por línea y sin espacios.
+# - "ndjson":   un objeto por línea, sin corchetes (JSON Lines); se puede leer línea a línea.
+# - "columnar": {"columnas": [...], "lotes": [...]}: los nombres de columna una sola vez y
+#               cada lote, en su propia línea, como una lista de arreglos (uno por columna).
+MODOS_JSON = ("legible", "compacto", "ndjson", "columnar")
+
+# Separadores sin espacios para los modos compactos
+SEPARADORES_COMPACTOS = (",", ":")
+
+
+def _objetos_compactos(lote: list[tuple]) -> list[str]:
+    """
+    Cada fila del lote como objeto JSON {columna: valor} en una sola línea, sin espacios.
+    """
+    codificar = json.JSONEncoder(
+        ensure_ascii=False, separators=SEPARADORES_COMPACTOS, default=_valor_json
+    ).encode
+    return [codificar(dict(zip(COLUMNAS_VENTAS, fila))) for fila in lote]
+
+
+@medir("export/json", filas=int)
+def escribir_json(
+    lotes: Iterable[list[tuple]],
+    json_path: str,
+    modo: str = "compacto",
+    compresion: str | None = None,
+    nivel: int | None = None
+) -> int:
+    """
+    Escribe en `json_path` las filas de UN.VENTAS en el modo `modo` (ver MODOS_JSON),
+    agregando cada lote a medida que llega, sin juntar toda la tabla en memoria.
+
+    Parámetros:
+    - lotes: Iterable de listas de tuplas (p.ej. el generador de iter_batches).
+    - json_path: Ruta del archivo JSON de destino.
+    - modo: "legible", "compacto", "ndjson" o "columnar".
+    - compresion: None, "gzip", "bz2" o "lzma": cada lote pasa por el códec al escribirse
+      (ver export.compresion).
+    - nivel: Nivel de compresión (None usa el del códec).
+
+    Retorno:
+    - Número de filas escritas.
+    """
+    if modo not in MODOS_JSON:
+        raise ValueError(f"modo debe ser uno de {MODOS_JSON}, no {modo!r}.")
+
+    filas = 0
+    with abrir(json_path, "w", compresion, nivel, encoding="utf-8") as f:
+        # 1. Apertura del documento
+        if modo == "columnar":
+            f.write(json.dumps({"columnas": COLUMNAS_VENTAS}, separators=SEPARADORES_COMPACTOS)[:-1])
+            f.write(',"lotes":[')
+        elif modo != "ndjson":
+            f.write("[")
+
+        # 2. Cada lote se escribe apenas se recibe de la base de datos
+        for lote in lotes:
+            if not lote:
+                continue
+            if modo == "legible":
+                for fila in lote:
+                    # Separador entre objetos: coma a partir del segundo registro
+                    f.write(",\n    " if filas else "\n    ")
+                    # Cada fila se convierte en un objeto {columna: valor}:
+                    #  - indent=4: agrega sangría para legibilidad
+                    #  - ensure_ascii=False: permite caracteres no ASCII (acentos, eñes, etc.)
+                    registro = json.dumps(
+                        dict(zip(COLUMNAS_VENTAS, fila)),
+                        indent=4, ensure_ascii=False, default=_valor_json
+                    )
+                    f.write(registro.replace("\n", "\n    "))
+                    filas += 1
+                continue
+            if modo == "columnar":
+                # Un solo dumps por lote: las columnas como listas, sin repetir los nombres
+                f.write("\n," if filas else "\n")
+                f.write(json.dumps(
+                    [list(columna) for columna in zip(*lote)],
+                    ensure_ascii=False, separators=SEPARADORES_COMPACTOS, default=_valor_json
+                ))
+            elif modo == "compacto":
+                f.write(",\n" if filas else "\n")
+                f.write(",\n".join(_objetos_compactos(lote)))
+            else:
+                f.write("\n".join(_objetos_compactos(lote)))
+                f.write("\n")
+            filas += len(lote)
+
+        # 3. Cierre del documento
+        if modo == "columnar":
+            f.write("\n]}")
+        elif modo != "ndjson":
+            f.write("\n]" if filas else "]")
+    contar("export/json.bytes", os.path.getsize(json_path))
+    return filas
+
+
+def export_json(batch_size: int = TAM_LOTE, paralelismo: int = 1, modo: str = "compacto",
+                compresion: str | None = None, nivel: int | None = None):
+    """
+    Extrae todos los registros de la tabla UN.VENTAS desde MySQL por lotes
+    y los va escribiendo en un archivo JSON (por defecto, lista de objetos compacta).
     Retorna un diccionario con:
       - formato: "JSON"
       - tiempo: tiempo total de exportación (en segundos, con 4 decimales)
       - tamano_kb: tamaño del archivo JSON resultante (en KB, con 2 decimales)
+    o None si no se pudo conectar a la base de datos.
+
+    Parámetros:
+    - batch_size: Número de filas que se piden a la base de datos en cada lote.
+    - paralelismo: Si es mayor que 1, la tabla se lee por rangos de ID_VENTA con esa
+      cantidad de conexiones simultáneas (ver database.partitioned_extract).
+    - modo: Modo de escribir_json ("compacto" por defecto; "ndjson" escribe "ventas.ndjson").
+    - compresion / nivel: Códec y nivel (ver escribir_json); p.ej. "gzip" escribe "ventas.json.gz".
     """
 
     # 1) Marcar el inicio para medir el tiempo total de la operación
-    start = time.time()
-
-    # 2) Conectarse a la base de datos y recuperar todos los registros de UN.VENTAS
-    conn = get_connection()  # Crea/levanta la conexión MySQL
-    data = get_data(conn, "SELECT * FROM UN.VENTAS")  # Ejecuta la consulta SQL
-    conn.close()  # Cierra la conexión para liberar recursos
-
-    # 3) Definir nombres de columna para el DataFrame
-    columnas = [
-        'ID_VENTA',        # Identificador único de la venta
-        'FECHA_VENTA',     # Fecha en que se realizó la venta
-        'ID_CLIENTE',      # Identificador del cliente
-        'ID_EMPLEADO',     # Identificador del empleado que registró la venta
-        'ID_PRODUCTO',     # Identificador del producto vendido
-        'CANTIDAD',        # Cantidad de unidades vendidas
-        'PRECIO_UNITARIO', # Precio por unidad en el momento de la venta
-        'DESCUENTO',       # Descuento aplicado (porcentaje o valor)
-        'FORMA_PAGO'       # Método de pago utilizado (p.ej. 'Efectivo', 'Tarjeta')
-    ]
-
-    # 4) Convertir la lista de tuplas 'data' en un DataFrame de pandas
-    df = pd.DataFrame(data, columns=columnas)
-
-    # 5) Definir la ruta y nombre del archivo JSON de destino
-    json_path = "ventas.json"
-    # Guardar el DataFrame en formato JSON:
-    #  - orient="records": cada fila se convierte en un objeto JSON dentro de una lista
-    #  - indent=4: agrega sangría para legibilidad
-    #  - force_ascii=False: permite caracteres no ASCII en el JSON (acentos, eñes, etc.)
-    df.to_json(json_path, orient="records", indent=4, force_ascii=False)
-
-    # 6) Medir el tiempo final y calcular el tamaño del archivo en kilobytes
-    end = time.time()  # Momento después de escribir el JSON
+    start = time.perf_counter()
+
+    # 2) Conectarse a la base de datos y escribir UN.VENTAS lote por lote.
+    #    La memoria usada depende de batch_size, no del tamaño de la tabla.
+    json_path = ruta_comprimida("ventas.ndjson" if modo == "ndjson" else "ventas.json", compresion)
+    #    Se escribe a un temporal que reemplaza al archivo solo si la exportación termina
+    #    bien: sin conexión, o si la lectura se corta, el archivo anterior queda intacto.
+    conn = None
+    if paralelismo > 1:
+        # Lectura paralela por rangos de ID_VENTA, reensamblada en orden
+        lotes = iter_particionado(paralelismo, batch_size)
+    else:
+        conn = get_connection()  # Toma una conexión del pool
+        if conn is None:
+            print("Error: no se pudo conectar a la base de datos; no se exportó el JSON.")
+            return None
+        lotes = iter_batches(conn, "SELECT * FROM UN.VENTAS", batch_size)
+    try:
+        with escritura_atomica(json_path) as temporal:
+            escribir_json(lotes, temporal, modo, compresion, nivel)
+    finally:
+        lotes.close()  # Cierra el cursor (o los lectores) antes de devolver la conexión
+        if conn is not None:
+            conn.close()  # Devuelve la conexión al pool
+
+    # 3) Medir el tiempo final y calcular el tamaño del archivo en kilobytes
+    end = time.perf_counter()  # Momento después de escribir el JSON
     size_kb = os.path.getsize(json_path) / 1024  # Tamaño en bytes, dividido por 1024 → KB
 
-    # 7) Construir y retornar el diccionario con la información solicitada
+    # 4) Construir y retornar el diccionario con la información solicitada
     return {
         "formato": "JSON",
         "tiempo": round(end - start, 4),   # Tiempo total de exportación (s)
         "tamano_kb": round(size_kb, 2)     # Tamaño del JSON en KB
     }
-
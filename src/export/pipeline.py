@@ -0,0 +1,256 @@
+import os                     # Para consultar el tamaño de cada archivo generado
+import queue                  # Colas acotadas entre el lector y los escritores
+import threading              # Un hilo por formato de salida
+import time                   # Para medir el tiempo de cada formato
+from functools import partial  # Escritores con un modo fijo (p.ej. JSON en NDJSON)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from database.sql_connection import get_connection, iter_batches, TAM_LOTE
+from database.partitioned_extract import (
+    iter_particionado, leer_particion, rangos_id_venta, validar_paralelismo, PARTICIONES_POR_HILO
+)
+from export.csv_export import escribir_csv
+from export.json_export import escribir_json
+from export.columnar_export import escribir_columnar
+from export.compresion import ruta_comprimida, validar_compresion
+from export.destino import ruta_temporal, publicar, escritura_atomica
+
+# Registro de formatos de salida: nombre → (función escritora, ruta de destino).
+# Cada función recibe un iterable de lotes (listas de tuplas) y la ruta, y devuelve
+# el número de filas escritas. Para agregar un formato basta con registrarlo aquí.
+ESCRITORES: Dict[str, tuple[Callable[[Iterable[list[tuple]], str], int], str]] = {
+    "CSV": (escribir_csv, "ventas.csv"),
+    "JSON": (escribir_json, "ventas.json"),
+    "JSON_LEGIBLE": (partial(escribir_json, modo="legible"), "ventas_legible.json"),
+    "NDJSON": (partial(escribir_json, modo="ndjson"), "ventas.ndjson"),
+    "JSON_COLUMNAR": (partial(escribir_json, modo="columnar"), "ventas_columnas.json"),
+    "NPZ": (escribir_columnar, "ventas.npz"),
+}
+
+# Formatos cuyo contenedor ya comprime por dentro: el códec se pasa al escritor y la
+# ruta no cambia (ver columnar_export.COMPRESIONES)
+CONTENEDORES = {"NPZ"}
+
+# Lotes que pueden esperar en la cola de cada escritor antes de frenar al lector
+TAM_COLA = 8
+
+# Marca de fin de datos que el lector pone en cada cola
+FIN = None
+
+
+def escritor(formato: str, compresion: str | None = None, nivel: int | None = None) -> tuple[Callable, str]:
+    """
+    Función escritora y ruta de destino de `formato` (clave de ESCRITORES) con el códec
+    `compresion` de export.compresion: la ruta gana la extensión del códec
+    ("ventas.csv" → "ventas.csv.gz"), salvo en los CONTENEDORES. Con compresion=None
+    se devuelven los de ESCRITORES sin cambios.
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato desconocido: {formato!r}. Opciones: {list(ESCRITORES)}")
+    validar_compresion(compresion)
+    escribir, path = ESCRITORES[formato]
+    if compresion is None:
+        return escribir, path
+    if formato not in CONTENEDORES:
+        path = ruta_comprimida(path, compresion)
+    return partial(escribir, compresion=compresion, nivel=nivel), path
+
+
+def _destino(formato: str | tuple, compresion: str | None, nivel: int | None) -> tuple[str, str | None, Callable, str]:
+    """
+    Resuelve una entrada de exportar_formatos: un nombre de formato (con el códec general)
+    o una tupla (formato, compresion) o (formato, compresion, path).
+    Retorna (formato, compresion, función escritora, ruta).
+    """
+    if isinstance(formato, str):
+        formato = (formato, compresion)
+    nombre, codec, *path = formato
+    escribir, destino = escritor(nombre, codec, nivel)
+    return nombre, codec, escribir, path[0] if path else destino
+
+
+def _iter_cola(cola: queue.Queue) -> Iterator[list[tuple]]:
+    """
+    Convierte una cola en un iterable de lotes que termina al recibir FIN.
+    """
+    while True:
+        lote = cola.get()
+        if lote is FIN:
+            return
+        yield lote
+
+
+def exportar_formatos(
+    formatos: Iterable[str | Tuple] = ("CSV", "JSON"),
+    batch_size: int = TAM_LOTE,
+    tam_cola: int = TAM_COLA,
+    lotes: Iterable[list[tuple]] | None = None,
+    paralelismo: int = 1,
+    compresion: str | None = None,
+    nivel: int | None = None
+) -> List[dict]:
+    """
+    Lee UN.VENTAS una sola vez y reparte cada lote entre varios escritores de formato
+    (CSV, JSON, ...), cada uno en su propio hilo.
+    Entre el lector y cada escritor hay una cola acotada a `tam_cola` lotes: si un formato
+    se atrasa, el lector espera en lugar de acumular la tabla en memoria.
+
+    Parámetros:
+    - formatos: Formatos a generar: nombres (claves de ESCRITORES) o tuplas
+      (formato, compresion) y (formato, compresion, path), para escribir el mismo formato
+      con varios códecs a partir de una sola lectura. Dos entradas no pueden escribir
+      el mismo archivo (p.ej. NPZ con dos códecs necesita una ruta propia por códec).
+    - batch_size: Número de filas por lote pedido a la base de datos.
+    - tam_cola: Capacidad (en lotes) de la cola de cada escritor.
+    - lotes: Fuente de lotes alternativa. Si es None, se ejecuta
+      "SELECT * FROM UN.VENTAS" con iter_batches sobre una conexión del pool.
+    - paralelismo: Si es mayor que 1 (y no se pasa `lotes`), la tabla se lee por rangos
+      de ID_VENTA con esa cantidad de conexiones simultáneas (ver iter_particionado).
+    - compresion / nivel: Códec ("gzip", "bz2" o "lzma") de los formatos dados por nombre
+      y nivel de todos (ver escritor); None escribe sin comprimir.
+
+    Cada formato se escribe en un archivo temporal (ver export.destino) que reemplaza
+    al de destino solo si la lectura y su escritura terminaron bien: si falla la conexión
+    o la lectura se corta, los archivos exportados antes quedan intactos.
+
+    Retorno:
+    - Lista vacía si no se pudo conectar a la base de datos. Si no, una lista con un
+      diccionario por entrada de `formatos` que se escribió bien, en el mismo orden:
+        { "formato", "compresion", "path", "tiempo" (s desde el inicio hasta que ese
+          formato terminó), "tiempo_cpu" (CPU del hilo escritor: conversión y
+          compresión), "tamano_kb", "filas" }
+    """
+    # Cada entrada se identifica por su posición: el mismo formato puede repetirse con otro códec
+    destinos = [_destino(formato, compresion, nivel) for formato in formatos]
+    paths = [path for _, _, _, path in destinos]
+    repetidos = sorted({path for path in paths if paths.count(path) > 1})
+    if repetidos:
+        raise ValueError(f"Varias entradas de formatos escriben el mismo archivo: {repetidos}")
+    entradas = range(len(destinos))
+
+    # 1. Abrimos la fuente antes de crear ningún archivo: sin conexión no se toca nada
+    conn = None
+    propios = lotes is None
+    if propios and paralelismo > 1:
+        lotes = iter_particionado(paralelismo, batch_size)
+    elif propios:
+        conn = get_connection()
+        if conn is None:
+            print("[Pipeline] No se pudo conectar a la base de datos; no se exportó ningún formato.")
+            return []
+        lotes = iter_batches(conn, "SELECT * FROM UN.VENTAS", batch_size)
+
+    # 2. Marcamos el inicio: todos los tiempos se miden desde aquí
+    start = time.perf_counter()
+    colas = {entrada: queue.Queue(maxsize=tam_cola) for entrada in entradas}
+    resultados: Dict[int, dict] = {}
+
+    def trabajar(entrada: int) -> None:
+        """
+        Cuerpo de cada hilo escritor: consume su cola y escribe el archivo.
+        """
+        formato, codec, escribir, path = destinos[entrada]
+        cola = colas[entrada]
+        cpu_inicio = time.thread_time()
+        try:
+            filas = escribir(_iter_cola(cola), ruta_temporal(path))
+            end = time.perf_counter()
+            resultados[entrada] = {
+                "formato": formato,
+                "compresion": codec,
+                "path": path,
+                "tiempo": round(end - start, 4),
+                "tiempo_cpu": round(time.thread_time() - cpu_inicio, 4),
+                "tamano_kb": round(os.path.getsize(ruta_temporal(path)) / 1024, 2),
+                "filas": filas
+            }
+        except Exception as e:
+            print(f"[Pipeline] Error al escribir {formato} ({codec or 'sin comprimir'}): {e}")
+            # Seguimos vaciando la cola para no bloquear al lector ni a los demás formatos
+            for _ in _iter_cola(cola):
+                pass
+
+    # 3. Arrancamos un hilo escritor por entrada (formato y códec)
+    hilos = [threading.Thread(target=trabajar, args=(entrada,), name=f"Escritor-{destinos[entrada][0]}")
+             for entrada in entradas]
+    for hilo in hilos:
+        hilo.start()
+
+    # 4. El hilo actual lee cada lote una sola vez y lo pone en todas las colas
+    completo = False
+    try:
+        for lote in lotes:
+            for cola in colas.values():
+                cola.put(lote)
+        completo = True
+    finally:
+        # 5. Avisamos el fin de datos (también si hubo un error) y esperamos a los escritores
+        for cola in colas.values():
+            cola.put(FIN)
+        for hilo in hilos:
+            hilo.join()
+        if propios:
+            lotes.close()  # Cierra el cursor (o los lectores) antes de devolver la conexión
+        if conn is not None:
+            conn.close()
+
+        # 6. Publicamos los archivos completos; los temporales de una lectura cortada
+        #    o de un escritor que falló se borran
+        for entrada in entradas:
+            publicar(destinos[entrada][3], completo and entrada in resultados)
+
+    return [resultados[entrada] for entrada in entradas if entrada in resultados]
+
+
+def exportar_partes(
+    formato: str = "CSV",
+    paralelismo: int = 4,
+    batch_size: int = TAM_LOTE,
+    compresion: str | None = None,
+    nivel: int | None = None
+) -> List[dict]:
+    """
+    Variante sin reensamblado: divide UN.VENTAS en rangos de ID_VENTA y cada hilo
+    escribe su rango en un archivo propio ("ventas.part-000.csv", "ventas.part-001.csv", ...).
+    Los archivos, leídos en orden de número de parte, contienen la tabla completa
+    ordenada por ID_VENTA.
+
+    Parámetros:
+    - formato: Nombre del formato (clave de ESCRITORES).
+    - paralelismo: Cantidad de particiones que se leen y escriben a la vez (como mucho,
+      el tamaño del pool: ver validar_paralelismo).
+    - batch_size: Número de filas por lote.
+    - compresion / nivel: Códec y nivel de cada parte (ver escritor).
+
+    Cada parte se escribe en un temporal que la reemplaza solo si su partición se leyó
+    completa: si falla una lectura, esa parte no queda a medio escribir.
+
+    Retorno:
+    - Lista con un diccionario por parte: { "formato", "path", "tiempo", "tamano_kb", "filas" }.
+    """
+    validar_paralelismo(paralelismo)
+    escribir, _ = escritor(formato, compresion, nivel)
+    base, extension = os.path.splitext(ESCRITORES[formato][1])
+    if formato not in CONTENEDORES:
+        extension = ruta_comprimida(extension, compresion)
+    rangos = rangos_id_venta(paralelismo * PARTICIONES_POR_HILO)
+    start = time.perf_counter()
+
+    def escribir_parte(indice: int, desde: int, hasta: int) -> dict:
+        """
+        Lee un rango de ID_VENTA y lo escribe en su archivo de parte.
+        """
+        path_parte = f"{base}.part-{indice:03d}{extension}"
+        with escritura_atomica(path_parte) as temporal:
+            filas = escribir(leer_particion(desde, hasta, batch_size), temporal)
+        return {
+            "formato": formato,
+            "path": path_parte,
+            "tiempo": round(time.perf_counter() - start, 4),
+            "tamano_kb": round(os.path.getsize(path_parte) / 1024, 2),
+            "filas": filas
+        }
+
+    with ThreadPoolExecutor(max_workers=paralelismo, thread_name_prefix="Parte") as pool:
+        futuros = [pool.submit(escribir_parte, i, desde, hasta) for i, (desde, hasta) in enumerate(rangos)]
+        return [futuro.result() for futuro in futuros]
@@ -0,0 +1,278 @@
+import os                     # Tamaño del archivo generado
+import struct                 # Encabezado binario del archivo
+from typing import Dict, Iterator
+import numpy as np            # Codificación y decodificación vectorizadas
+from instrumentacion.metricas import medir, contar
+from export.compresion import abrir
+
+# Formato ".ord": una lista de enteros ordenada, guardada una sola vez y comprimida.
+# Encabezado: firma, versión, codificación, cantidad de valores (little-endian).
+FIRMA = b"ORDN"
+VERSION = 1
+FORMATO_ENCABEZADO = "<4sBBxxQ"
+TAM_ENCABEZADO = struct.calcsize(FORMATO_ENCABEZADO)
+
+# Codificaciones del cuerpo (todas en varint LEB128: 7 bits por byte):
+# - "rle":   pares (salto desde el valor anterior, repeticiones). Ideal para pocos valores
+#            distintos, como CANTIDAD: un millón de filas ocupa unos pocos KB.
+# - "delta": primer valor y luego la diferencia con el anterior (siempre >= 0).
+CODIFICACIONES = {"rle": 0, "delta": 1}
+
+# Repeticiones máximas por par en "rle": las rachas más largas se parten en varios pares
+# (el lector igual reparte cada racha entre bloques de a lo sumo tam_bloque valores)
+MAX_RACHA = 65536
+
+# Valores por bloque que entrega el lector
+TAM_BLOQUE = 65536
+
+# Bytes del archivo que el lector decodifica por vez
+TAM_LECTURA = 1024 * 1024
+
+
+def _zigzag(valor: int) -> int:
+    """
+    Entero con signo → sin signo (0, -1, 1, -2 ... → 0, 1, 2, 3 ...), para el primer valor.
+    """
+    return valor * 2 if valor >= 0 else -valor * 2 - 1
+
+
+def _deszigzag(valor: int) -> int:
+    """
+    Inversa de _zigzag.
+    """
+    return valor // 2 if valor % 2 == 0 else -(valor + 1) // 2
+
+
+def _largo_varint(valores: np.ndarray) -> np.ndarray:
+    """
+    Bytes que ocupa cada valor (uint64) en varint.
+    """
+    largo = np.ones(valores.shape, dtype=np.int64)
+    for k in range(1, 10):
+        largo += valores >= np.uint64(1 << (7 * k))
+    return largo
+
+
+def codificar_varint(valores: np.ndarray) -> bytes:
+    """
+    Codifica enteros sin signo en varint LEB128, todos a la vez: el byte k de cada valor
+    lleva sus bits 7k a 7k + 6, y el bit alto indica que sigue otro byte.
+    """
+    valores = np.asarray(valores, dtype=np.uint64)
+    if valores.size == 0:
+        return b""
+    largo = _largo_varint(valores)
+    inicio = np.cumsum(largo) - largo
+    salida = np.empty(int(largo.sum()), dtype=np.uint8)
+    for k in range(int(largo.max())):
+        activos = largo > k
+        byte = (valores[activos] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        sigue = (largo[activos] > k + 1).astype(np.uint64) << np.uint64(7)
+        salida[inicio[activos] + k] = (byte | sigue).astype(np.uint8)
+    return salida.tobytes()
+
+
+def decodificar_varint(datos: np.ndarray) -> np.ndarray:
+    """
+    Decodifica una secuencia completa de varints (uint8) en un arreglo uint64.
+    """
+    if datos.size == 0:
+        return np.empty(0, dtype=np.uint64)
+    finales = np.flatnonzero((datos & 0x80) == 0)
+    inicios = np.concatenate(([0], finales[:-1] + 1))
+    # Posición de cada byte dentro de su varint
+    grupo = np.repeat(np.arange(finales.size), finales - inicios + 1)
+    posicion = np.arange(datos.size) - inicios[grupo]
+    aportes = (datos & 0x7F).astype(np.uint64) << (7 * posicion).astype(np.uint64)
+    return np.add.reduceat(aportes, inicios)
+
+
+def _rachas(valores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Valores distintos y repeticiones de cada uno (con rachas de a lo sumo MAX_RACHA).
+    """
+    distintos, cuentas = np.unique(valores, return_counts=True)
+    partes = (cuentas + MAX_RACHA - 1) // MAX_RACHA
+    distintos = np.repeat(distintos, partes)
+    # Cada racha larga se parte en pares de MAX_RACHA y un resto
+    cuentas_partidas = np.full(distintos.size, MAX_RACHA, dtype=np.int64)
+    ultimos = np.cumsum(partes) - 1
+    cuentas_partidas[ultimos] = cuentas - (partes - 1) * MAX_RACHA
+    return distintos, cuentas_partidas
+
+
+def _cuerpo(valores: np.ndarray, codificacion: str) -> bytes:
+    """
+    Cuerpo del archivo para `valores` (int64, ordenados) con la codificación pedida.
+    """
+    if valores.size == 0:
+        return b""
+    primero = np.array([_zigzag(int(valores[0]))], dtype=np.uint64)
+    if codificacion == "delta":
+        saltos = np.diff(valores).astype(np.uint64)
+        return codificar_varint(np.concatenate((primero, saltos)))
+    distintos, cuentas = _rachas(valores)
+    saltos = np.concatenate((primero, np.diff(distintos).astype(np.uint64)))
+    pares = np.empty(2 * distintos.size, dtype=np.uint64)
+    pares[0::2] = saltos
+    pares[1::2] = cuentas
+    return codificar_varint(pares)
+
+
+@medir("export/ordenados")
+def escribir_ordenados(valores, path: str, codificacion: str | None = None, compresion: str | None = None,
+                       nivel: int | None = None) -> dict:
+    """
+    Guarda una lista de enteros ordenada en formato ".ord" (binario compacto).
+
+    Parámetros:
+    - valores: Lista o arreglo de enteros en orden ascendente.
+    - path: Ruta del archivo de destino (p.ej. "CSV_sorted.ord").
+    - codificacion: "rle", "delta" o None para elegir la que ocupe menos.
+    - compresion / nivel: Códec de export.compresion aplicado sobre todo el archivo (útil
+      con "delta", cuyos saltos se repiten mucho); iter_ordenados lo detecta al leer.
+
+    Retorno:
+    - Diccionario { "path", "codificacion", "n", "bytes" }.
+    """
+    if codificacion is not None and codificacion not in CODIFICACIONES:
+        raise ValueError(f"codificacion debe ser una de {list(CODIFICACIONES)}, no {codificacion!r}.")
+    arreglo = np.asarray(valores, dtype=np.int64)
+    if arreglo.size > 1 and (np.diff(arreglo) < 0).any():
+        raise ValueError("Los valores no están en orden ascendente.")
+
+    # 1. Codificamos el cuerpo; sin codificación pedida, nos quedamos con el más corto
+    opciones = [codificacion] if codificacion else list(CODIFICACIONES)
+    cuerpos = {opcion: _cuerpo(arreglo, opcion) for opcion in opciones}
+    elegida = min(cuerpos, key=lambda opcion: len(cuerpos[opcion]))
+
+    # 2. Encabezado + cuerpo
+    with abrir(path, "wb", compresion, nivel) as f:
+        f.write(struct.pack(FORMATO_ENCABEZADO, FIRMA, VERSION, CODIFICACIONES[elegida], arreglo.size))
+        f.write(cuerpos[elegida])
+    tamano = os.path.getsize(path)
+    contar("export/ordenados.bytes", tamano)
+    return {"path": path, "codificacion": elegida, "n": int(arreglo.size), "bytes": tamano}
+
+
+def guardar_resultados_ordenados(results: Dict[str, dict], path: str, codificacion: str | None = None,
+                                 compresion: str | None = None) -> dict | None:
+    """
+    Comprueba que todos los algoritmos de `results` (como los devuelve
+    run_sorts_in_threads) produjeron la misma lista ordenada y guarda una sola copia
+    con escribir_ordenados.
+
+    Retorno:
+    - El diccionario de escribir_ordenados más "algoritmos" (los que coincidieron),
+      o None si no hay resultados o si algún algoritmo no coincide con los demás.
+    """
+    if not results:
+        print("No hay resultados para guardar.")
+        return None
+
+    # 1. Todos deben coincidir con el primero
+    nombres = list(results)
+    referencia = np.asarray(results[nombres[0]]["sorted"], dtype=np.int64)
+    distintos = [
+        nombre for nombre in nombres[1:]
+        if not np.array_equal(np.asarray(results[nombre]["sorted"], dtype=np.int64), referencia)
+    ]
+    if distintos:
+        print(f"Error: {', '.join(distintos)} no coinciden con {nombres[0]}; no se guardó {path}.")
+        return None
+
+    # 2. Una sola copia en disco
+    try:
+        resultado = escribir_ordenados(referencia, path, codificacion, compresion)
+    except ValueError as e:
+        print(f"Error al guardar {path}: {e}")
+        return None
+    return {**resultado, "algoritmos": nombres}
+
+
+def _leer_encabezado(f) -> tuple[str, int]:
+    """
+    Valida el encabezado y devuelve (codificación, cantidad de valores).
+    """
+    datos = f.read(TAM_ENCABEZADO)
+    if len(datos) < TAM_ENCABEZADO:
+        raise ValueError("Archivo .ord incompleto.")
+    firma, version, codigo, n = struct.unpack(FORMATO_ENCABEZADO, datos)
+    if firma != FIRMA or version != VERSION:
+        raise ValueError("No es un archivo .ord válido (firma o versión desconocida).")
+    nombres = {codigo_: nombre for nombre, codigo_ in CODIFICACIONES.items()}
+    if codigo not in nombres:
+        raise ValueError(f"Codificación desconocida en el archivo .ord: {codigo}.")
+    return nombres[codigo], n
+
+
+def _iter_varints(f, multiplo: int) -> Iterator[np.ndarray]:
+    """
+    Recorre los varints del resto del archivo en bloques de hasta TAM_LECTURA bytes.
+    Cada bloque tiene una cantidad de varints múltiplo de `multiplo` (2 para los pares
+    de "rle"); lo que sobra se completa con la lectura siguiente.
+    """
+    resto = np.empty(0, dtype=np.uint8)
+    while True:
+        leido = f.read(TAM_LECTURA)
+        datos = np.concatenate((resto, np.frombuffer(leido, dtype=np.uint8))) if leido else resto
+        finales = np.flatnonzero((datos & 0x80) == 0)
+        completos = finales.size - finales.size % multiplo
+        if completos == 0:
+            if not leido:
+                if datos.size:
+                    raise ValueError("Archivo .ord truncado.")
+                return
+            resto = datos
+            continue
+        corte = finales[completos - 1] + 1
+        yield decodificar_varint(datos[:corte])
+        resto = datos[corte:]
+
+
+def iter_ordenados(path: str, tam_bloque: int = TAM_BLOQUE) -> Iterator[np.ndarray]:
+    """
+    Lee un archivo ".ord" por streaming y entrega los valores en orden, en bloques
+    (arreglos int64) de a lo sumo `tam_bloque` valores, sin cargar la lista completa.
+    Si el archivo está comprimido (ver escribir_ordenados), se descomprime al leerlo.
+    """
+    with abrir(path, "rb") as f:
+        codificacion, _ = _leer_encabezado(f)
+        anterior = None  # Último valor entregado (los saltos son relativos a él)
+        for varints in _iter_varints(f, 2 if codificacion == "rle" else 1):
+            saltos = varints[0::2] if codificacion == "rle" else varints
+            if anterior is None:
+                # El primer valor va en zigzag; los siguientes son saltos desde él
+                primero = _deszigzag(int(saltos[0]))
+                valores = primero + np.concatenate(([0], np.cumsum(saltos[1:].astype(np.int64))))
+            else:
+                valores = anterior + np.cumsum(saltos.astype(np.int64))
+            anterior = int(valores[-1])
+
+            if codificacion == "delta":
+                for i in range(0, valores.size, tam_bloque):
+                    yield valores[i:i + tam_bloque]
+                continue
+
+            # "rle": se expanden de a tam_bloque valores; una racha que no entra en lo que
+            # queda del bloque se reparte y el resto de sus repeticiones pasa al siguiente
+            cuentas = varints[1::2].astype(np.int64)
+            acumuladas = np.cumsum(cuentas)
+            total = int(acumuladas[-1])
+            for desde in range(0, total, tam_bloque):
+                hasta = min(desde + tam_bloque, total)
+                # Rachas [i, j) que cubren las posiciones [desde, hasta), recortadas en los bordes
+                i = int(np.searchsorted(acumuladas, desde, side="right"))
+                j = int(np.searchsorted(acumuladas, hasta, side="left")) + 1
+                partes = cuentas[i:j].copy()
+                partes[0] -= desde - (acumuladas[i] - cuentas[i])
+                partes[-1] -= acumuladas[j - 1] - hasta
+                yield np.repeat(valores[i:j], partes)
+
+
+def leer_ordenados(path: str) -> list[int]:
+    """
+    Lee un archivo ".ord" completo como lista de enteros.
+    """
+    bloques = list(iter_ordenados(path))
+    return np.concatenate(bloques).tolist() if bloques else []
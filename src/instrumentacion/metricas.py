@@ -0,0 +1,355 @@
+import cProfile      # Perfil opcional de funciones
+import functools     # Para que los decoradores conserven nombre y docstring
+import inspect       # Para distinguir funciones de generadores al decorar
+import io            # Para capturar el texto de pstats
+import json          # Reporte estructurado
+import os            # Variables de entorno de activación
+import pstats        # Resumen del perfil de cProfile
+import sys           # Plataforma (unidades de ru_maxrss)
+import threading     # Lock del registro: se mide desde varios hilos a la vez
+import time          # perf_counter y thread_time
+import tracemalloc   # Captura opcional de memoria asignada por Python
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator
+
+# Los perfiles (cProfile / tracemalloc) son caros: solo se capturan si están activados
+# con activar_perfiles() o con la variable de entorno INSTRUMENTACION_PERFIL=1.
+PERFIL_ACTIVO = os.environ.get("INSTRUMENTACION_PERFIL", "0") == "1"
+
+# Funciones que se guardan de cada perfil de cProfile (las de mayor tiempo acumulado)
+FUNCIONES_PERFIL = 25
+
+# Prefijo de las métricas exportadas a Prometheus
+PREFIJO_PROMETHEUS = "ed2"
+
+
+class Registro:
+    """
+    Acumula, de forma segura entre hilos, los tiempos medidos (por nombre), los contadores
+    (filas, bytes, mensajes...) y los perfiles capturados en el proceso actual.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tiempos: Dict[str, dict] = {}
+        self.contadores: Dict[str, float] = {}
+        self.perfiles: Dict[str, dict] = {}
+        self._estadisticas: Dict[str, pstats.Stats] = {}
+
+    def observar(self, nombre: str, segundos: float, cpu: float | None = None) -> None:
+        """
+        Registra una duración de `nombre` (y opcionalmente su tiempo de CPU).
+        Sirve también para tiempos medidos en otro lugar (p.ej. en otro proceso).
+        """
+        with self._lock:
+            t = self.tiempos.get(nombre)
+            if t is None:
+                t = self.tiempos[nombre] = {"llamadas": 0, "total": 0.0, "maximo": 0.0, "cpu": None}
+            t["llamadas"] += 1
+            t["total"] += segundos
+            t["maximo"] = max(t["maximo"], segundos)
+            if cpu is not None:
+                t["cpu"] = (t["cpu"] or 0.0) + cpu
+
+    def contar(self, nombre: str, valor: float = 1) -> None:
+        """
+        Suma `valor` al contador `nombre`.
+        """
+        with self._lock:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + valor
+
+    def guardar_perfil(self, nombre: str, perfil: dict) -> None:
+        with self._lock:
+            self.perfiles[nombre] = perfil
+
+    def acumular_cprofile(self, nombre: str, perfil: cProfile.Profile) -> str:
+        """
+        Suma `perfil` a las estadísticas de cProfile acumuladas bajo `nombre` (un mismo
+        bloque se perfila muchas veces, p.ej. cada lote de la consulta) y devuelve el
+        resumen de sus FUNCIONES_PERFIL funciones de mayor tiempo acumulado.
+        """
+        with self._lock:
+            estadisticas = self._estadisticas.get(nombre)
+            if estadisticas is None:
+                estadisticas = self._estadisticas[nombre] = pstats.Stats(perfil)
+            else:
+                estadisticas.add(perfil)
+            texto = io.StringIO()
+            estadisticas.stream = texto
+            estadisticas.sort_stats("cumulative").print_stats(FUNCIONES_PERFIL)
+        return texto.getvalue()
+
+    def reporte(self) -> dict:
+        """
+        Copia del estado actual como diccionario serializable a JSON.
+        """
+        with self._lock:
+            tiempos = {
+                nombre: {**t, "media": t["total"] / t["llamadas"]}
+                for nombre, t in sorted(self.tiempos.items())
+            }
+            return {
+                "tiempos": tiempos,
+                "contadores": dict(sorted(self.contadores.items())),
+                "rss_pico_bytes": rss_pico(),
+                "perfiles": dict(self.perfiles),
+            }
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self.tiempos.clear()
+            self.contadores.clear()
+            self.perfiles.clear()
+            self._estadisticas.clear()
+
+
+# Registro global del proceso: lo usan todos los módulos instrumentados
+registro = Registro()
+
+
+def rss_pico() -> int | None:
+    """
+    Memoria residente máxima (bytes) alcanzada por el proceso hasta ahora.
+    Usa resource en Linux/macOS y psutil en Windows; None si no hay cómo medirla.
+    """
+    try:
+        import resource
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa KB; macOS, bytes
+        return maximo if sys.platform == "darwin" else maximo * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        memoria = psutil.Process().memory_info()
+        return getattr(memoria, "peak_wset", memoria.rss)
+    except ImportError:
+        return None
+
+
+class medir:
+    """
+    Mide el tiempo de reloj (perf_counter) y de CPU del hilo (thread_time) de un bloque
+    y lo acumula en el registro bajo `nombre`.
+
+    Se usa como context manager:
+        with medir("export/csv"):
+            ...
+    o como decorador de funciones y de generadores:
+        @medir("load/csv", filas=len)
+        def iter_csv_cantidad(...): ...
+    En un generador solo se mide el tiempo que pasa produciendo cada elemento, no el
+    que usa quien lo consume.
+    Si los perfiles están activados, el bloque también se perfila con perfilar(nombre).
+
+    Parámetros:
+    - nombre: Nombre del tiempo en el reporte.
+    - filas: (Opcional) función que recibe el valor retornado (o cada elemento entregado,
+      en un generador) y devuelve cuántas filas representa; se suma al contador
+      "<nombre>.filas".
+    """
+
+    def __init__(self, nombre: str, filas: Callable | None = None):
+        self.nombre = nombre
+        self.filas = filas
+        self._inicios = threading.local()
+
+    def __enter__(self):
+        perfil = self._perfil()
+        perfil.__enter__()
+        pila = self._inicios.__dict__.setdefault("pila", [])
+        pila.append((time.perf_counter(), time.thread_time(), perfil))
+        return self
+
+    def __exit__(self, *exc):
+        inicio, cpu_inicio, perfil = self._inicios.pila.pop()
+        registro.observar(self.nombre, time.perf_counter() - inicio, time.thread_time() - cpu_inicio)
+        perfil.__exit__(*exc)
+        return False
+
+    def _perfil(self):
+        """
+        perfilar(nombre) si los perfiles están activados; si no, un contexto vacío.
+        """
+        return perfilar(self.nombre) if PERFIL_ACTIVO else nullcontext()
+
+    def __call__(self, func: Callable) -> Callable:
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def envoltura_generador(*args, **kwargs):
+                return self._medir_generador(func(*args, **kwargs))
+            return envoltura_generador
+
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            with self:
+                resultado = func(*args, **kwargs)
+            if self.filas is not None:
+                registro.contar(f"{self.nombre}.filas", self.filas(resultado))
+            return resultado
+        return envoltura
+
+    def _medir_generador(self, generador: Iterator) -> Iterator:
+        """
+        Recorre `generador` acumulando solo el tiempo de cada next().
+        """
+        total = cpu = 0.0
+        filas = 0
+        try:
+            while True:
+                with self._perfil():
+                    inicio, cpu_inicio = time.perf_counter(), time.thread_time()
+                    try:
+                        item = next(generador)
+                    except StopIteration:
+                        return
+                    finally:
+                        total += time.perf_counter() - inicio
+                        cpu += time.thread_time() - cpu_inicio
+                if self.filas is not None:
+                    filas += self.filas(item)
+                yield item
+        finally:
+            generador.close()
+            registro.observar(self.nombre, total, cpu)
+            if self.filas is not None:
+                registro.contar(f"{self.nombre}.filas", filas)
+
+
+def contar(nombre: str, valor: float = 1) -> None:
+    """
+    Suma `valor` al contador `nombre` del registro global.
+    """
+    registro.contar(nombre, valor)
+
+
+def activar_perfiles(activo: bool = True) -> None:
+    """
+    Activa o desactiva la captura de perfiles en perfilar().
+    """
+    global PERFIL_ACTIVO
+    PERFIL_ACTIVO = activo
+
+
+# Marca de perfilar() en curso en cada hilo (los anidados no capturan nada)
+_perfilando = threading.local()
+
+
+@contextmanager
+def perfilar(nombre: str, cpu: bool = True, memoria: bool = False):
+    """
+    Captura un perfil del bloque si los perfiles están activados (si no, no hace nada):
+    - cpu: cProfile, acumulando todas las capturas de `nombre` y guardando las
+      FUNCIONES_PERFIL funciones de mayor tiempo acumulado.
+    - memoria: tracemalloc, guardando el mayor pico de memoria asignada y las líneas que
+      más asignan en la última captura.
+    El resultado queda en registro.perfiles[nombre].
+    Un perfilar() dentro de otro en el mismo hilo no captura nada: su tiempo ya queda en
+    el de afuera. Tampoco se captura CPU si ya hay otro perfilador activo (Python 3.12+
+    admite uno solo por proceso).
+    """
+    if not PERFIL_ACTIVO or getattr(_perfilando, "activo", False):
+        yield
+        return
+
+    perfil = cProfile.Profile() if cpu else None
+    iniciar_traza = memoria and not tracemalloc.is_tracing()
+    if iniciar_traza:
+        tracemalloc.start()
+    if perfil is not None:
+        try:
+            perfil.enable()
+        except ValueError:
+            perfil = None
+    _perfilando.activo = True
+    try:
+        yield
+    finally:
+        _perfilando.activo = False
+        resultado = dict(registro.perfiles.get(nombre, {}))
+        if perfil is not None:
+            perfil.disable()
+            resultado["cprofile"] = registro.acumular_cprofile(nombre, perfil)
+        if memoria and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            lineas = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            anterior = resultado.get("tracemalloc", {}).get("pico_bytes", 0)
+            resultado["tracemalloc"] = {
+                "actual_bytes": actual,
+                "pico_bytes": max(pico, anterior),
+                "top": [str(linea) for linea in lineas],
+            }
+            if iniciar_traza:
+                tracemalloc.stop()
+        registro.guardar_perfil(nombre, resultado)
+
+
+def guardar_reporte(path: str = "metricas.json") -> None:
+    """
+    Escribe el reporte del registro global en JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registro.reporte(), f, indent=2)
+
+
+def imprimir_reporte() -> None:
+    """
+    Muestra por pantalla los tiempos, contadores, el pico de memoria del proceso y los
+    nombres de los perfiles capturados (su detalle queda en guardar_reporte()).
+    """
+    reporte = registro.reporte()
+    print("\n📈 MÉTRICAS:")
+    for nombre, t in reporte["tiempos"].items():
+        cpu = f", CPU {t['cpu']:.4f} s" if t["cpu"] is not None else ""
+        print(f"  ⏱ {nombre}: {t['total']:.4f} s en {t['llamadas']} llamada(s) "
+              f"(máx {t['maximo']:.4f} s{cpu})")
+    for nombre, valor in reporte["contadores"].items():
+        print(f"  # {nombre}: {valor:,.0f}")
+    if reporte["rss_pico_bytes"] is not None:
+        print(f"  💾 RSS pico: {reporte['rss_pico_bytes'] / (1024 * 1024):.1f} MB")
+    if reporte["perfiles"]:
+        print(f"  🔬 Perfiles: {', '.join(sorted(reporte['perfiles']))}")
+
+
+class ColectorPrometheus:
+    """
+    Colector de prometheus_client que expone el registro global en cada consulta:
+    <prefijo>_tiempo_segundos_total, <prefijo>_llamadas_total y <prefijo>_tiempo_max_segundos
+    con la etiqueta "nombre", <prefijo>_contador_total y <prefijo>_rss_pico_bytes.
+    """
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        reporte = registro.reporte()
+        total = CounterMetricFamily(f"{PREFIJO_PROMETHEUS}_tiempo_segundos",
+                                    "Tiempo acumulado por operación", labels=["nombre"])
+        llamadas = CounterMetricFamily(f"{PREFIJO_PROMETHEUS}_llamadas",
+                                       "Veces que se midió cada operación", labels=["nombre"])
+        maximo = GaugeMetricFamily(f"{PREFIJO_PROMETHEUS}_tiempo_max_segundos",
+                                   "Duración máxima por operación", labels=["nombre"])
+        for nombre, t in reporte["tiempos"].items():
+            total.add_metric([nombre], t["total"])
+            llamadas.add_metric([nombre], t["llamadas"])
+            maximo.add_metric([nombre], t["maximo"])
+        contadores = CounterMetricFamily(f"{PREFIJO_PROMETHEUS}_contador",
+                                         "Contadores (filas, bytes, mensajes...)", labels=["nombre"])
+        for nombre, valor in reporte["contadores"].items():
+            contadores.add_metric([nombre], valor)
+        yield from (total, llamadas, maximo, contadores)
+        if reporte["rss_pico_bytes"] is not None:
+            yield GaugeMetricFamily(f"{PREFIJO_PROMETHEUS}_rss_pico_bytes",
+                                    "Memoria residente máxima del proceso", value=reporte["rss_pico_bytes"])
+
+
+def iniciar_endpoint_prometheus(port: int, host: str = "0.0.0.0") -> None:
+    """
+    Sirve el registro global en http://host:port/metrics (en un hilo de fondo) para
+    que Prometheus lo consulte. Requiere prometheus_client.
+    """
+    from prometheus_client import CollectorRegistry, start_http_server
+
+    registro_prometheus = CollectorRegistry()
+    registro_prometheus.register(ColectorPrometheus())
+    start_http_server(port, addr=host, registry=registro_prometheus)
+    print(f"[Métricas] Prometheus en http://{host}:{port}/metrics")
@@ -0,0 +1,34 @@
+from array import array  # Arreglo tipado de enteros, sin un objeto de Python por valor
+
+# Tamaño por defecto de cada bloque que entregan los cargadores por streaming
+TAM_BLOQUE = 65536
+
+# Formatos de bloque soportados
+FORMATOS = ("array", "numpy")
+
+
+def nuevo_bloque() -> array:
+    """
+    Crea un bloque vacío de enteros de 32 bits (array('i')).
+    """
+    return array("i")
+
+
+def entregar_bloque(bloque: array, formato: str = "array"):
+    """
+    Convierte un bloque acumulado al formato pedido por el usuario.
+
+    Parámetros:
+    - bloque: array('i') con los valores leídos.
+    - formato: "array" para devolver el mismo array('i'), o "numpy" para un arreglo
+      int32 de NumPy que comparte la memoria del bloque (sin copia).
+
+    Retorno:
+    - El bloque en el formato indicado.
+    """
+    if formato == "array":
+        return bloque
+    if formato == "numpy":
+        import numpy as np  # Solo se importa si se piden bloques de NumPy
+        return np.frombuffer(bloque, dtype=np.int32)
+    raise ValueError(f"formato debe ser uno de {FORMATOS}, no {formato!r}.")
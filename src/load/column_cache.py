@@ -0,0 +1,155 @@
+import hashlib    # Para derivar el nombre del archivo de caché
+import mmap       # Para mapear el archivo de caché en memoria sin copiarlo
+import os         # Para consultar fecha de modificación y tamaño del archivo de origen
+import struct     # Para el encabezado binario del archivo de caché
+from array import array
+import numpy as np  # Validación y conversión a int32 de los bloques de cualquier cargador
+from load.loadcsv import iter_csv_cantidad
+from load.loadjson import iter_json_cantidad
+from load.loadcolumnar import iter_columnar_cantidad
+from instrumentacion.metricas import medir
+from export.compresion import extension_base
+
+# Carpeta donde se guardan los archivos de caché
+DIR_CACHE = ".cache_columnas"
+
+# Encabezado: firma, mtime_ns y tamaño del origen, cantidad de valores (relleno a 32 bytes
+# para que los datos queden alineados)
+FIRMA = b"CCOL"
+FORMATO_ENCABEZADO = "<4s4xqqq"
+TAM_ENCABEZADO = struct.calcsize(FORMATO_ENCABEZADO)
+
+# Los valores se guardan como enteros de 32 bits, igual que los bloques de los cargadores
+TIPO_ENTERO = "i"
+INFO_ENTERO = np.iinfo(np.int32)
+
+# Cargador por streaming según la extensión del archivo de origen (sin la del códec:
+# "ventas.csv.gz" usa el de ".csv"). Cada uno entrega bloques (array('i') o arreglos int32) con método tobytes().
+CARGADORES = {
+    ".csv": iter_csv_cantidad,
+    ".json": iter_json_cantidad,
+    ".ndjson": iter_json_cantidad,
+    ".npz": iter_columnar_cantidad,
+}
+
+
+def ruta_cache(path: str, column: str, n: int | None, dir_cache: str = DIR_CACHE) -> str:
+    """
+    Ruta del archivo de caché para (archivo de origen, columna, límite de filas).
+    """
+    clave = f"{os.path.abspath(path)}|{column}|{n}"
+    nombre = hashlib.sha1(clave.encode("utf-8")).hexdigest()
+    return os.path.join(dir_cache, f"{nombre}.col")
+
+
+def _leer_encabezado(ruta: str) -> tuple[int, int, int] | None:
+    """
+    Devuelve (mtime_ns, tamaño, cantidad) guardados en la caché, o None si no existe
+    o no es un archivo de caché válido.
+    """
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read(TAM_ENCABEZADO)
+    except FileNotFoundError:
+        return None
+    if len(datos) < TAM_ENCABEZADO:
+        return None
+    firma, mtime_ns, tamano, cantidad = struct.unpack(FORMATO_ENCABEZADO, datos)
+    if firma != FIRMA:
+        return None
+    return mtime_ns, tamano, cantidad
+
+
+def _bytes_int32(bloque, column: str) -> bytes:
+    """
+    Bytes de un bloque como enteros de 32 bits (TIPO_ENTERO), sea array('i') o un arreglo
+    de NumPy de cualquier tipo (las columnas de un NPZ conservan el suyo: int64, float64...).
+    Lanza ValueError si la columna no es entera o tiene valores que no caben en 32 bits.
+    """
+    arreglo = np.asarray(bloque)
+    if arreglo.dtype.kind not in "iu":
+        raise ValueError(f"La columna {column!r} es de tipo {arreglo.dtype} y la caché solo guarda enteros.")
+    if arreglo.size and (arreglo.min() < INFO_ENTERO.min or arreglo.max() > INFO_ENTERO.max):
+        raise ValueError(f"La columna {column!r} tiene valores que no caben en un entero de 32 bits.")
+    return arreglo.astype(np.int32, copy=False).tobytes()
+
+
+@medir("load/cache_construir")
+def _construir_cache(
+    path: str,
+    column: str,
+    n: int | None,
+    ruta: str,
+    origen: os.stat_result
+) -> None:
+    """
+    Parsea el archivo de origen una vez con el cargador por streaming que corresponde
+    a su extensión y escribe los valores como enteros binarios en `ruta`.
+    Se escribe primero a un archivo temporal y luego se renombra, para que un proceso
+    que lea en paralelo nunca vea una caché a medio escribir.
+    """
+    extension = extension_base(path)
+    if extension not in CARGADORES:
+        raise ValueError(f"No hay cargador para archivos {extension!r}. Opciones: {list(CARGADORES)}")
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    cantidad = 0
+    try:
+        with open(temporal, "wb") as f:
+            # Reservamos el encabezado y lo completamos al final, cuando sabemos la cantidad
+            f.write(bytes(TAM_ENCABEZADO))
+            for bloque in CARGADORES[extension](path, column, n):
+                f.write(_bytes_int32(bloque, column))
+                cantidad += len(bloque)
+            f.seek(0)
+            f.write(struct.pack(FORMATO_ENCABEZADO, FIRMA, origen.st_mtime_ns, origen.st_size, cantidad))
+    except BaseException:
+        os.remove(temporal)  # No dejamos una caché a medio escribir
+        raise
+    os.replace(temporal, ruta)
+
+
+@medir("load/cache", filas=len)
+def load_cantidad_cache(
+    path: str,
+    column: str = "CANTIDAD",
+    n: int | None = None,
+    dir_cache: str = DIR_CACHE
+) -> memoryview:
+    """
+    Devuelve la columna `column` de `path` (CSV, JSON o NPZ) leída desde una caché binaria.
+    La primera vez (o cuando el archivo de origen cambió de fecha de modificación o de tamaño)
+    se parsea el origen y se guarda la columna como enteros de 32 bits; las siguientes veces
+    el archivo de caché se mapea en memoria y se devuelve sin copiar ni parsear nada.
+
+    Parámetros:
+    - path: Ruta al archivo de origen (p.ej., "ventas.csv").
+    - column: Nombre de la columna a extraer (p.ej., "CANTIDAD").
+    - n: Número de filas a leer. Si es None, lee todas las filas.
+    - dir_cache: Carpeta de los archivos de caché.
+
+    Retorno:
+    - memoryview de enteros (formato 'i') sobre el archivo mapeado. Se indexa como una lista;
+      .tolist() la convierte en lista de Python si se necesita una copia modificable.
+      La vista es la única dueña del mapeo: al liberarla (con `with ... as valores:` o
+      .release()), o cuando deja de usarse, el mmap se cierra. No hay que cerrar nada más.
+
+    Lanza ValueError si la columna no es entera o no cabe en 32 bits (ver _bytes_int32).
+    """
+    origen = os.stat(path)
+    ruta = ruta_cache(path, column, n, dir_cache)
+
+    # 1. Si la caché no existe o quedó vieja, la reconstruimos desde el archivo de origen
+    encabezado = _leer_encabezado(ruta)
+    if encabezado is None or encabezado[:2] != (origen.st_mtime_ns, origen.st_size):
+        _construir_cache(path, column, n, ruta, origen)
+
+    # 2. Mapeamos el archivo en memoria (solo lectura) y saltamos el encabezado
+    with open(ruta, "rb") as f:
+        if os.fstat(f.fileno()).st_size == TAM_ENCABEZADO:
+            # Columna vacía: mmap no admite tramos de tamaño 0
+            return memoryview(array(TIPO_ENTERO))
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # No guardamos otra referencia al mmap: se cierra cuando se libera la vista
+    return memoryview(mapa)[TAM_ENCABEZADO:].cast(TIPO_ENTERO)
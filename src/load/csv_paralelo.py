@@ -0,0 +1,222 @@
+import csv                        # Encabezado y rangos que no admiten el camino vectorizado
+import io                         # StringIO para pasar un rango de texto a csv.reader
+import mmap                       # El archivo se mapea en memoria: cada proceso lee su rango sin copiarlo
+import os                         # Tamaño del archivo y cantidad de núcleos
+from collections import deque     # Rangos enviados al pool, en orden de archivo
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Tuple
+import numpy as np                # Búsqueda de separadores y conversión de dígitos vectorizadas
+from export.compresion import detectar_compresion
+from instrumentacion.metricas import medir, contar
+
+# Tamaño aproximado (bytes) de cada rango del archivo que parsea un proceso. Acota la memoria
+# de cada proceso (los índices de comas y saltos ocupan más que el propio texto).
+TAM_RANGO = 32 * 1024 * 1024
+
+# Rangos mínimos por proceso, para repartir bien la carga aunque el archivo sea chico
+RANGOS_POR_PROCESO = 4
+
+# Rangos enviados al pool por proceso sin que se hayan consumido sus resultados: acota la
+# memoria del proceso principal y permite dejar de leer apenas se alcanzan `n` filas
+EN_VUELO = 2
+
+# Con menos bytes que esto no conviene arrancar procesos: se parsea en el proceso actual
+UMBRAL_PARALELO = 4 * 1024 * 1024
+
+# Máximo de dígitos que se convierten por el camino vectorizado (siempre cabe en int32);
+# los valores más largos pasan por csv.reader e int()
+MAX_DIGITOS = 9
+
+SALTO, COMA, COMILLA, RETORNO, MENOS, CERO = (ord(c) for c in "\n,\"\r-0")
+
+
+def _procesos(procesos: int | None) -> int:
+    """
+    Número de procesos a usar: el pedido, o uno por núcleo.
+    """
+    return max(1, procesos or os.cpu_count() or 1)
+
+
+def rangos_de_lineas(mapa: mmap.mmap, inicio: int, partes: int) -> List[Tuple[int, int]]:
+    """
+    Divide mapa[inicio:] en hasta `partes` rangos (desde, hasta) de tamaño parecido, cada uno
+    terminado justo después de un salto de línea: ninguna fila queda partida entre dos rangos.
+    """
+    tamano = len(mapa)
+    cortes = [inicio]
+    for i in range(1, partes):
+        objetivo = inicio + (tamano - inicio) * i // partes
+        salto = mapa.find(b"\n", max(objetivo, cortes[-1]))
+        if salto == -1 or salto + 1 >= tamano:
+            break
+        if salto + 1 > cortes[-1]:
+            cortes.append(salto + 1)
+    cortes.append(tamano)
+    return [(desde, hasta) for desde, hasta in zip(cortes, cortes[1:]) if hasta > desde]
+
+
+def _columna_vectorizada(datos: np.ndarray, indice: int, columnas: int) -> np.ndarray | None:
+    """
+    Extrae la columna `indice` de un rango de líneas CSV (uint8) sin objetos de Python:
+    ubica saltos y comas con NumPy, toma los límites del campo en cada fila y acumula sus
+    dígitos de a una posición por vez.
+    Retorna None si el rango no es "simple" (comillas, filas vacías, otra cantidad de
+    columnas, campos vacíos o que no son enteros cortos): ese rango se parsea con csv.reader.
+    """
+    if columnas < 2 or (datos == COMILLA).any():
+        return None
+    finales = np.flatnonzero(datos == SALTO)
+    if finales.size == 0 or finales[-1] != datos.size - 1:
+        finales = np.append(finales, datos.size)  # Última línea sin salto final
+    filas = finales.size
+
+    # 1. Cada fila debe tener exactamente columnas - 1 comas, todas dentro de su línea
+    comas = np.flatnonzero(datos == COMA)
+    if comas.size != filas * (columnas - 1):
+        return None
+    comas = comas.reshape(filas, columnas - 1)
+    inicios = np.concatenate(([0], finales[:-1] + 1))
+    if (comas[:, 0] < inicios).any() or (comas[:, -1] > finales).any():
+        return None
+
+    # 2. Límites del campo en cada fila (sin el "\r" de "\r\n" si es la última columna)
+    desde = inicios if indice == 0 else comas[:, indice - 1] + 1
+    hasta = finales if indice == columnas - 1 else comas[:, indice]
+    if indice == columnas - 1:
+        hasta = hasta - (datos[np.maximum(hasta - 1, 0)] == RETORNO)
+    negativos = (hasta > desde) & (datos[np.minimum(desde, datos.size - 1)] == MENOS)
+    desde = desde + negativos
+    largos = hasta - desde
+    if largos.min() <= 0 or largos.max() > MAX_DIGITOS:
+        return None
+
+    # 3. valor = valor * 10 + dígito, posición por posición (solo las filas que la tienen)
+    valores = np.zeros(filas, dtype=np.int64)
+    for k in range(int(largos.max())):
+        activos = np.flatnonzero(largos > k)
+        digitos = datos[desde[activos] + k].astype(np.int64) - CERO
+        if ((digitos < 0) | (digitos > 9)).any():
+            return None
+        valores[activos] = valores[activos] * 10 + digitos
+    valores[negativos] *= -1
+    return valores.astype(np.int32)
+
+
+def _columna_csv(texto: bytes, indice: int) -> np.ndarray:
+    """
+    Camino general: csv.reader sobre el rango (respeta comillas) e int() por valor.
+    """
+    lector = csv.reader(io.StringIO(texto.decode("utf-8"), newline=""))
+    return np.array([int(fila[indice]) for fila in lector if fila], dtype=np.int32)
+
+
+def _parsear_rango(path_csv: str, desde: int, hasta: int, indice: int, columnas: int) -> np.ndarray:
+    """
+    Cuerpo de cada proceso: mapea el archivo, parsea la columna de las líneas de
+    [desde, hasta) y devuelve sus valores como arreglo int32.
+    """
+    with open(path_csv, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        # El arreglo mira directamente el archivo mapeado (sin copia); se suelta antes de cerrarlo
+        datos = np.frombuffer(mapa, dtype=np.uint8, count=hasta - desde, offset=desde)
+        valores = _columna_vectorizada(datos, indice, columnas)
+        del datos
+        if valores is None:
+            valores = _columna_csv(mapa[desde:hasta], indice)
+    return valores
+
+
+def _rangos_en_paralelo(
+    path_csv: str,
+    rangos: List[Tuple[int, int]],
+    indice: int,
+    columnas: int,
+    procesos: int
+) -> Iterator[np.ndarray]:
+    """
+    Parsea los rangos en un pool de procesos y entrega sus resultados en el orden del archivo.
+    Nunca hay más de procesos * EN_VUELO rangos pendientes; si se deja de consumir
+    (p.ej. al llegar a `n` filas), los rangos que no empezaron se cancelan.
+    """
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        siguientes = iter(rangos)
+        try:
+            while True:
+                for desde, hasta in islice(siguientes, procesos * EN_VUELO - len(pendientes)):
+                    pendientes.append(pool.submit(_parsear_rango, path_csv, desde, hasta, indice, columnas))
+                if not pendientes:
+                    return
+                yield pendientes.popleft().result()
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+@medir("load/csv_paralelo", filas=len)
+def load_csv_cantidad_paralelo(
+    path_csv: str,
+    column: str,
+    n: int | None = None,
+    procesos: int | None = None,
+    tam_rango: int = TAM_RANGO
+) -> np.ndarray:
+    """
+    Versión paralela de load_csv_cantidad para CSV grandes: mapea el archivo en memoria,
+    lo divide en rangos de bytes que terminan en un salto de línea y cada proceso parsea
+    la columna `column` de sus rangos (sin DataFrame). Los arreglos se concatenan en el
+    orden del archivo.
+    Supone, como los CSV de escribir_csv, que ningún campo contiene saltos de línea
+    (las comas entre comillas sí se admiten).
+
+    Parámetros:
+    - path_csv: Ruta al archivo CSV.
+    - column: Nombre de la columna a extraer (p.ej., "CANTIDAD").
+    - n: Número de filas a leer. Si es None, lee todas. Los rangos se consumen en orden
+      y no se parsean más de los necesarios para llegar a `n`.
+    - procesos: Cantidad de procesos (por defecto, uno por núcleo).
+    - tam_rango: Tamaño aproximado de cada rango en bytes.
+
+    Retorno:
+    - Arreglo int32 de NumPy con los valores de la columna.
+    """
+    vacio = np.empty(0, dtype=np.int32)
+    if n is not None and n <= 0:
+        return vacio
+
+    # 1. Un archivo comprimido no se puede dividir por bytes: se lee por streaming
+    if detectar_compresion(path_csv) is not None:
+        from load.loadcsv import iter_csv_cantidad  # pandas solo se importa si hace falta
+        bloques = list(iter_csv_cantidad(path_csv, column, n, formato="numpy"))
+        return np.concatenate(bloques) if bloques else vacio
+    if os.path.getsize(path_csv) == 0:
+        return vacio
+
+    # 2. Encabezado: posición de la columna y cantidad de columnas; luego, los rangos
+    p = _procesos(procesos)
+    with open(path_csv, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        fin_encabezado = mapa.find(b"\n") + 1 or len(mapa)
+        encabezado = next(csv.reader([mapa[:fin_encabezado].decode("utf-8")]))
+        indice = encabezado.index(column)
+        cuerpo = len(mapa) - fin_encabezado
+        partes = max(p * RANGOS_POR_PROCESO, -(-cuerpo // tam_rango))
+        rangos = rangos_de_lineas(mapa, fin_encabezado, partes)
+    contar("load/csv_paralelo.rangos", len(rangos))
+
+    # 3. Parseo de los rangos (en procesos si el archivo lo justifica), en orden y hasta n filas
+    if p == 1 or cuerpo < UMBRAL_PARALELO:
+        resultados = (_parsear_rango(path_csv, desde, hasta, indice, len(encabezado)) for desde, hasta in rangos)
+    else:
+        resultados = _rangos_en_paralelo(path_csv, rangos, indice, len(encabezado), p)
+    bloques = []
+    total = 0
+    try:
+        for bloque in resultados:
+            bloques.append(bloque)
+            total += bloque.size
+            if n is not None and total >= n:
+                break
+    finally:
+        resultados.close()
+    valores = np.concatenate(bloques) if bloques else vacio
+    return valores[:n] if n is not None else valores
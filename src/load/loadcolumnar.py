@@ -0,0 +1,90 @@
+import json       # Para leer los metadatos del archivo
+import zipfile    # El formato columnar es un zip con un miembro .npy por columna y grupo
+from typing import Iterator
+import numpy as np
+from instrumentacion.metricas import medir
+from export.columnar_export import nombre_miembro, META
+
+
+@medir("load/npz", filas=len)
+def iter_columnar_cantidad(
+    path: str,
+    column: str = "CANTIDAD",
+    n: int | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Recorre un archivo columnar ("ventas.npz") grupo por grupo y entrega la columna
+    `column` de cada grupo como arreglo de NumPy.
+    Solo se leen y descomprimen los miembros de esa columna; las otras ocho columnas
+    no se tocan.
+
+    Parámetros:
+    - path: Ruta al archivo columnar.
+    - column: Nombre de la columna a extraer (p.ej., "CANTIDAD").
+    - n: Número máximo de filas a entregar. Si es None, entrega todas.
+
+    Retorno:
+    - Generador de arreglos de NumPy (uno por grupo de filas).
+    """
+    with zipfile.ZipFile(path, "r") as zf:
+        meta = json.loads(zf.read(META))
+        if column not in meta["columnas"]:
+            raise KeyError(f"La columna {column!r} no existe en {path}.")
+
+        restantes = n
+        for grupo in range(len(meta["grupos"])):
+            if restantes is not None and restantes <= 0:
+                break
+            # Abrimos solo el miembro de la columna pedida en este grupo
+            with zf.open(nombre_miembro(grupo, column)) as f:
+                arreglo = np.lib.format.read_array(f, allow_pickle=False)
+            if restantes is not None:
+                arreglo = arreglo[:restantes]
+                restantes -= arreglo.size
+            yield arreglo
+
+
+def load_columnar_tabla(
+    path: str,
+    columnas: list[str] | None = None,
+    n: int | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Lee varias columnas de un archivo columnar completas, con su tipo original
+    (fechas como datetime64, precios como float64, ...), p.ej. para ordenar filas
+    con sort_algorithms.records.
+
+    Parámetros:
+    - path: Ruta al archivo columnar (p.ej., "ventas.npz").
+    - columnas: Columnas a leer. Si es None, lee todas.
+    - n: Número de filas a leer. Si es None, lee todas.
+
+    Retorno:
+    - Diccionario {columna: arreglo de NumPy}.
+    """
+    with zipfile.ZipFile(path, "r") as zf:
+        columnas = list(json.loads(zf.read(META))["columnas"]) if columnas is None else columnas
+    tabla = {}
+    for columna in columnas:
+        bloques = list(iter_columnar_cantidad(path, columna, n))
+        tabla[columna] = np.concatenate(bloques) if bloques else np.array([])
+    return tabla
+
+
+def load_columnar_cantidad(path: str, column: str = "CANTIDAD", n: int | None = None) -> list[int]:
+    """
+    Lee la columna `column` de un archivo columnar y la devuelve como lista de enteros,
+    limitando a las primeras `n` filas si n no es None.
+
+    Parámetros:
+    - path: Ruta al archivo columnar (p.ej., "ventas.npz").
+    - column: Nombre de la columna a extraer (p.ej., "CANTIDAD").
+    - n: Número de filas a leer. Si es None, lee todas.
+
+    Retorno:
+    - Lista de enteros con los valores de la columna especificada.
+    """
+    bloques = list(iter_columnar_cantidad(path, column, n))
+    if not bloques:
+        return []
+    return np.concatenate(bloques).astype(int).tolist()
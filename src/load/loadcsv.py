@@ -1,9 +1,16 @@
+import csv           # Para leer el CSV fila a fila sin cargarlo completo
 import pandas as pd  # Para manejar operaciones con DataFrame
+from typing import Iterator
+from load.bloques import TAM_BLOQUE, nuevo_bloque, entregar_bloque
+from instrumentacion.metricas import medir
+from export.compresion import abrir
 
+@medir("load/csv_pandas", filas=len)
 def load_csv_cantidad(path_csv: str, column: str, n: int | None = None) -> list[int]:
     """
     Lee las primeras `n` filas del CSV (o todas si n=None) y devuelve la columna `column`
-    como lista de enteros.
+    como lista de enteros. Si el CSV está comprimido (gzip, bz2 o lzma), se descomprime
+    mientras pandas lo lee.
 
     Parámetros:
     - path_csv: Ruta al archivo CSV.
@@ -16,14 +23,66 @@ def load_csv_cantidad(path_csv: str, column: str, n: int | None = None) -> list[
 
     # 1. Cargar solo la columna deseada del CSV.
     #    Si 'n' no es None, usamos 'nrows=n' para limitar la lectura a las primeras n filas.
-    if n is not None:
-        df = pd.read_csv(path_csv, usecols=[column], nrows=n)
-    else:
-        # Si no se especifica 'n', leemos todas las filas de la columna indicada
-        df = pd.read_csv(path_csv, usecols=[column])
+    with abrir(path_csv, "r", newline="", encoding="utf-8") as f:
+        if n is not None:
+            df = pd.read_csv(f, usecols=[column], nrows=n)
+        else:
+            # Si no se especifica 'n', leemos todas las filas de la columna indicada
+            df = pd.read_csv(f, usecols=[column])
 
     # 2. Convertir la serie de pandas a entero y luego a lista de Python
     #   df[column] accede a la columna solicitada
     #   .astype(int) asegura que todos los valores sean enteros (evita decimales o cadenas)
     #   .tolist() convierte la Serie de pandas en una lista de Python
     return df[column].astype(int).tolist()
+
+
+@medir("load/csv", filas=len)
+def iter_csv_cantidad(
+    path_csv: str,
+    column: str,
+    n: int | None = None,
+    chunk_size: int = TAM_BLOQUE,
+    formato: str = "array"
+) -> Iterator:
+    """
+    Versión por streaming de load_csv_cantidad: recorre el CSV línea a línea y entrega
+    la columna `column` en bloques tipados de hasta `chunk_size` valores.
+    No construye un DataFrame ni una lista completa, así que la memoria usada depende
+    de `chunk_size` y no del tamaño del archivo. Los archivos comprimidos (gzip, bz2 o
+    lzma, ver export.compresion) se descomprimen por streaming.
+
+    Parámetros:
+    - path_csv: Ruta al archivo CSV.
+    - column: Nombre de la columna a extraer (p.ej., "CANTIDAD").
+    - n: Número máximo de filas a leer. Si es None, lee todas las filas.
+    - chunk_size: Cantidad de valores por bloque.
+    - formato: "array" (array('i')) o "numpy" (arreglo int32).
+
+    Retorno:
+    - Generador de bloques con los valores enteros de la columna.
+    """
+    with abrir(path_csv, "r", newline="", encoding="utf-8") as f:
+        lector = csv.reader(f)
+
+        # 1. La primera fila es el encabezado: buscamos la posición de la columna
+        encabezado = next(lector, None)
+        if encabezado is None:
+            return
+        indice = encabezado.index(column)
+
+        # 2. Acumulamos valores en un bloque tipado y lo entregamos al llenarse
+        bloque = nuevo_bloque()
+        leidos = 0
+        for fila in lector:
+            if n is not None and leidos >= n:
+                break
+            bloque.append(int(fila[indice]))
+            leidos += 1
+            if len(bloque) >= chunk_size:
+                yield entregar_bloque(bloque, formato)
+                bloque = nuevo_bloque()
+
+        # 3. Entregamos el último bloque parcial, si quedó algo
+        if bloque:
+            yield entregar_bloque(bloque, formato)
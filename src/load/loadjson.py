@@ -1,9 +1,189 @@
 import json  # Para manejar carga de archivos JSON
+from itertools import islice
+from typing import Iterator
+from load.bloques import TAM_BLOQUE, nuevo_bloque, entregar_bloque
+from instrumentacion.metricas import medir
+from export.compresion import abrir
 
+# Cantidad de caracteres que se leen del archivo en cada lectura del parser incremental
+TAM_LECTURA = 1 << 16
+
+# Caracteres que pueden aparecer entre dos registros (espacios, saltos de línea y comas)
+SEPARADORES = " \t\r\n,"
+
+# Disposiciones de archivo que reconocen los cargadores (ver export.json_export.MODOS_JSON):
+# - "lista":    lista de objetos, con o sin sangría ("legible" o "compacto").
+# - "ndjson":   un objeto por línea.
+# - "columnar": {"columnas": [...], "lotes": [...]}, un lote por línea.
+FORMATOS_JSON = ("lista", "ndjson", "columnar")
+
+# Líneas de NDJSON que se decodifican juntas
+LINEAS_POR_LOTE = 4096
+
+# Comienzo del modo "columnar": identifica el formato y cierra el encabezado al leerlo
+INICIO_COLUMNAR = '{"columnas":'
+
+# Todos los lectores de este módulo abren el archivo con export.compresion.abrir: los
+# archivos comprimidos (gzip, bz2 o lzma) se reconocen por sus primeros bytes y se
+# descomprimen por streaming.
+
+
+def detectar_formato_json(path_json: str) -> str:
+    """
+    Identifica la disposición de un archivo JSON mirando solo su comienzo:
+    "[" → "lista"; '{"columnas":' → "columnar"; cualquier otro "{" → "ndjson".
+    """
+    with abrir(path_json, "r", encoding="utf-8") as f:
+        comienzo = f.read(64).lstrip()
+    if comienzo.startswith(INICIO_COLUMNAR):
+        return "columnar"
+    if comienzo.startswith("{"):
+        return "ndjson"
+    return "lista"
+
+
+def iter_registros_json(path_json: str, tam_lectura: int = TAM_LECTURA) -> Iterator[dict]:
+    """
+    Parser incremental: recorre un JSON en formato lista de objetos y entrega cada objeto
+    apenas se termina de leer, sin cargar el archivo completo en memoria.
+    Lee el archivo en trozos de `tam_lectura` caracteres y decodifica cada objeto con
+    json.JSONDecoder.raw_decode. Si el consumidor deja de pedir registros, el archivo
+    ya no se sigue leyendo.
+
+    También acepta archivos con un objeto por línea (sin los corchetes de la lista).
+
+    Parámetros:
+    - path_json: Ruta al archivo JSON (p.ej., "ventas.json").
+    - tam_lectura: Caracteres por lectura.
+
+    Retorno:
+    - Generador de diccionarios, uno por registro.
+    """
+    decoder = json.JSONDecoder()
+
+    with abrir(path_json, "r", encoding="utf-8") as f:
+        buffer = f.read(tam_lectura)
+        pos = 0
+        fin_archivo = not buffer
+        inicio = True
+
+        while True:
+            # 1. Saltamos separadores; si se acaba el buffer, leemos el siguiente trozo
+            while True:
+                while pos < len(buffer) and buffer[pos] in SEPARADORES:
+                    pos += 1
+                if pos < len(buffer) or fin_archivo:
+                    break
+                buffer = f.read(tam_lectura)
+                pos = 0
+                fin_archivo = not buffer
+
+            # 2. El corchete inicial abre la lista; el final (o el fin del archivo) la cierra
+            if inicio and pos < len(buffer) and buffer[pos] == "[":
+                pos += 1
+                inicio = False
+                continue
+            inicio = False
+            if pos >= len(buffer) or buffer[pos] == "]":
+                return
+
+            # 3. Decodificamos el siguiente objeto. Si quedó cortado al final del buffer,
+            #    agregamos otro trozo y volvemos a intentarlo.
+            try:
+                registro, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                mas = "" if fin_archivo else f.read(tam_lectura)
+                if not mas:
+                    raise
+                buffer = buffer[pos:] + mas
+                pos = 0
+                continue
+
+            yield registro
+
+
+def _valores_ndjson(path_json: str, column: str) -> Iterator[int]:
+    """
+    Valores de `column` en un archivo NDJSON. Las líneas se leen de a LINEAS_POR_LOTE y se
+    decodifican juntas con un solo json.loads (más rápido que uno por línea).
+    """
+    with abrir(path_json, "r", encoding="utf-8") as f:
+        while True:
+            lineas = list(islice(f, LINEAS_POR_LOTE))
+            if not lineas:
+                return
+            objetos = [linea for linea in lineas if linea.strip()]
+            if objetos:
+                yield from (int(item[column]) for item in json.loads("[" + ",".join(objetos) + "]"))
+
+
+def _valores_columnar(path_json: str, column: str) -> Iterator[int]:
+    """
+    Valores de `column` en un archivo JSON "columnar": el encabezado (primera línea) dice
+    qué posición ocupa la columna y cada línea siguiente es un lote de arreglos.
+    """
+    with abrir(path_json, "r", encoding="utf-8") as f:
+        encabezado = f.readline().strip()
+        # '{"columnas":[...],"lotes":[' → se cierra para decodificarlo
+        columnas = json.loads(encabezado[:encabezado.rindex(',"lotes":')] + "}")["columnas"]
+        indice = columnas.index(column)
+        for linea in f:
+            linea = linea.strip()
+            if not linea or linea.startswith("]"):
+                return
+            yield from map(int, json.loads(linea.lstrip(","))[indice])
+
+
+@medir("load/json", filas=len)
+def iter_json_cantidad(
+    path_json: str,
+    column: str,
+    n: int | None = None,
+    chunk_size: int = TAM_BLOQUE,
+    formato: str = "array"
+) -> Iterator:
+    """
+    Versión por streaming de load_json_cantidad: entrega la clave `column` en bloques
+    tipados de hasta `chunk_size` valores y deja de leer el archivo al llegar a `n` registros.
+    Acepta los tres formatos de FORMATOS_JSON (se detecta con detectar_formato_json);
+    NDJSON y "columnar" se leen línea a línea, sin el parser incremental.
+
+    Parámetros:
+    - path_json: Ruta al archivo JSON (p.ej., "ventas.json").
+    - column: Nombre de la clave cuyo valor se extraerá (p.ej., "CANTIDAD").
+    - n: Número máximo de registros a leer. Si es None, lee todos.
+    - chunk_size: Cantidad de valores por bloque.
+    - formato: "array" (array('i')) o "numpy" (arreglo int32).
+
+    Retorno:
+    - Generador de bloques con los valores enteros de la clave.
+    """
+    formato_archivo = detectar_formato_json(path_json)
+    if formato_archivo == "ndjson":
+        valores = _valores_ndjson(path_json, column)
+    elif formato_archivo == "columnar":
+        valores = _valores_columnar(path_json, column)
+    else:
+        valores = (int(item[column]) for item in iter_registros_json(path_json))
+
+    bloque = nuevo_bloque()
+    for valor in islice(valores, n):
+        bloque.append(valor)
+        if len(bloque) >= chunk_size:
+            yield entregar_bloque(bloque, formato)
+            bloque = nuevo_bloque()
+
+    # Entregamos el último bloque parcial, si quedó algo
+    if bloque:
+        yield entregar_bloque(bloque, formato)
+
+
+@medir("load/json_lista", filas=len)
 def load_json_cantidad(path_json: str, column: str, n: int | None = None) -> list[int]:
     """
     Lee un JSON en formato lista de objetos y devuelve la columna `column` como lista de enteros,
     limitando a las primeras `n` entradas si n no es None.
+    Los archivos NDJSON y "columnar" se leen con iter_json_cantidad (línea a línea).
 
     Parámetros:
     - path_json: Ruta al archivo JSON (p.ej., "ventas.json").
@@ -14,15 +194,13 @@ def load_json_cantidad(path_json: str, column: str, n: int | None = None) -> lis
     - Lista de enteros con los valores de la clave especificada.
     """
 
-    # 1. Abrimos el archivo JSON en modo lectura con codificación UTF-8
-    with open(path_json, "r", encoding="utf-8") as f:
-        # json.load() convierte el contenido JSON en un objeto de Python (lista de diccionarios)
-        data = json.load(f)
+    if detectar_formato_json(path_json) != "lista":
+        return [valor for bloque in iter_json_cantidad(path_json, column, n) for valor in bloque]
 
-    # 2. Si se proporcionó un límite 'n', truncamos la lista a los primeros n objetos
-    if n is not None:
-        data = data[:n]  # Se toman solo las primeras n entradas
+    # 1. Recorremos el archivo con el parser incremental: solo se decodifican
+    #    los primeros n objetos y el resto del archivo no se lee.
+    registros = islice(iter_registros_json(path_json), n)
 
-    # 3. Iteramos sobre cada objeto (diccionario) en la lista y extraer el valor de la clave 'column'
-    #    Se convierte dicho valor a entero con int(), y devolver la lista de esos enteros.
-    return [int(item[column]) for item in data]
+    # 2. Extraemos de cada objeto (diccionario) el valor de la clave 'column'
+    #    y lo convertimos a entero con int().
+    return [int(item[column]) for item in registros]
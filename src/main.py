@@ -1,33 +1,67 @@
-from export.csv_export import export_csv
-from export.json_export import export_json
+from export.pipeline import exportar_formatos
+import argparse
 import os
-import json
-import pandas as pd
+import time
 from typing import Dict, List
 
-# 1. Importamos los loaders para CSV y JSON, ajustando la ruta al nombre real de tus módulos
-from load.loadcsv import load_csv_cantidad
-from load.loadjson import load_json_cantidad
+# 1. Importamos el loader con caché de la columna CANTIDAD (CSV y JSON)
+from load.column_cache import load_cantidad_cache
 
 # 2. Importamos run_sorts_in_threads (el que arranca los hilos y envía por sockets)
 from threading_custom.threading_ed2 import run_sorts_in_threads
 
-def comparar_exportaciones():
+# 3. Métricas de todo el programa (consulta, exportadores, cargadores, sorts y sockets)
+from instrumentacion.metricas import imprimir_reporte, guardar_reporte, activar_perfiles
+
+# 4. Ordenamiento externo (tramos en disco + mezcla) y escritura por streaming de la salida
+from sort_algorithms.external import external_sort, guardar_ordenados
+from load.loadcsv import iter_csv_cantidad
+from export.sorted_export import guardar_resultados_ordenados
+
+# 5. Índice ordenado incremental de CANTIDAD (solo absorbe las ventas nuevas)
+from sort_algorithms.sorted_index import IndiceOrdenado
+
+def comparar_exportaciones(codecs=(None, "gzip", "bz2", "lzma")):
     """
-    Compara los resultados de exportar datos en formato CSV y JSON.
-    Llama a las funciones `export_csv()` y `export_json()` para obtener los resultados de exportación en ambos formatos.
-    Imprime en consola el formato, el tiempo de exportación y el tamaño del archivo generado para cada uno.
+    Compara los resultados de exportar datos en formato CSV, JSON y columnar binario (NPZ),
+    sin comprimir y con cada códec de `codecs` (ver export.compresion).
+    Una sola llamada a `exportar_formatos()` lee la tabla UN.VENTAS una vez y escribe cada
+    par (formato, códec) en su propio hilo, comprimiendo cada lote a medida que se escribe.
+    Imprime en consola, para cada formato y códec:
+      - el tiempo de exportación (reloj) y el tiempo de CPU del hilo escritor: cuanto más
+        se acerca la CPU al tiempo de reloj, más limita el códec y menos la E/S. Como
+        todos los escritores comparten el lector y los núcleos, el tiempo de reloj es el
+        de la exportación conjunta; la CPU es lo que cuesta cada códec;
+      - el tamaño del archivo y su relación con el mismo formato sin comprimir (los bytes
+        que se ahorran en disco o en la red). NPZ comprime siempre por dentro: su base
+        es la exportación con el códec por defecto (deflate), y cada códec se escribe en
+        su propio archivo ("ventas.npz", "ventas_bz2.npz", ...).
     Retorna:
         None
     """
-    csv_resultado = export_csv()
-    json_resultado = export_json()
+    base: Dict[str, float] = {}  # Tamaño sin comprimir de cada formato (KB)
+
+    # 1. Un destino por formato y códec; NPZ no cambia de ruta con el códec, así que se
+    #    la damos explícita para que cada códec tenga su archivo
+    destinos = []
+    for codec in codecs:
+        destinos += [("CSV", codec), ("JSON", codec)]
+        destinos.append(("NPZ", codec, f"ventas_{codec}.npz" if codec else "ventas.npz"))
 
+    # 2. Una sola lectura de la tabla para todos los destinos
     print("\n📊 RESULTADOS DE EXPORTACIÓN:")
-    for resultado in [csv_resultado, json_resultado]:
-        print(f"\nFormato: {resultado['formato']}")
-        print(f"  ⏱ Tiempo: {resultado['tiempo']:.4f} segundos")
-        print(f"  📦 Tamaño: {resultado['tamano_kb']:.2f} KB")
+    for resultado in exportar_formatos(destinos):
+        formato, codec = resultado["formato"], resultado["compresion"]
+        if codec is None:
+            base[formato] = resultado["tamano_kb"]
+        print(f"\nFormato: {formato} ({codec or 'sin comprimir'}) → {resultado['path']}")
+        print(f"  ⏱ Tiempo: {resultado['tiempo']:.4f} segundos "
+              f"(CPU del escritor: {resultado['tiempo_cpu']:.4f} s)")
+        print(f"  📦 Tamaño: {resultado['tamano_kb']:.2f} KB", end="")
+        if base.get(formato):
+            print(f" ({resultado['tamano_kb'] / base[formato]:.1%} del original)")
+        else:
+            print()
 
 def comparar_sorts():
     """
@@ -35,19 +69,18 @@ def comparar_sorts():
     Esta función realiza los siguientes pasos:
     1. Verifica la existencia de los archivos 'ventas.csv' y 'ventas.json' en el directorio actual.
     2. Carga hasta 1,000,000 de registros de la columna "CANTIDAD" de cada archivo.
-    3. Ejecuta múltiples algoritmos de ordenamiento en hilos paralelos sobre los datos cargados de ambas fuentes (CSV y JSON).
-    4. Imprime el tiempo de ejecución de cada algoritmo de ordenamiento para ambas fuentes de datos.
+    3. Ejecuta múltiples algoritmos de ordenamiento en procesos paralelos sobre los datos cargados de ambas fuentes (CSV y JSON).
+    4. Imprime el tiempo de reloj y de CPU de cada algoritmo de ordenamiento para ambas fuentes de datos.
     Dependencias:
-        - load.loadcsv.load_csv_cantidad: Función para cargar la columna "CANTIDAD" de un archivo CSV.
-        - load.loadjson.load_json_cantidad: Función para cargar la columna "CANTIDAD" de un archivo JSON.
+        - load.column_cache.load_cantidad_cache: Carga la columna "CANTIDAD" de un archivo CSV o JSON
+          desde una caché binaria mapeada en memoria (solo parsea el archivo si cambió).
         - threading_custom.threading_ed2.run_sorts_in_threads: Función para ejecutar algoritmos de ordenamiento en hilos paralelos.
     Retorna:
         Nada.
     """
     
     import os
-    from load.loadcsv import load_csv_cantidad
-    from load.loadjson import load_json_cantidad
+    from load.column_cache import load_cantidad_cache
     from threading_custom.threading_ed2 import run_sorts_in_threads
 
     path_csv = "ventas.csv"
@@ -58,30 +91,34 @@ def comparar_sorts():
         print("No se encontraron los archivos 'ventas.csv' y/o 'ventas.json' en el directorio.")
         return
 
-    # 1. Se lee columna "cantidad" de cada archivo, limitando a n_limit
+    # 1. Se lee columna "cantidad" de cada archivo, limitando a n_limit.
+    #    La caché solo vuelve a parsear el archivo si cambió desde la última ejecución;
+    #    .tolist() da a cada ordenamiento una lista propia que puede modificar.
     print("Leyendo CSV (primeras filas)...")
-    data_csv = load_csv_cantidad(path_csv, column="CANTIDAD", n=n_limit)
+    data_csv = load_cantidad_cache(path_csv, column="CANTIDAD", n=n_limit).tolist()
     print(f"Se obtuvieron {len(data_csv)} registros del CSV.\n")
 
     print("Leyendo JSON (primeras filas)...")
-    data_json = load_json_cantidad(path_json, column="CANTIDAD", n=n_limit)
+    data_json = load_cantidad_cache(path_json, column="CANTIDAD", n=n_limit).tolist()
     print(f"Se obtuvieron {len(data_json)} registros del JSON.\n")
 
-    # 2) Se ejecutan ordenamientos en hilos para CSV
+    # 2) Se ejecutan ordenamientos en procesos para CSV
+    #    Con executor="processes" cada algoritmo corre en su propio proceso y los
+    #    tiempos no incluyen la contención por el GIL de los demás algoritmos.
     print("Iniciando ordenamientos en paralelo sobre CSV...\n")
-    results_csv = run_sorts_in_threads(data_csv, prefix="CSV")
+    results_csv = run_sorts_in_threads(data_csv, prefix="CSV", executor="processes")
 
     print("\nResultados (CSV):")
     for name, info in results_csv.items():
-        print(f"  • {name}: {info['time']:.4f} s")
+        print(f"  • {name}: {info['time']:.4f} s (CPU: {info['cpu_time']:.4f} s)")
 
-    # 3. Se ejecutan ordenamientos en hilos para JSON
+    # 3. Se ejecutan ordenamientos en procesos para JSON
     print("\nIniciando ordenamientos en paralelo sobre JSON...\n")
-    results_json = run_sorts_in_threads(data_json, prefix="JSON")
+    results_json = run_sorts_in_threads(data_json, prefix="JSON", executor="processes")
 
     print("\nResultados (JSON):")
     for name, info in results_json.items():
-        print(f"  • {name}: {info['time']:.4f} s")
+        print(f"  • {name}: {info['time']:.4f} s (CPU: {info['cpu_time']:.4f} s)")
         
 def conexion_cliente_servidor():
     """
@@ -89,9 +126,10 @@ def conexion_cliente_servidor():
     Este procedimiento realiza las siguientes acciones:
     1. Verifica la existencia de los archivos 'ventas.csv' y 'ventas.json'.
     2. Carga la columna "CANTIDAD" de ambos archivos, con opción de limitar el número de registros.
-    3. Ejecuta en paralelo cuatro algoritmos de ordenamiento sobre los datos de cada archivo y envía los tiempos de ejecución al servidor mediante sockets.
+    3. Ejecuta en paralelo los algoritmos de ordenamiento registrados sobre los datos de cada archivo y envía los tiempos de ejecución al servidor mediante sockets.
     4. Muestra un resumen de los tiempos de ejecución para cada algoritmo y archivo.
-    5. Guarda las listas ordenadas en archivos separados (CSV y JSON).
+    5. Comprueba que todos los algoritmos coinciden y guarda una sola copia comprimida de la
+       lista ordenada por origen ('CSV_sorted.ord' y 'JSON_sorted.ord').
     6. Retorna los resultados de los ordenamientos en memoria para su uso posterior.
     Returns:
         Tuple[Dict[str, dict], Dict[str, dict]]: 
@@ -109,17 +147,17 @@ def conexion_cliente_servidor():
         return {}, {}
 
     
-    # 1. Cargamos la columna "cantidad" de cada archivo
+    # 1. Cargamos la columna "cantidad" de cada archivo (desde la caché si el archivo no cambió)
     print("Leyendo CSV...")
-    data_csv: List[int] = load_csv_cantidad(path_csv, column="CANTIDAD", n=n_limit)
+    data_csv: List[int] = load_cantidad_cache(path_csv, column="CANTIDAD", n=n_limit).tolist()
     print(f"  → {len(data_csv)} registros cargados desde CSV.\n")
 
     print("Leyendo JSON...")
-    data_json: List[int] = load_json_cantidad(path_json, column="CANTIDAD", n=n_limit)
+    data_json: List[int] = load_cantidad_cache(path_json, column="CANTIDAD", n=n_limit).tolist()
     print(f"  → {len(data_json)} registros cargados desde JSON.\n")
 
     
-    # 2. Ejecutamos los 4 algoritmos en paralelo sobre CSV y enviar tiempos por socket
+    # 2. Ejecutamos los algoritmos en paralelo sobre CSV y enviar tiempos por socket
     print("Medimos el tiempo de conexion al servidor para cada sort en CSV...\n")
     results_csv: Dict[str, dict] = run_sorts_in_threads(
         data=data_csv,
@@ -129,7 +167,7 @@ def conexion_cliente_servidor():
     )
 
     
-    # 3. Ejecutamos los 4 algoritmos en paralelo sobre JSON y enviar tiempos por socket
+    # 3. Ejecutamos los algoritmos en paralelo sobre JSON y enviar tiempos por socket
     print("Medimos el tiempo de conexion al servidor para cada sort en JSON...\n")
     results_json: Dict[str, dict] = run_sorts_in_threads(
         data=data_json,
@@ -152,28 +190,91 @@ def conexion_cliente_servidor():
     
     # 5) Guardamos cada lista ordenada en disco
     
-    for name, info in results_csv.items():
-        # Guardar en CSV de una sola columna
-        df_out = pd.DataFrame({"cantidad_ordenada": info["sorted"]})
-        out_csv  = f"{name}_sorted.csv"
-        df_out.to_csv(out_csv, index=False)
-
-        print(f"  → Guardado: {out_csv}")
-
-    for name, info in results_json.items():
-        # Guardar en JSON de una sola columna
-        out_json = f"{name}_sorted.json"
-        with open(out_json, "w", encoding="utf-8") as f:
-            json.dump(info["sorted"], f, ensure_ascii=False)
-
-        print(f"  → Guardado: {out_json}")
+    #    Todos los algoritmos deben dar la misma lista: se comprueba y se guarda una sola
+    #    copia por origen en formato ".ord" (rachas o deltas en varint, ver export.sorted_export).
+    #    Para leerla: export.sorted_export.iter_ordenados("CSV_sorted.ord").
+    for origen, results in (("CSV", results_csv), ("JSON", results_json)):
+        guardado = guardar_resultados_ordenados(results, f"{origen}_sorted.ord")
+        if guardado is not None:
+            print(f"  → Guardado: {guardado['path']} ({guardado['n']} valores, "
+                  f"{guardado['codificacion']}, {guardado['bytes'] / 1024:.2f} KB)")
 
     
     # 6) Retornamos los resultados en memoria para cualquier uso posterior
     
     return results_csv, results_json
-    
+
+
+def ordenar_fuera_de_memoria(memoria_mb: int = 256, fan_in: int = 64):
+    """
+    Ordena la columna "CANTIDAD" completa de 'ventas.csv' sin cargarla en memoria:
+    el CSV se lee por bloques, se ordena por tramos de a lo sumo `memoria_mb` MB que se
+    guardan en archivos temporales, y los tramos se mezclan (de a `fan_in`) directamente
+    hacia 'CSV_Externo_sorted.csv'. Sirve para tablas mucho más grandes que la RAM.
+    Retorna:
+        Número de valores ordenados (0 si no existe el archivo).
+    """
+    path_csv = "ventas.csv"
+    if not os.path.exists(path_csv):
+        print("Error: no se encontró 'ventas.csv' en el directorio.")
+        return 0
+
+    # 1. Bloques de la columna → tramos ordenados en disco → mezcla → archivo de salida
+    print(f"\nOrdenamiento externo de CANTIDAD ({memoria_mb} MB por tramo, fan-in {fan_in})...")
+    start = time.perf_counter()
+    ordenados = external_sort(
+        iter_csv_cantidad(path_csv, "CANTIDAD"),
+        memoria_bytes=memoria_mb * 1024 * 1024,
+        fan_in=fan_in
+    )
+    total = guardar_ordenados(ordenados, "CSV_Externo_sorted.csv")
+
+    # 2. Resumen
+    print(f"  → {total} valores ordenados en {time.perf_counter() - start:.4f} s")
+    print("  → Guardado: CSV_Externo_sorted.csv")
+    return total
+
+
+def consultar_indice_cantidad():
+    """
+    Actualiza el índice ordenado de CANTIDAD con las ventas nuevas de UN.VENTAS
+    (ID_VENTA mayor que la última vista) y responde consultas sin volver a ordenar:
+    mediana, percentiles 90 y 99, y cuántas ventas tienen entre 1 y 5 unidades.
+    Retorna:
+        Número de filas nuevas agregadas (None si no hubo conexión).
+    """
+    with IndiceOrdenado() as indice:
+        # 1. Solo se leen y ordenan las filas posteriores a la marca guardada
+        nuevas = indice.actualizar()
+        if nuevas is None:
+            return None
+        print(f"\nÍndice de CANTIDAD: {nuevas} filas nuevas, {len(indice)} en total "
+              f"(hasta ID_VENTA {indice.marca_id}).")
+        if not len(indice):
+            return nuevas
+
+        # 2. Consultas sobre el índice
+        print(f"  • Mediana: {indice.percentil(50)}")
+        print(f"  • Percentil 90: {indice.percentil(90)}")
+        print(f"  • Percentil 99: {indice.percentil(99)}")
+        print(f"  • Ventas de 1 a 5 unidades: {indice.contar_rango(1, 5)}")
+    return nuevas
+
+
 if __name__ == "__main__":
+    # --perfil: perfila con cProfile la consulta, los exportadores, los cargadores y los
+    # ordenamientos (más lento; los perfiles quedan en metricas.json)
+    parser = argparse.ArgumentParser(description="Exportaciones, ordenamientos y métricas de UN.VENTAS")
+    parser.add_argument("--perfil", action="store_true", help="capturar perfiles de cProfile")
+    if parser.parse_args().perfil:
+        activar_perfiles()
+
     comparar_exportaciones()
     comparar_sorts()
     results_csv, results_json = conexion_cliente_servidor()
+    ordenar_fuera_de_memoria()
+    consultar_indice_cantidad()
+
+    # Reporte de tiempos por etapa, filas/bytes procesados y pico de memoria
+    imprimir_reporte()
+    guardar_reporte("metricas.json")
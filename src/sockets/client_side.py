@@ -1,21 +1,227 @@
-import json    # Para serializar el diccionario a formato JSON
-import socket  # Para crear sockets y comunicarse con el servidor
+import atexit     # Para confirmar y cerrar los canales abiertos al terminar el programa
+import json       # Para serializar el diccionario a formato JSON
+import os         # Para detectar si el proceso actual es un hijo (fork) con canales heredados
+import socket     # Para crear sockets y comunicarse con el servidor
+import threading  # Para que varios hilos compartan el pool de canales
+from instrumentacion.metricas import medir
 
+# Protocolo: cada mensaje es un objeto JSON en una línea terminada en "\n" (JSON por líneas).
+# Por una misma conexión se envían muchos mensajes seguidos; el servidor responde con
+# líneas {"ack": n}, donde n es la cantidad de mensajes recibidos en esa conexión.
+SEPARADOR = b"\n"
+
+# Mensajes que se pueden enviar sin esperar confirmación antes de pedir el ACK
+VENTANA_ACK = 16
+
+# Segundos de espera por la conexión y por cada ACK
+ESPERA_ACK = 5.0
+
+
+class CanalResultados:
+    """
+    Conexión TCP persistente hacia el servidor de resultados. Envía cada paquete como una
+    línea JSON sin esperar respuesta y recién pide la confirmación cuando hay `ventana`
+    mensajes pendientes (o al llamar a confirmar()). Si la conexión se cae, se reabre una
+    vez y se reenvían los mensajes que el servidor todavía no confirmó.
+    """
+
+    def __init__(self, host: str, port: int, ventana: int = VENTANA_ACK, espera: float = ESPERA_ACK):
+        self.host = host
+        self.port = port
+        self.ventana = ventana
+        self.espera = espera
+        self.sock: socket.socket | None = None
+        self._buffer = b""                  # Bytes recibidos que todavía no forman una línea
+        self._pendientes: list[bytes] = []  # Mensajes enviados y no confirmados
+        self._confirmados = 0               # Último ACK recibido en la conexión actual
+
+    def _conectar(self) -> None:
+        """
+        Abre la conexión y reenvía los mensajes pendientes (el contador de ACK del
+        servidor empieza de cero en cada conexión).
+        """
+        self.cerrar(confirmar=False)
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.espera)
+        # Los mensajes son pequeños: los mandamos de inmediato en lugar de agruparlos (Nagle)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buffer = b""
+        self._confirmados = 0
+        if self._pendientes:
+            self.sock.sendall(b"".join(self._pendientes))
+
+    def enviar(self, paquete: dict) -> None:
+        """
+        Envía `paquete` como una línea JSON (ver enviar_lote).
+        """
+        self.enviar_lote([paquete])
+
+    def enviar_lote(self, paquetes: list[dict]) -> None:
+        """
+        Envía cada paquete como una línea JSON, todos en una sola escritura. Si ya hay
+        `ventana` mensajes sin confirmar, espera el ACK del servidor antes de retornar.
+        Si el envío falla, los mensajes quedan pendientes y se reenvían en la próxima
+        reconexión (p.ej. al llamar a confirmar()).
+        """
+        mensajes = [json.dumps(paquete).encode("utf-8") + SEPARADOR for paquete in paquetes]
+        self._pendientes.extend(mensajes)
+        try:
+            if self.sock is None:
+                self._conectar()  # Envía todos los pendientes, incluidos estos
+            else:
+                self.sock.sendall(b"".join(mensajes))
+        except OSError:
+            # Reconectamos una vez: _conectar reenvía estos mensajes junto con los pendientes
+            self._conectar()
+        if len(self._pendientes) >= self.ventana:
+            self.confirmar()
+
+    def descartar_pendientes(self) -> int:
+        """
+        Olvida los mensajes no confirmados (no se reenviarán). Retorna cuántos eran.
+        """
+        descartados = len(self._pendientes)
+        self._pendientes.clear()
+        return descartados
+
+    def _leer_ack(self) -> None:
+        """
+        Lee líneas {"ack": n} hasta que el servidor confirme todos los mensajes pendientes.
+        """
+        while self._pendientes:
+            while SEPARADOR not in self._buffer:
+                datos = self.sock.recv(4096)
+                if not datos:
+                    raise ConnectionError("el servidor cerró la conexión sin confirmar los mensajes")
+                self._buffer += datos
+            linea, self._buffer = self._buffer.split(SEPARADOR, 1)
+            ack = json.loads(linea)["ack"]
+            # El ACK es acumulado: descartamos los mensajes que cubre
+            del self._pendientes[:ack - self._confirmados]
+            self._confirmados = ack
+
+    def confirmar(self) -> None:
+        """
+        Espera a que el servidor confirme todos los mensajes enviados por este canal.
+        """
+        if not self._pendientes:
+            return
+        try:
+            if self.sock is None:
+                self._conectar()
+            self._leer_ack()
+        except OSError:
+            # Reconectamos una vez, reenviando lo no confirmado, y volvemos a esperar
+            self._conectar()
+            self._leer_ack()
+
+    def cerrar(self, confirmar: bool = True) -> None:
+        """
+        Cierra la conexión, esperando antes las confirmaciones si `confirmar` es True.
+        """
+        if self.sock is None:
+            return
+        try:
+            if confirmar:
+                self.confirmar()
+        finally:
+            if self.sock is not None:
+                self.sock.close()
+                self.sock = None
+
+
+# Pool de canales libres por (host, puerto). Cada hilo toma un canal, envía y lo devuelve,
+# así que la cantidad de conexiones abiertas es la de hilos que envían a la vez.
+_canales: dict[tuple[str, int], list[CanalResultados]] = {}
+_canales_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def _tomar_canal(server_host: str, server_port: int) -> CanalResultados:
+    """
+    Toma un canal libre hacia (server_host, server_port) o crea uno nuevo.
+    """
+    global _canales, _pid
+    with _canales_lock:
+        if _pid != os.getpid():
+            # Proceso hijo creado con fork: los sockets heredados son del padre
+            _canales, _pid = {}, os.getpid()
+        libres = _canales.get((server_host, server_port))
+        if libres:
+            return libres.pop()
+    return CanalResultados(server_host, server_port)
+
+
+def _devolver_canal(canal: CanalResultados) -> None:
+    """
+    Devuelve un canal al pool para que otro envío lo reutilice.
+    """
+    with _canales_lock:
+        _canales.setdefault((canal.host, canal.port), []).append(canal)
+
+
+def confirmar_envios(server_host: str | None = None, server_port: int | None = None) -> None:
+    """
+    Espera la confirmación de todos los resultados enviados por los canales libres del pool
+    (solo los del servidor indicado, si se pasa server_host/server_port).
+    Si algún canal falla, lo informa por pantalla y lo descarta.
+    """
+    # Sacamos los canales del pool mientras esperamos, para que ningún hilo los use a la vez
+    with _canales_lock:
+        canales = []
+        for (host, port), libres in _canales.items():
+            if (server_host is None or host == server_host) and (server_port is None or port == server_port):
+                canales.extend(libres)
+                libres.clear()
+    for canal in canales:
+        try:
+            canal.confirmar()
+        except Exception as e:
+            print(f"[Client] Error al confirmar resultados: {e}")
+            canal.cerrar(confirmar=False)
+            continue
+        _devolver_canal(canal)
+
+
+def cerrar_canales() -> None:
+    """
+    Confirma lo pendiente y cierra todos los canales del pool.
+    Se ejecuta automáticamente al terminar el programa.
+    """
+    global _canales
+    if _pid != os.getpid():
+        return
+    confirmar_envios()
+    with _canales_lock:
+        canales = [canal for libres in _canales.values() for canal in libres]
+        _canales = {}
+    for canal in canales:
+        canal.cerrar(confirmar=False)
+
+
+atexit.register(cerrar_canales)
+
+
+@medir("socket/send_result")
 def send_result(
     origen: str,
     algoritmo: str,
     tiempo: float,
     server_host: str = "127.0.0.1",
-    server_port: int = 5000
+    server_port: int = 5000,
+    total: int | None = None
 ) -> None:
     """
-    Crea un socket  hacia (server_host, server_port) y envía un JSON con:
+    Envía al servidor (server_host, server_port) una línea JSON con:
       {
         "origen": origen,       # Por ejemplo, "CSV" o "JSON"
         "algoritmo": algoritmo, # Por ejemplo, "QuickSort"
-        "tiempo": tiempo        # Tiempo de ejecución en segundos
+        "tiempo": tiempo,       # Tiempo de ejecución en segundos
+        "total": total          # (Opcional) Cuántos algoritmos se ejecutan para este origen
       }
-    Luego cierra la conexión. Si ocurre un error, lo informa por pantalla.
+    El mensaje viaja por una conexión persistente tomada del pool de canales, sin abrir
+    una conexión nueva por resultado. Los ACK del servidor se esperan por tandas
+    (cada VENTANA_ACK mensajes, en confirmar_envios() o al terminar el programa).
+    Si ocurre un error, lo informa por pantalla.
 
     Parámetros:
     - origen: Identifica el formato de datos de origen (CSV o JSON).
@@ -23,6 +229,9 @@ def send_result(
     - tiempo: Tiempo de ejecución en segundos (float).
     - server_host: Dirección IP o hostname del servidor (por defecto "127.0.0.1").
     - server_port: Puerto en el que el servidor está escuchando (por defecto 5000).
+    - total: Número de algoritmos que se ejecutan para este origen; el servidor lo usa
+             para saber cuándo mostrar el resumen. Si es None no se envía y el servidor
+             asume 4, como en los mensajes antiguos.
     """
 
     # 1. Empaquetamos los datos en un diccionario
@@ -31,23 +240,19 @@ def send_result(
         "algoritmo": algoritmo,
         "tiempo": tiempo
     }
+    if total is not None:
+        paquete["total"] = total
 
+    # 2. Tomamos un canal del pool y enviamos el paquete
+    canal = _tomar_canal(server_host, server_port)
     try:
-        # 2. Creamos un socket 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        # 3. Conectamos al servidor especificado
-        sock.connect((server_host, server_port))
-        # 4. Convertir el diccionario a cadena JSON y luego a bytes UTF-8
-        mensaje = json.dumps(paquete).encode("utf-8")
-        # 5. Enviar todos los bytes al servidor
-        sock.sendall(mensaje)
-
+        canal.enviar(paquete)
     except Exception as e:
         # Si ocurre cualquier excepción durante la conexión o el envío, se informa
+        # y el canal se descarta (no vuelve al pool)
         print(f"[Client] Error al enviar resultado: {e}")
-    finally:
-        # 6. Cerramos el socket para liberar recursos
-        sock.close()
-
-
+        canal.cerrar(confirmar=False)
+        return
 
+    # 3. Devolvemos el canal al pool para el próximo envío
+    _devolver_canal(canal)
@@ -0,0 +1,155 @@
+import atexit     # Para enviar lo que quede en la cola al terminar el programa
+import os         # Para detectar si el proceso actual es un hijo (fork) sin hilo emisor
+import queue      # Cola acotada entre los hilos que ordenan y el hilo emisor
+import threading  # Hilo emisor en segundo plano
+import time       # Para las esperas entre reintentos
+from sockets.client_side import CanalResultados
+from instrumentacion.metricas import medir, contar
+
+# Resultados que pueden esperar en la cola. Si se llena (p.ej. el servidor no responde),
+# los nuevos resultados se descartan: quien reporta nunca se bloquea.
+TAM_COLA_REPORTES = 10_000
+
+# Resultados que el emisor junta en una sola escritura
+LOTE_REPORTES = 64
+
+# Reintentos por lote y espera entre ellos (se duplica en cada intento hasta ESPERA_MAXIMA)
+REINTENTOS = 5
+ESPERA_INICIAL = 0.1
+ESPERA_MAXIMA = 5.0
+
+_cola: queue.Queue = queue.Queue(maxsize=TAM_COLA_REPORTES)
+_emisor: threading.Thread | None = None
+_emisor_lock = threading.Lock()
+_pid = os.getpid()
+_descartados = 0  # Resultados perdidos por cola llena o por agotar los reintentos
+
+
+def reportar(
+    origen: str,
+    algoritmo: str,
+    tiempo: float,
+    server_host: str = "127.0.0.1",
+    server_port: int = 5000,
+    total: int | None = None
+) -> None:
+    """
+    Versión sin espera de sockets.client_side.send_result: deja el resultado en una cola
+    en memoria y retorna de inmediato. Un único hilo emisor en segundo plano lo envía al
+    servidor (ver _emitir), así que la latencia de red, o un servidor caído, no afectan
+    al hilo que midió el ordenamiento.
+
+    Parámetros: los mismos de send_result.
+    """
+    global _descartados
+    paquete = {"origen": origen, "algoritmo": algoritmo, "tiempo": tiempo}
+    if total is not None:
+        paquete["total"] = total
+
+    _iniciar_emisor()
+    try:
+        _cola.put_nowait((server_host, server_port, paquete))
+    except queue.Full:
+        _descartados += 1
+
+
+def _iniciar_emisor() -> None:
+    """
+    Arranca el hilo emisor la primera vez que se reporta algo en este proceso.
+    """
+    global _emisor, _cola, _pid, _descartados
+    if _emisor is not None and _pid == os.getpid():
+        return
+    with _emisor_lock:
+        if _pid != os.getpid():
+            # Proceso hijo creado con fork: el hilo emisor del padre no existe aquí
+            _cola, _emisor, _pid, _descartados = queue.Queue(maxsize=TAM_COLA_REPORTES), None, os.getpid(), 0
+        if _emisor is None:
+            _emisor = threading.Thread(target=_emitir, name="Reportero", daemon=True)
+            _emisor.start()
+
+
+@medir("socket/enviar_lote")
+def _enviar_con_reintentos(canal: CanalResultados, paquetes: list[dict]) -> None:
+    """
+    Envía un lote por `canal` y espera su ACK. Si falla, reintenta con espera exponencial;
+    tras REINTENTOS fallidos descarta el lote (y lo informa) para no frenar a los siguientes.
+    """
+    global _descartados
+    espera = ESPERA_INICIAL
+    for intento in range(REINTENTOS + 1):
+        try:
+            if intento == 0:
+                canal.enviar_lote(paquetes)
+            # Los mensajes no confirmados siguen pendientes en el canal: confirmar()
+            # reconecta si hace falta y los reenvía
+            canal.confirmar()
+            contar("socket/resultados", len(paquetes))
+            return
+        except Exception as e:
+            canal.cerrar(confirmar=False)
+            if intento == REINTENTOS:
+                _descartados += canal.descartar_pendientes()
+                print(f"[Reportero] No se pudieron enviar {len(paquetes)} resultados a "
+                      f"{canal.host}:{canal.port}: {e}")
+                return
+            time.sleep(espera)
+            espera = min(espera * 2, ESPERA_MAXIMA)
+
+
+def _emitir() -> None:
+    """
+    Cuerpo del hilo emisor: toma resultados de la cola, los agrupa por servidor en lotes
+    de hasta LOTE_REPORTES y los envía por una conexión persistente propia.
+    """
+    canales: dict[tuple[str, int], CanalResultados] = {}
+    cola = _cola
+    while True:
+        # 1. Esperamos un resultado y juntamos los que ya estén en la cola
+        items = [cola.get()]
+        while len(items) < LOTE_REPORTES:
+            try:
+                items.append(cola.get_nowait())
+            except queue.Empty:
+                break
+
+        # 2. Un lote por servidor de destino
+        lotes: dict[tuple[str, int], list[dict]] = {}
+        for server_host, server_port, paquete in items:
+            lotes.setdefault((server_host, server_port), []).append(paquete)
+        for (server_host, server_port), paquetes in lotes.items():
+            canal = canales.get((server_host, server_port))
+            if canal is None:
+                canal = canales[(server_host, server_port)] = CanalResultados(server_host, server_port)
+            _enviar_con_reintentos(canal, paquetes)
+
+        for _ in items:
+            cola.task_done()
+
+
+def vaciar_reportes(espera: float = 30.0) -> bool:
+    """
+    Espera hasta `espera` segundos a que el emisor envíe (y el servidor confirme, o se
+    descarte tras los reintentos) todo lo reportado hasta ahora.
+    Informa por pantalla si se perdieron resultados.
+
+    Retorno:
+    - True si la cola quedó vacía, False si se agotó la espera.
+    """
+    global _descartados
+    if _pid != os.getpid():
+        return True
+    limite = time.monotonic() + espera
+    while _cola.unfinished_tasks:
+        if time.monotonic() >= limite:
+            print(f"[Reportero] Quedaron {_cola.unfinished_tasks} resultados sin enviar.")
+            return False
+        time.sleep(0.01)
+    if _descartados:
+        print(f"[Reportero] Se descartaron {_descartados} resultados (servidor inaccesible o cola llena).")
+        _descartados = 0
+    return True
+
+
+# Al salir esperamos poco: un servidor caído no debe demorar el cierre del programa
+atexit.register(vaciar_reportes, 5.0)
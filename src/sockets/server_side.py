@@ -1,6 +1,11 @@
+import asyncio         # Para el modo "asyncio": todas las conexiones en un solo bucle de eventos
 import socket          # Para crear sockets de red
 import threading       # Para manejar múltiples hilos de ejecución
 import json            # Para codificar/decodificar mensajes JSON
+from instrumentacion.metricas import registro, contar, iniciar_endpoint_prometheus
+
+# Separador de mensajes: un JSON por línea (el mismo que usa sockets.client_side)
+SEPARADOR = b"\n"
 
 # Diccionario para almacenar los tiempos recibidos de cada origen (CSV o JSON).
 resultados_recibidos = {}
@@ -8,68 +13,125 @@ resultados_recibidos = {}
 # Conjunto para llevar registro de qué origenes ya se han resumido (evita resúmenes duplicados).
 resumen_mostrado = set()
 
+# Algoritmos esperados por origen cuando el cliente no envía el campo "total"
+# (mensajes antiguos, anteriores a las variantes in-place).
+ALGORITMOS_POR_DEFECTO = 4
+
 # Lock para sincronizar el acceso a 'resultados_recibidos' y 'resumen_mostrado' entre hilos
+# (solo en el modo "hilos": en el modo "asyncio" todo corre en un único hilo)
 lock = threading.Lock()
 
+# Modos del servidor: un hilo por conexión, o un bucle de eventos asyncio para todas
+MODOS = ("hilos", "asyncio")
+
+# Conexiones pendientes de aceptar que admite el modo asyncio
+BACKLOG_ASYNC = 1024
+
+
+def _registrar_resultado(mensaje: dict, addr) -> None:
+    """
+    Guarda un resultado recibido en 'resultados_recibidos' y, si ya llegaron todos los
+    algoritmos de ese origen (el campo "total" del mensaje, o 4 si no viene), muestra
+    el resumen una sola vez.
+    No toma el lock: en el modo "hilos" quien llama debe tenerlo; en el modo "asyncio"
+    no hace falta, porque el bucle de eventos ejecuta un mensaje a la vez.
+    """
+    origen = mensaje["origen"]         # "CSV" o "JSON"
+    algoritmo = mensaje["algoritmo"]   # Nombre del algoritmo (ej. "QuickSort")
+    tiempo = mensaje["tiempo"]         # Tiempo de ejecución del algoritmo en segundos
+    total = mensaje.get("total", ALGORITMOS_POR_DEFECTO)  # Algoritmos esperados para este origen
+
+    # Métricas del servidor: mensajes recibidos y tiempo informado de cada algoritmo
+    contar("servidor/mensajes")
+    registro.observar(f"resultado/{origen}/{algoritmo}", tiempo)
+
+    # Si es la primera vez que recibimos datos para este origen, creamos la clave
+    if origen not in resultados_recibidos:
+        resultados_recibidos[origen] = {}
+    # Guardamos el tiempo del algoritmo dentro del diccionario
+    resultados_recibidos[origen][algoritmo] = tiempo
+
+    # Se muestra en consola que recibimos los datos de este cliente
+    print(f"[Servidor] Recibido de {addr}: {origen} - {algoritmo} en {tiempo:.4f} s")
+
+    # Si ya tenemos todos los algoritmos para este mismo origen y aún no mostramos el resumen:
+    if len(resultados_recibidos[origen]) >= total and origen not in resumen_mostrado:
+        # Generar y mostrar el resumen de tiempos para este origen
+        mostrar_resumen(origen, resultados_recibidos[origen])
+        # Marcar que ya mostramos el resumen para este origen
+        resumen_mostrado.add(origen)
+
+
+def _procesar_linea(linea: bytes, addr) -> None:
+    """
+    Decodifica un mensaje JSON y lo registra. Un mensaje mal formado se informa
+    por pantalla sin cortar la conexión.
+    """
+    try:
+        _registrar_resultado(json.loads(linea.decode("utf-8")), addr)
+    except Exception as e:
+        print("[Servidor] Mensaje inválido de", addr, ":", e)
+
 
 def manejar_cliente(conn, addr):
     """
     Función que se ejecuta en un hilo separado para atender a un cliente específico.
     - conn: socket de conexión con el cliente.
     - addr: dirección del cliente (tupla (IP, puerto)).
-    Se encarga de:
-      1) Recibir el JSON con los datos de origen, algoritmo y tiempo.
-      2) Almacenar el tiempo en 'resultados_recibidos' de forma sincronizada.
-      3) Mostrar un resumen si ya se recibieron los 4 algoritmos de ese origen.
-      4) Enviar un ACK al cliente.
+    La conexión puede durar todo el programa: el cliente envía un mensaje JSON por línea
+    (ver sockets.client_side) y este hilo:
+      1) Recibe los datos y separa cada línea completa (origen, algoritmo y tiempo).
+      2) Registra cada resultado en 'resultados_recibidos' de forma sincronizada y
+         muestra el resumen cuando llegan todos los algoritmos de un origen.
+      3) Envía un solo ACK por cada tanda recibida: {"ack": <mensajes recibidos hasta ahora>}.
+      4) Al cerrarse la conexión, si quedó un mensaje sin "\n" final, lo procesa como un
+         mensaje del protocolo anterior (un JSON por conexión, delimitado por el cierre).
     """
+    recibidos = 0   # Mensajes con formato de línea recibidos en esta conexión
+    data = b""
     try:
-        # 1. Recibimos todos los datos enviados por el cliente.
-        data = b""
         while True:
             packet = conn.recv(4096)  # Se reciben hasta 4096 bytes
             if not packet:
-                # Si no hay más datos, rompemos el bucle de recepción
+                # El cliente cerró la conexión
                 break
             data += packet
 
-        # 2. Se convierten los bytes recibidos a cadena y parsear JSON
-        mensaje = json.loads(data.decode("utf-8"))
-        origen = mensaje["origen"]         # "CSV" o "JSON"
-        algoritmo = mensaje["algoritmo"]   # Nombre del algoritmo (ej. "QuickSort")
-        tiempo = mensaje["tiempo"]         # Tiempo de ejecución del algoritmo en segundos
-
-        # 3. Bloqueamos acceso a variables compartidas para evitar condiciones de carrera
-        with lock:
-            # Si es la primera vez que recibimos datos para este origen, creamos la clave
-            if origen not in resultados_recibidos:
-                resultados_recibidos[origen] = {}
-            # Guardamos el tiempo del algoritmo dentro del diccionario
-            resultados_recibidos[origen][algoritmo] = tiempo
-
-            # Se muestra en consola que recibimos los datos de este cliente
-            print(f"[Servidor] Recibido de {addr}: {origen} - {algoritmo} en {tiempo:.4f} s")
-
-            # 4) Si ya tenemos los 4 algoritmos para este mismo origen y aún no mostramos el resumen:
-            if len(resultados_recibidos[origen]) == 4 and origen not in resumen_mostrado:
-                # Generar y mostrar el resumen de tiempos para este origen
-                mostrar_resumen(origen, resultados_recibidos[origen])
-                # Marcar que ya mostramos el resumen para este origen
-                resumen_mostrado.add(origen)
+            # 1-2. Procesamos todas las líneas completas recibidas hasta ahora
+            *lineas, data = data.split(SEPARADOR)
+            for linea in lineas:
+                if linea.strip():
+                    # Bloqueamos acceso a variables compartidas para evitar condiciones de carrera
+                    with lock:
+                        _procesar_linea(linea, addr)
+                    recibidos += 1
+
+            # 3. Un ACK acumulado por tanda, no uno por mensaje
+            if lineas:
+                try:
+                    conn.sendall(json.dumps({"ack": recibidos}).encode("utf-8") + SEPARADOR)
+                except OSError:
+                    # El cliente ya no lee (p.ej. cliente antiguo que cerró tras enviar)
+                    pass
+
+        # 4. Mensaje del protocolo anterior: un solo JSON sin separador final
+        if data.strip():
+            with lock:
+                _procesar_linea(data, addr)
 
     except Exception as e:
-        # Si ocurre cualquier error (JSON mal formado, error de socket, etc.), lo imprimimos
+        # Si ocurre cualquier error de socket, lo imprimimos
         print("[Servidor] Error al manejar cliente:", e)
 
     finally:
-        # 6. Cerrar la conexión en cualquier caso para liberar recursos
+        # Cerrar la conexión en cualquier caso para liberar recursos
         conn.close()
 
 
 def mostrar_resumen(origen, resultados):
     """
     Imprime en consola un resumen ordenado de los tiempos
-    de los cuatro algoritmos para un origen dado (CSV o JSON).
+    de todos los algoritmos para un origen dado (CSV o JSON).
     - origen: cadena "CSV" o "JSON"
     - resultados: diccionario { "QuickSort": 0.03, "MergeSort": 0.04, ... }
     """
@@ -80,16 +142,87 @@ def mostrar_resumen(origen, resultados):
     print(f">>> Fin del resumen para {origen}\n")
 
 
-def iniciar_servidor(host="0.0.0.0", port=5000):
+async def manejar_cliente_async(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Versión asyncio de manejar_cliente, con el mismo protocolo (un JSON por línea,
+    un ACK acumulado por tanda recibida y el mensaje antiguo sin separador al cierre).
+    Los bytes se acumulan en un bytearray y se descarta lo ya procesado, así que el
+    costo por tanda depende de su tamaño y no de todo lo recibido en la conexión.
+    """
+    addr = writer.get_extra_info("peername")
+    recibidos = 0
+    buffer = bytearray()
+    try:
+        while True:
+            packet = await reader.read(65536)
+            if not packet:
+                break
+            buffer += packet
+
+            # Procesamos las líneas completas y dejamos en el buffer solo la última, incompleta
+            fin = buffer.rfind(SEPARADOR)
+            if fin < 0:
+                continue
+            for linea in bytes(buffer[:fin]).split(SEPARADOR):
+                if linea.strip():
+                    _procesar_linea(linea, addr)
+                    recibidos += 1
+            del buffer[:fin + 1]
+
+            # Un ACK acumulado por tanda
+            writer.write(json.dumps({"ack": recibidos}).encode("utf-8") + SEPARADOR)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+        # Mensaje del protocolo anterior: un solo JSON sin separador final
+        if buffer.strip():
+            _procesar_linea(bytes(buffer), addr)
+
+    except Exception as e:
+        print("[Servidor] Error al manejar cliente:", e)
+
+    finally:
+        writer.close()
+
+
+async def servir_async(host: str = "0.0.0.0", port: int = 5000) -> None:
+    """
+    Atiende todas las conexiones en un solo bucle de eventos con asyncio.start_server:
+    no se crea un hilo por cliente y el estado compartido se actualiza sin lock.
+    """
+    servidor = await asyncio.start_server(manejar_cliente_async, host, port, backlog=BACKLOG_ASYNC)
+    print(f"[Servidor] Escuchando en {host}:{port} (asyncio) ...")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def iniciar_servidor(host="0.0.0.0", port=5000, modo="hilos", puerto_metricas=None):
     """
     Función principal para iniciar el servidor:
       1) Crea un socket TCP y lo configura.
       2) Se queda en un bucle aceptando clientes entrantes.
       3) Para cada cliente aceptado, arranca un hilo con 'manejar_cliente'.
+         Como cada cliente mantiene su conexión abierta y envía todos sus resultados
+         por ella, se crea un hilo por conexión y no uno por resultado.
+    Con modo="asyncio" se usa servir_async en su lugar: un único hilo atiende a todos
+    los clientes, lo que permite miles de conexiones simultáneas.
     Parámetros opcionales:
       - host: dirección IP donde escucha (por defecto 0.0.0.0 para escuchar en todas las interfaces).
       - port: puerto TCP donde escucha (por defecto 5000).
+      - modo: "hilos" (por defecto) o "asyncio".
+      - puerto_metricas: si se indica, expone las métricas en formato Prometheus en
+        http://host:puerto_metricas/metrics (requiere prometheus_client).
     """
+    if modo not in MODOS:
+        raise ValueError(f"modo debe ser uno de {MODOS}, no {modo!r}.")
+    if puerto_metricas is not None:
+        iniciar_endpoint_prometheus(puerto_metricas, host)
+    if modo == "asyncio":
+        asyncio.run(servir_async(host, port))
+        return
+
     # 1. Creamos el socket
     serv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     # Se permite reutilizar la dirección inmediatamente tras cerrar (evita 'Address already in use')
@@ -111,6 +244,10 @@ def iniciar_servidor(host="0.0.0.0", port=5000):
 
 
 if __name__ == "__main__":
-    # Solo se ejecuta si el archivo se invoca directamente (no si se importa como módulo)
-    iniciar_servidor()
-
+    # Solo se ejecuta si el archivo se invoca directamente (no si se importa como módulo).
+    # Uso: python server_side.py [hilos|asyncio] [puerto_metricas]
+    import sys
+    iniciar_servidor(
+        modo=sys.argv[1] if len(sys.argv) > 1 else "hilos",
+        puerto_metricas=int(sys.argv[2]) if len(sys.argv) > 2 else None
+    )
@@ -1,15 +1,71 @@
 # Importamos cada algoritmo de ordenamiento desde su respectivo módulo.
 from sort_algorithms.quicksort import quick_sort       # QuickSort recursivo
+from sort_algorithms.quicksort import quick_sort_inplace  # QuickSort in-place con pila explícita
 from sort_algorithms.mergesort import merge_sort       # MergeSort recursivo
+from sort_algorithms.mergesort import merge_sort_inplace  # MergeSort bottom-up con dos buffers
 from sort_algorithms.countingsort import counting_sort # Counting Sort para enteros no negativos
 from sort_algorithms.radixsort import radix_sort       # Radix Sort para enteros no negativos
+from sort_algorithms.numpy_backend import (            # Versiones vectorizadas con NumPy
+    quick_sort_np, merge_sort_np, counting_sort_np, radix_sort_np
+)
+from sort_algorithms.adaptive import adaptive_sort     # Elige el algoritmo según los datos
+from sort_algorithms.parallel import (                 # Variantes que usan todos los núcleos
+    sample_sort_paralelo, merge_sort_paralelo, counting_sort_paralelo
+)
 
 # Creamos un diccionario que asocia el nombre de cada algoritmo (clave)
 # con la función que lo implementa (valor). Esto permite elegir dinámicamente
 # qué algoritmo ejecutar a partir de su nombre.
+# Las variantes "InPlace" ordenan la lista recibida sin crear listas por nivel.
 algorithms = {
     "QuickSort": quick_sort,
+    "QuickSortInPlace": quick_sort_inplace,
     "MergeSort": merge_sort,
+    "MergeSortInPlace": merge_sort_inplace,
     "RadixSort": radix_sort,
     "CountingSort": counting_sort,
 }
+
+
+# Versiones vectorizadas con NumPy de los mismos cuatro algoritmos.
+# Reciben una lista o un arreglo y devuelven un arreglo de NumPy con el mismo contenido
+# que la versión en Python puro.
+algorithms_numpy = {
+    "QuickSort": quick_sort_np,
+    "MergeSort": merge_sort_np,
+    "RadixSort": radix_sort_np,
+    "CountingSort": counting_sort_np,
+}
+
+# Un solo ordenamiento que elige el algoritmo según los datos (ver sort_algorithms.adaptive);
+# sort_algorithms.adaptive.DECISIONES guarda qué eligió y por qué.
+algorithms_adaptive = {
+    "Adaptativo": adaptive_sort,
+}
+
+# Variantes en varios procesos (un trozo o cubeta por núcleo, ver sort_algorithms.parallel).
+# Con menos de parallel.UMBRAL_PARALELO elementos ordenan en el proceso actual.
+algorithms_paralelo = {
+    "SampleSort": sample_sort_paralelo,
+    "MergeSort": merge_sort_paralelo,
+    "CountingSort": counting_sort_paralelo,
+}
+
+# Registro de backends: permite elegir la implementación por nombre
+# ("python" es la implementación original, elemento a elemento).
+backends = {
+    "python": algorithms,
+    "numpy": algorithms_numpy,
+    "adaptativo": algorithms_adaptive,
+    "paralelo": algorithms_paralelo,
+}
+
+
+def get_algorithms(backend: str = "python") -> dict:
+    """
+    Devuelve el diccionario {nombre: función} del backend indicado.
+    Lanza ValueError si el backend no existe.
+    """
+    if backend not in backends:
+        raise ValueError(f"Backend desconocido: {backend!r}. Opciones: {list(backends)}")
+    return backends[backend]
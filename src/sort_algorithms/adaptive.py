@@ -0,0 +1,180 @@
+import math                       # log2 para el costo estimado de los ordenamientos por comparación
+import random                     # Posiciones de la muestra
+from collections import deque     # Historial acotado de decisiones
+from sort_algorithms.quicksort import quick_sort_inplace
+from sort_algorithms.mergesort import merge_sort_inplace
+from sort_algorithms.countingsort import counting_sort
+from sort_algorithms.radixsort import radix_sort
+from instrumentacion.metricas import contar
+
+# Elementos de la muestra usada para estimar valores distintos
+TAM_MUESTRA = 1024
+
+# Ventanas contiguas (cantidad × largo) en las que se mide qué tan ordenada está la entrada
+VENTANAS = 16
+LARGO_VENTANA = 64
+
+# Fracción de descensos por debajo de la cual la entrada se considera casi ordenada
+# (o por encima de 1 - UMBRAL_ORDENADA, casi en orden inverso)
+UMBRAL_ORDENADA = 0.02
+
+# Si la muestra tiene a lo sumo esta cantidad de valores distintos, la partición en tres
+# vías de QuickSortInPlace despacha cada valor repetido en una sola pasada
+POCOS_DISTINTOS = 16
+
+# Counting Sort reserva una lista del tamaño del rango: no se usa con rangos mayores
+MAX_RANGO_CONTEO = 1 << 24
+
+# Costo relativo por operación de cada algoritmo (segundos), estimado con
+# benchmarks/bench_sorts.py en el backend "python" (n = 1e5):
+#   counting ≈ C_CONTEO_N·n + C_CONTEO_RANGO·rango
+#   radix    ≈ C_RADIX·n·dígitos decimales del rango
+#   merge    ≈ C_MERGE·n·log2(n)
+#   quick 3 vías con k valores distintos ≈ C_QUICK·n·log2(k + 1)
+C_CONTEO_N = 9e-8
+C_CONTEO_RANGO = 1.8e-7
+C_RADIX = 4e-7
+C_MERGE = 1.6e-7
+C_QUICK = 2.2e-7
+
+# Últimas decisiones tomadas (para auditar por qué se eligió cada algoritmo)
+DECISIONES: deque = deque(maxlen=1000)
+
+
+def analizar(arr: list[int], tam_muestra: int = TAM_MUESTRA) -> dict:
+    """
+    Estadísticas baratas de `arr` para elegir el algoritmo:
+    - n, minimo, maximo y rango (maximo - minimo + 1): recorren la lista una vez, en C.
+    - distintos_muestra: valores distintos en una muestra de hasta `tam_muestra` elementos.
+    - desorden: entre los pares vecinos distintos dentro de VENTANAS ventanas contiguas,
+      fracción en descenso (0 = ordenada, 1 = orden inverso). Los pares iguales no cuentan,
+      para que los repetidos no hagan parecer desordenada una lista en orden inverso.
+    - enteros: si todos los elementos de la muestra son int.
+    """
+    n = len(arr)
+    rng = random.Random(n)  # Misma entrada → misma muestra → misma decisión
+    indices = rng.sample(range(n), min(n, tam_muestra))
+    muestra = [arr[i] for i in indices]
+
+    # Pares vecinos dentro de ventanas repartidas a lo largo de la lista
+    pares = descensos = 0
+    paso = max(1, n // VENTANAS)
+    for inicio in range(0, max(0, n - 1), paso):
+        fin = min(inicio + LARGO_VENTANA, n - 1)
+        for i in range(inicio, fin):
+            if arr[i] != arr[i + 1]:
+                pares += 1
+                if arr[i] > arr[i + 1]:
+                    descensos += 1
+
+    enteros = all(type(x) is int for x in muestra)
+    minimo, maximo = (min(arr), max(arr)) if n and enteros else (None, None)
+    return {
+        "n": n,
+        "minimo": minimo,
+        "maximo": maximo,
+        "rango": maximo - minimo + 1 if enteros and n else None,
+        "distintos_muestra": len(set(muestra)),
+        "desorden": descensos / pares if pares else 0.0,
+        "enteros": enteros,
+    }
+
+
+def _costos(estadisticas: dict) -> dict:
+    """
+    Costo estimado (s) de cada algoritmo aplicable según las estadísticas.
+    """
+    n, rango = estadisticas["n"], estadisticas["rango"]
+    costos = {"MergeSortInPlace": C_MERGE * n * math.log2(n)}
+    if estadisticas["distintos_muestra"] <= POCOS_DISTINTOS:
+        costos["QuickSortInPlace"] = C_QUICK * n * math.log2(estadisticas["distintos_muestra"] + 1)
+    if rango <= MAX_RANGO_CONTEO:
+        costos["CountingSort"] = C_CONTEO_N * n + C_CONTEO_RANGO * rango
+    costos["RadixSort"] = C_RADIX * n * len(str(rango - 1))
+    return costos
+
+
+def elegir_algoritmo(arr: list[int]) -> dict:
+    """
+    Decide qué algoritmo usar con `arr`, sin ordenarla.
+
+    Retorno:
+    - Diccionario { "algoritmo", "razon", "estadisticas", "costos" }.
+    """
+    estadisticas = analizar(arr)
+    n = estadisticas["n"]
+    decision = {"estadisticas": estadisticas, "costos": None}
+
+    if n < 2:
+        return {**decision, "algoritmo": "Ninguno", "razon": f"n = {n}: ya está ordenada"}
+    if not estadisticas["enteros"]:
+        return {**decision, "algoritmo": "MergeSortInPlace",
+                "razon": "hay valores no enteros: solo sirve un ordenamiento por comparación"}
+
+    desorden = estadisticas["desorden"]
+    if desorden <= UMBRAL_ORDENADA or desorden >= 1 - UMBRAL_ORDENADA:
+        sentido = "ordenada" if desorden <= UMBRAL_ORDENADA else "en orden inverso"
+        return {**decision, "algoritmo": "TimSort",
+                "razon": f"desorden {desorden:.3f}: casi {sentido}; TimSort (sorted) "
+                         f"detecta los tramos ya ordenados y los combina en O(n) a O(n log n)"}
+
+    costos = _costos(estadisticas)
+    algoritmo = min(costos, key=costos.get)
+    razones = {
+        "CountingSort": f"rango {estadisticas['rango']} pequeño frente a n = {n}",
+        "RadixSort": f"rango {estadisticas['rango']} amplio ({len(str(estadisticas['rango'] - 1))} dígitos)",
+        "QuickSortInPlace": f"pocos valores distintos (~{estadisticas['distintos_muestra']} en la muestra)",
+        "MergeSortInPlace": "rango amplio y valores variados: ordenamiento por comparación",
+    }
+    return {**decision, "algoritmo": algoritmo, "costos": costos,
+            "razon": f"{razones[algoritmo]}; menor costo estimado ({costos[algoritmo]:.4f} s)"}
+
+
+def _con_desplazamiento(func, arr: list[int], minimo: int) -> list[int]:
+    """
+    Aplica un ordenamiento de enteros no negativos (counting o radix) a valores
+    cualesquiera: resta `minimo` (el menor queda en 0), ordena y vuelve a sumarlo.
+    Además achica el rango, así que conviene aunque no haya negativos.
+    """
+    if minimo == 0:
+        return func(arr)
+    ordenada = func([x - minimo for x in arr])
+    return [x + minimo for x in ordenada]
+
+
+def adaptive_sort(arr: list[int]) -> list[int]:
+    """
+    Ordena `arr` con el algoritmo que elegir_algoritmo() estima más rápido para sus datos
+    (Counting, Radix, QuickSort en tres vías, MergeSort o TimSort) y guarda la decisión,
+    con su razón, en DECISIONES. Admite negativos: counting y radix se aplican sobre
+    los valores desplazados por el mínimo.
+    Retorna una lista ordenada (puede ser `arr` modificada o una lista nueva).
+    """
+    decision = elegir_algoritmo(arr)
+    DECISIONES.append(decision)
+    contar(f"sort/adaptativo/{decision['algoritmo']}")
+
+    algoritmo = decision["algoritmo"]
+    if algoritmo == "Ninguno":
+        return list(arr)
+    if algoritmo == "TimSort":
+        return sorted(arr)
+    if algoritmo in ("CountingSort", "RadixSort"):
+        func = counting_sort if algoritmo == "CountingSort" else radix_sort
+        try:
+            return _con_desplazamiento(func, arr, decision["estadisticas"]["minimo"])
+        except (TypeError, IndexError, ValueError) as e:
+            # La muestra no vio algún valor no entero: seguimos con un ordenamiento por comparación
+            decision["algoritmo"] = "MergeSortInPlace"
+            decision["razon"] += f"; {algoritmo} falló ({e}), se usó MergeSortInPlace"
+            return merge_sort_inplace(arr)
+    if algoritmo == "QuickSortInPlace":
+        return quick_sort_inplace(arr)
+    return merge_sort_inplace(arr)
+
+
+def ultima_decision() -> dict | None:
+    """
+    La decisión más reciente de adaptive_sort en este proceso, o None si no hubo ninguna.
+    """
+    return DECISIONES[-1] if DECISIONES else None
@@ -10,8 +10,10 @@ def counting_sort(arr: list[int]) -> list[int]:
 
     # Encuentra el valor máximo para determinar el rango del conteo
     max_val = max(arr)
-    if max_val < 0:
-        # Counting Sort no soporta valores negativos
+    if min(arr) < 0:
+        # Counting Sort no soporta valores negativos: count[num] con num < 0 indexaría
+        # desde el final de la lista y el resultado quedaría desordenado.
+        # (sort_algorithms.adaptive los admite desplazando los valores por el mínimo.)
         raise ValueError("Counting Sort solo admite enteros no negativos.")
 
     # Crea un arreglo de conteo de tamaño (max_val + 1), inicializado en 0
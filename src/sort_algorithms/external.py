@@ -0,0 +1,208 @@
+import heapq                      # Mezcla de k tramos ordenados con un montículo
+import itertools                  # islice para repartir la salida en trozos
+import os                         # Rutas y borrado de los tramos temporales
+import shutil                     # Borrado del directorio temporal al terminar
+import tempfile                   # Directorio para los tramos que no caben en memoria
+from array import array           # Formato binario compacto de los tramos (int64)
+from typing import Iterable, Iterator, List
+from sort_algorithms.Sort import get_algorithms
+from instrumentacion.metricas import medir, contar
+
+# Memoria (bytes) que puede usar el ordenamiento externo por defecto
+MEMORIA_MAXIMA = 256 * 1024 * 1024
+
+# Bytes estimados por valor mientras se ordena un tramo en memoria: puntero de la lista
+# (8), objeto int (28) y el buffer auxiliar de los ordenamientos que no son in-place (8)
+BYTES_POR_VALOR = 44
+
+# Cantidad máxima de tramos que se mezclan a la vez. Si hay más, se hacen pasadas
+# intermedias que mezclan grupos de FAN_IN tramos en tramos más largos.
+FAN_IN = 64
+
+# Tope del buffer de lectura de cada tramo durante la mezcla
+MAX_BUFFER_TRAMO = 1024 * 1024
+
+# Cada valor se guarda en los tramos como entero con signo de 64 bits (orden nativo)
+TIPO_TRAMO = "q"
+
+# Valores por línea de escritura al guardar la salida ordenada
+TAM_ESCRITURA = 65536
+
+
+def escribir_tramo(valores, dir_temporal: str, numero: int) -> str:
+    """
+    Guarda una secuencia ordenada (lista o arreglo de NumPy) como tramo binario int64.
+    Retorna la ruta del archivo.
+    """
+    path = os.path.join(dir_temporal, f"tramo_{numero:06d}.bin")
+    with open(path, "wb") as f:
+        if hasattr(valores, "tofile"):
+            # Arreglo de NumPy (backend "numpy"): se escribe sin pasar por objetos de Python
+            valores.astype("int64", copy=False).tofile(f)
+        else:
+            array(TIPO_TRAMO, valores).tofile(f)
+    return path
+
+
+def leer_tramo(path: str, tam_buffer: int) -> Iterator[int]:
+    """
+    Recorre un tramo binario valor a valor, leyendo `tam_buffer` bytes por vez.
+    """
+    with open(path, "rb") as f:
+        while True:
+            datos = f.read(tam_buffer)
+            if not datos:
+                return
+            bloque = array(TIPO_TRAMO)
+            bloque.frombytes(datos)
+            yield from bloque
+
+
+def _generar_tramos(
+    bloques: Iterable[Iterable[int]],
+    func,
+    valores_por_tramo: int,
+    dir_temporal: str
+) -> List[str]:
+    """
+    Fase 1: junta los bloques de entrada en tramos de `valores_por_tramo` valores,
+    ordena cada tramo en memoria con `func` y lo vuelca a disco.
+    Retorna las rutas de los tramos, en orden de creación.
+    """
+    rutas: List[str] = []
+    pendiente: List[int] = []
+
+    def volcar(tramo: List[int]) -> None:
+        rutas.append(escribir_tramo(func(tramo), dir_temporal, len(rutas)))
+        contar("sort/externo.bytes_tramos", os.path.getsize(rutas[-1]))
+
+    for bloque in bloques:
+        pendiente.extend(bloque)
+        # Un bloque grande puede completar más de un tramo
+        while len(pendiente) >= valores_por_tramo:
+            tramo = pendiente[:valores_por_tramo]
+            del pendiente[:valores_por_tramo]
+            volcar(tramo)
+    if pendiente:
+        volcar(pendiente)
+    return rutas
+
+
+def mezclar_en_tramo(rutas: List[str], dir_temporal: str, numero: int, tam_buffer: int, borrar: bool = True) -> str:
+    """
+    Mezcla varios tramos en uno nuevo (pasada intermedia) y, si `borrar` es True,
+    borra los de entrada.
+    """
+    path = os.path.join(dir_temporal, f"mezcla_{numero:06d}.bin")
+    mezcla = heapq.merge(*(leer_tramo(ruta, tam_buffer) for ruta in rutas))
+    with open(path, "wb") as f:
+        while True:
+            bloque = array(TIPO_TRAMO, itertools.islice(mezcla, tam_buffer // 8))
+            if not bloque:
+                break
+            bloque.tofile(f)
+    if borrar:
+        for ruta in rutas:
+            os.remove(ruta)
+    return path
+
+
+def external_sort(
+    bloques: Iterable[Iterable[int]],
+    algoritmo: str = "Adaptativo",
+    backend: str = "adaptativo",
+    memoria_bytes: int = MEMORIA_MAXIMA,
+    fan_in: int = FAN_IN,
+    dir_temporal: str | None = None
+) -> Iterator[int]:
+    """
+    Ordenamiento externo: ordena datos que no caben en memoria y entrega el resultado
+    ordenado por streaming, sin tener nunca la lista completa.
+    1. Los bloques de entrada se juntan en tramos que caben en `memoria_bytes`; cada tramo
+       se ordena con un algoritmo existente (Sort.backends[backend][algoritmo]) y se
+       guarda en un archivo temporal como int64 binario.
+    2. Mientras haya más de `fan_in` tramos, se mezclan de a `fan_in` en tramos más largos.
+    3. Los tramos restantes se mezclan con un montículo (heapq.merge) y se entregan valor
+       a valor. Los archivos temporales se borran al terminar (o si se deja de consumir).
+    Cada fase se mide por separado ("sort/externo/tramos", "sort/externo/pasadas" y
+    "sort/externo/mezcla", esta última por trozos de TAM_ESCRITURA valores): medir cada
+    valor entregado costaría más que la propia mezcla.
+
+    Parámetros:
+    - bloques: Iterable de bloques de enteros (p.ej. iter_csv_cantidad o iter_json_cantidad).
+    - algoritmo / backend: Algoritmo que ordena cada tramo en memoria.
+    - memoria_bytes: Memoria aproximada disponible para un tramo (ver BYTES_POR_VALOR).
+    - fan_in: Cantidad máxima de tramos que se mezclan a la vez (al menos 2).
+    - dir_temporal: Directorio donde crear los tramos (por defecto, el de tempfile).
+
+    Retorno:
+    - Generador de enteros en orden ascendente.
+    """
+    if fan_in < 2:
+        raise ValueError(f"fan_in debe ser al menos 2, no {fan_in}.")
+    disponibles = get_algorithms(backend)
+    if algoritmo not in disponibles:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo!r}. Opciones: {list(disponibles)}")
+    func = disponibles[algoritmo]
+    valores_por_tramo = max(1, memoria_bytes // BYTES_POR_VALOR)
+    # Durante la mezcla la memoria se reparte entre los buffers de lectura de cada tramo
+    tam_buffer = max(8, min(MAX_BUFFER_TRAMO, memoria_bytes // (fan_in + 1)) // 8 * 8)
+
+    directorio = tempfile.mkdtemp(prefix="ordenamiento_externo_", dir=dir_temporal)
+    try:
+        # 1. Tramos ordenados en memoria y volcados a disco
+        with medir("sort/externo/tramos"):
+            rutas = _generar_tramos(bloques, func, valores_por_tramo, directorio)
+        contar("sort/externo.tramos", len(rutas))
+
+        # 2. Pasadas intermedias hasta que queden a lo sumo fan_in tramos
+        mezclas = 0
+        while len(rutas) > fan_in:
+            contar("sort/externo.pasadas")
+            nuevas = []
+            with medir("sort/externo/pasadas"):
+                for i in range(0, len(rutas), fan_in):
+                    nuevas.append(mezclar_en_tramo(rutas[i:i + fan_in], directorio, mezclas, tam_buffer))
+                    mezclas += 1
+            rutas = nuevas
+
+        # 3. Mezcla final, entregada por streaming (se mide por trozos, no por valor)
+        mezcla = heapq.merge(*(leer_tramo(ruta, tam_buffer) for ruta in rutas))
+        medir_mezcla = medir("sort/externo/mezcla")
+        while True:
+            with medir_mezcla:
+                trozo = list(itertools.islice(mezcla, TAM_ESCRITURA))
+            if not trozo:
+                break
+            yield from trozo
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def guardar_ordenados(valores: Iterable[int], path: str, columna: str = "cantidad_ordenada") -> int:
+    """
+    Escribe una secuencia ordenada en disco a medida que llega (sin juntarla en una lista):
+    - ".json": un arreglo JSON, igual que json.dump(lista).
+    - cualquier otra extensión: CSV de una columna con encabezado `columna`,
+      igual que DataFrame.to_csv(index=False).
+
+    Retorno:
+    - Número de valores escritos.
+    """
+    iterador = iter(valores)
+    es_json = path.endswith(".json")
+    escritos = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[" if es_json else f"{columna}\n")
+        while True:
+            trozo = list(itertools.islice(iterador, TAM_ESCRITURA))
+            if not trozo:
+                break
+            if es_json:
+                f.write((", " if escritos else "") + ", ".join(map(str, trozo)))
+            else:
+                f.write("\n".join(map(str, trozo)) + "\n")
+            escritos += len(trozo)
+        if es_json:
+            f.write("]")
+    return escritos
@@ -0,0 +1,17 @@
+def insertion_sort_range(arr: list[int], lo: int, hi: int) -> None:
+    """
+    Ordena por inserción, en su lugar, el tramo arr[lo..hi] (ambos extremos incluidos).
+    Se usa como caso base de los algoritmos in-place: para tramos cortos es más
+    rápido que seguir particionando o combinando.
+    - arr: lista de enteros (se modifica directamente).
+    - lo:  índice inicial del tramo.
+    - hi:  índice final del tramo.
+    """
+    for i in range(lo + 1, hi + 1):
+        actual = arr[i]
+        j = i - 1
+        # Desplazamos a la derecha los elementos mayores que 'actual'
+        while j >= lo and arr[j] > actual:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = actual
@@ -1,3 +1,6 @@
+from sort_algorithms.insertionsort import insertion_sort_range  # Caso base de la versión bottom-up
+
+
 def merge_sort(arr: list[int]) -> list[int]:
     """
     Implementa Merge Sort de manera recursiva.
@@ -42,4 +45,67 @@ def _merge(left: list[int], right: list[int]) -> list[int]:
     result.extend(left[i:])
     # Si quedaron elementos en 'right', se agregan al final
     result.extend(right[j:])
-    return result
\ No newline at end of file
+    return result
+
+# Tamaño de los tramos iniciales, que se ordenan por inserción antes de combinar
+CORTE_INSERCION = 16
+
+
+def merge_sort_inplace(arr: list[int]) -> list[int]:
+    """
+    Implementa Merge Sort de abajo hacia arriba (bottom-up), sin recursión.
+    - Primero ordena por inserción tramos de CORTE_INSERCION elementos.
+    - Luego combina tramos vecinos duplicando el ancho en cada pasada, alternando
+      entre `arr` y un único buffer del mismo tamaño reservado al inicio.
+    - No copia mitades ni agrega elementos uno a uno: escribe por índice.
+    Modifica `arr` y la retorna ordenada.
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    # 1. Ordenamos por inserción cada tramo inicial
+    for lo in range(0, n, CORTE_INSERCION):
+        insertion_sort_range(arr, lo, min(lo + CORTE_INSERCION, n) - 1)
+
+    # 2. Combinamos tramos alternando entre los dos buffers
+    origen = arr
+    destino = [0] * n  # Único buffer auxiliar, reservado una sola vez
+    ancho = CORTE_INSERCION
+    while ancho < n:
+        for lo in range(0, n, 2 * ancho):
+            mid = min(lo + ancho, n)
+            hi = min(lo + 2 * ancho, n)
+            _merge_into(origen, destino, lo, mid, hi)
+        # El destino de esta pasada es el origen de la siguiente
+        origen, destino = destino, origen
+        ancho *= 2
+
+    # 3. Si el resultado quedó en el buffer auxiliar, lo copiamos de vuelta a 'arr'
+    if origen is not arr:
+        arr[:] = origen
+    return arr
+
+
+def _merge_into(src: list[int], dst: list[int], lo: int, mid: int, hi: int) -> None:
+    """
+    Función auxiliar para merge_sort_inplace: combina los tramos ordenados
+    src[lo:mid] y src[mid:hi] escribiendo el resultado en dst[lo:hi].
+    """
+    i, j, k = lo, mid, lo
+
+    # Mientras haya elementos en ambos tramos, copia el menor (<= mantiene la estabilidad)
+    while i < mid and j < hi:
+        if src[i] <= src[j]:
+            dst[k] = src[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            j += 1
+        k += 1
+
+    # Copiamos lo que quede de cualquiera de los dos tramos
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
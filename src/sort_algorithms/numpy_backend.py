@@ -0,0 +1,167 @@
+import numpy as np  # Para operar sobre arreglos completos en lugar de elemento a elemento
+
+# Tamaño de bloque para los pasos por bloques: por debajo de este tamaño un segmento
+# se ordena directamente con np.sort, que ya es código compilado.
+TAM_BLOQUE = 4096
+
+# Radix Sort procesa un byte por pasada (base 256) en lugar de un dígito decimal
+BITS_DIGITO = 8
+BASE_RADIX = 1 << BITS_DIGITO
+
+
+def _como_arreglo(arr) -> np.ndarray:
+    """
+    Convierte `arr` (lista de Python o arreglo de NumPy) en un arreglo de enteros.
+    Una lista vacía se convierte en un arreglo int64 vacío.
+    """
+    a = np.asarray(arr)
+    if a.dtype.kind not in "iu":
+        a = a.astype(np.int64)
+    return a
+
+
+def counting_sort_np(arr) -> np.ndarray:
+    """
+    Counting Sort vectorizado para enteros no negativos.
+    - Cuenta las apariciones de cada valor con np.bincount y reconstruye
+      la salida con np.repeat, sin recorrer los elementos en Python.
+    Retorna un arreglo de NumPy; `.tolist()` coincide con counting_sort().
+    """
+    a = _como_arreglo(arr)
+    if a.size == 0:
+        return a.copy()
+
+    # Counting Sort no soporta valores negativos
+    if a.min() < 0:
+        raise ValueError("Counting Sort solo admite enteros no negativos.")
+
+    # conteo[v] = número de veces que aparece el valor v
+    conteo = np.bincount(a)
+    # Repetimos cada valor tantas veces como apareció
+    return np.repeat(np.arange(conteo.size, dtype=a.dtype), conteo)
+
+
+def radix_sort_np(arr) -> np.ndarray:
+    """
+    Radix Sort LSD vectorizado para enteros no negativos.
+    - En cada pasada extrae un dígito (un byte) de todos los elementos a la vez
+      y cuenta los dígitos con np.bincount para saltar las pasadas que no reparten
+      los datos en más de un balde.
+    - La redistribución estable se hace con argsort(kind="stable") sobre los dígitos
+      de 8 bits, que NumPy resuelve internamente con un counting sort lineal.
+    Retorna un arreglo de NumPy; `.tolist()` coincide con radix_sort().
+    """
+    a = _como_arreglo(arr)
+    if a.size == 0:
+        return a.copy()
+
+    if a.min() < 0:
+        # La versión vectorizada no intenta ordenar negativos
+        raise ValueError("Radix Sort solo admite enteros no negativos.")
+
+    data = a.copy()
+    max_val = int(data.max())
+    desplazamiento = 0
+
+    # Repetimos mientras queden dígitos en el número máximo
+    while max_val >> desplazamiento > 0:
+        # 1. Extraemos el dígito actual de todos los elementos
+        digitos = ((data >> desplazamiento) & (BASE_RADIX - 1)).astype(np.uint8)
+
+        # 2. Contamos cuántos elementos caen en cada balde
+        conteo = np.bincount(digitos, minlength=BASE_RADIX)
+
+        # 3. Si todos los elementos caen en un solo balde, la pasada no cambia nada;
+        #    si no, los redistribuimos de forma estable según el dígito
+        if conteo.max() < data.size:
+            data = data[np.argsort(digitos, kind="stable")]
+
+        desplazamiento += BITS_DIGITO
+
+    return data
+
+
+def merge_sort_np(arr) -> np.ndarray:
+    """
+    Merge Sort por bloques.
+    - Ordena bloques de TAM_BLOQUE elementos y luego los combina de abajo hacia arriba,
+      duplicando el ancho en cada pasada y alternando entre dos arreglos.
+    - Cada combinación es vectorizada: la posición final de cada elemento se calcula
+      con np.searchsorted sobre la otra mitad.
+    Retorna un arreglo de NumPy; `.tolist()` coincide con merge_sort().
+    """
+    data = _como_arreglo(arr).copy()
+    n = data.size
+    if n <= 1:
+        return data
+
+    # 1. Ordenamos cada bloque de forma independiente
+    for inicio in range(0, n, TAM_BLOQUE):
+        data[inicio:inicio + TAM_BLOQUE].sort(kind="stable")
+
+    # 2. Combinamos bloques vecinos duplicando el ancho en cada pasada
+    buffer = np.empty_like(data)
+    ancho = TAM_BLOQUE
+    while ancho < n:
+        for inicio in range(0, n, 2 * ancho):
+            medio = min(inicio + ancho, n)
+            fin = min(inicio + 2 * ancho, n)
+            _merge_np(data[inicio:medio], data[medio:fin], buffer[inicio:fin])
+        # El resultado de esta pasada es la entrada de la siguiente
+        data, buffer = buffer, data
+        ancho *= 2
+
+    return data
+
+
+def _merge_np(left: np.ndarray, right: np.ndarray, out: np.ndarray) -> None:
+    """
+    Función auxiliar para merge_sort_np: combina dos arreglos ordenados en `out`.
+    - Un elemento de `left` queda detrás de los de `right` estrictamente menores.
+    - Un elemento de `right` queda detrás de los de `left` menores o iguales,
+      lo que mantiene la estabilidad de la combinación.
+    """
+    pos_left = np.arange(left.size) + np.searchsorted(right, left, side="left")
+    pos_right = np.arange(right.size) + np.searchsorted(left, right, side="right")
+    out[pos_left] = left
+    out[pos_right] = right
+
+
+def quick_sort_np(arr) -> np.ndarray:
+    """
+    Quick Sort con partición vectorizada en tres vías.
+    - Cada segmento se separa en (< pivote), (== pivote) y (> pivote) con máscaras
+      booleanas y se reescribe en su lugar dentro del mismo arreglo.
+    - Usa una pila explícita en lugar de recursión y ordena con np.sort los segmentos
+      menores que TAM_BLOQUE.
+    Retorna un arreglo de NumPy; `.tolist()` coincide con quick_sort().
+    """
+    data = _como_arreglo(arr).copy()
+    pendientes = [(0, data.size)]
+
+    while pendientes:
+        lo, hi = pendientes.pop()
+
+        # Segmentos pequeños: se ordenan directamente
+        if hi - lo <= TAM_BLOQUE:
+            data[lo:hi].sort()
+            continue
+
+        seg = data[lo:hi]
+        # Pivote: mediana entre el primero, el del medio y el último
+        pivot = sorted((seg[0], seg[seg.size // 2], seg[-1]))[1]
+
+        # Partición en tres vías (las máscaras devuelven copias, así que es seguro reescribir seg)
+        left = seg[seg < pivot]
+        right = seg[seg > pivot]
+        n_middle = seg.size - left.size - right.size
+
+        seg[:left.size] = left
+        seg[left.size:left.size + n_middle] = pivot
+        seg[left.size + n_middle:] = right
+
+        # Los iguales al pivote ya están en su lugar; solo quedan 'left' y 'right'
+        pendientes.append((lo, lo + left.size))
+        pendientes.append((hi - right.size, hi))
+
+    return data
@@ -0,0 +1,295 @@
+import heapq                      # Mezcla de los trozos ordenados
+import os                         # cpu_count para el número de procesos
+import random                     # Muestra de divisores del sample sort
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter   # Histograma de cada trozo (contado en C)
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple
+from threading_custom.process_ed2 import (
+    crear_memoria_compartida, crear_memoria_salida, leer_memoria_compartida,
+    TIPO_ENTERO, BYTES_ENTERO
+)
+
+# Con menos elementos que esto, crear procesos cuesta más de lo que ahorra:
+# se ordena en el proceso actual con el algoritmo secuencial
+UMBRAL_PARALELO = 50_000
+
+# Elementos de la muestra por proceso para elegir los divisores del sample sort
+SOBREMUESTREO = 32
+
+# Algoritmo secuencial (de Sort.algorithms) con que cada proceso ordena su trozo
+ALGORITMO_LOCAL = "MergeSortInPlace"
+
+
+def _procesos(procesos: int | None) -> int:
+    """
+    Cantidad de procesos a usar: la pedida o, por defecto, una por núcleo.
+    """
+    return max(1, procesos or os.cpu_count() or 1)
+
+
+def _trozos(n: int, partes: int) -> List[Tuple[int, int]]:
+    """
+    Divide [0, n) en `partes` rangos contiguos de tamaño parecido.
+    """
+    return [(n * i // partes, n * (i + 1) // partes) for i in range(partes)]
+
+
+def _leer_rango(shm: shared_memory.SharedMemory, inicio: int, fin: int) -> List[int]:
+    with shm.buf[inicio * BYTES_ENTERO:fin * BYTES_ENTERO].cast(TIPO_ENTERO) as vista:
+        return vista.tolist()
+
+
+def _escribir_rango(shm: shared_memory.SharedMemory, inicio: int, valores: array) -> None:
+    fin = inicio + len(valores)
+    with shm.buf[inicio * BYTES_ENTERO:fin * BYTES_ENTERO].cast(TIPO_ENTERO) as vista:
+        vista[:] = valores
+
+
+def _limites_cubetas(ordenada, divisores: List[int]) -> List[int]:
+    """
+    Posiciones de `ordenada` donde termina cada cubeta (una por divisor).
+    Si un valor aparece repetido como divisor (muchos valores iguales, como en CANTIDAD),
+    sus apariciones se reparten en partes iguales entre esas cubetas en lugar de ir
+    todas a la misma.
+    """
+    limites = []
+    j = 0
+    while j < len(divisores):
+        valor = divisores[j]
+        repetidos = 1
+        while j + repetidos < len(divisores) and divisores[j + repetidos] == valor:
+            repetidos += 1
+        bajo, alto = bisect_left(ordenada, valor), bisect_right(ordenada, valor)
+        for t in range(1, repetidos + 1):
+            limites.append(bajo + (alto - bajo) * t // repetidos)
+        j += repetidos
+    return limites
+
+
+def _ordenar_trozo(
+    nombre_entrada: str,
+    nombre_trabajo: str,
+    inicio: int,
+    fin: int,
+    divisores: List[int] | None,
+    algoritmo: str
+) -> List[int] | None:
+    """
+    Trabajador (fase 1): ordena el trozo [inicio, fin) de la entrada con el algoritmo
+    secuencial y lo deja en el bloque de trabajo, en la misma posición.
+    Si recibe `divisores`, retorna además dónde termina cada cubeta dentro del trozo.
+    """
+    from sort_algorithms.Sort import get_algorithms
+
+    shm_entrada = shared_memory.SharedMemory(name=nombre_entrada)
+    shm_trabajo = shared_memory.SharedMemory(name=nombre_trabajo)
+    try:
+        ordenado = array(TIPO_ENTERO, get_algorithms("python")[algoritmo](_leer_rango(shm_entrada, inicio, fin)))
+        _escribir_rango(shm_trabajo, inicio, ordenado)
+    finally:
+        shm_entrada.close()
+        shm_trabajo.close()
+    return _limites_cubetas(ordenado, divisores) if divisores is not None else None
+
+
+def _mezclar_tramos(
+    nombre_origen: str,
+    nombre_destino: str,
+    tramos: List[Tuple[int, int]],
+    destino: int
+) -> None:
+    """
+    Trabajador (fase 2): mezcla los tramos ordenados [inicio, fin) del bloque de origen y
+    escribe el resultado a partir de la posición `destino` del bloque de destino.
+    """
+    shm_origen = shared_memory.SharedMemory(name=nombre_origen)
+    shm_destino = shared_memory.SharedMemory(name=nombre_destino)
+    try:
+        listas = [_leer_rango(shm_origen, inicio, fin) for inicio, fin in tramos]
+        _escribir_rango(shm_destino, destino, array(TIPO_ENTERO, heapq.merge(*listas)))
+    finally:
+        shm_origen.close()
+        shm_destino.close()
+
+
+def _rellenar_valores(nombre_salida: str, cuentas: List[Tuple[int, int]], destino: int) -> None:
+    """
+    Trabajador de counting sort (fase 2): escribe cada valor repetido tantas veces como
+    indica su cuenta, a partir de la posición `destino` de la salida.
+    """
+    shm_salida = shared_memory.SharedMemory(name=nombre_salida)
+    try:
+        posicion = destino
+        for valor, cuenta in cuentas:
+            _escribir_rango(shm_salida, posicion, array(TIPO_ENTERO, [valor]) * cuenta)
+            posicion += cuenta
+    finally:
+        shm_salida.close()
+
+
+def _histograma(nombre_entrada: str, inicio: int, fin: int) -> Counter:
+    """
+    Trabajador de counting sort (fase 1): cuántas veces aparece cada valor en el trozo.
+    """
+    shm_entrada = shared_memory.SharedMemory(name=nombre_entrada)
+    try:
+        return Counter(_leer_rango(shm_entrada, inicio, fin))
+    finally:
+        shm_entrada.close()
+
+
+def sample_sort_paralelo(arr: list[int], procesos: int | None = None, algoritmo: str = ALGORITMO_LOCAL) -> list[int]:
+    """
+    Sample sort en varios procesos (variante PSRS: ordenar por muestreo):
+    1. Se eligen procesos - 1 divisores a partir de una muestra aleatoria de la entrada.
+    2. Cada proceso ordena un trozo contiguo de la entrada con `algoritmo` y calcula dónde
+       caen los divisores dentro de su trozo.
+    3. El proceso b junta la cubeta b (valores entre los divisores b - 1 y b) de todos los
+       trozos, la mezcla y la escribe en su posición final: las cubetas quedan concatenadas.
+    La entrada y la salida viajan por memoria compartida, no por pickle.
+    Retorna una lista nueva ordenada.
+    """
+    p = _procesos(procesos)
+    if p == 1 or len(arr) < UMBRAL_PARALELO:
+        from sort_algorithms.Sort import get_algorithms
+        return get_algorithms("python")[algoritmo](list(arr))
+
+    shm_entrada, n = crear_memoria_compartida(arr)
+    shm_trabajo = crear_memoria_salida(n)
+    shm_salida = crear_memoria_salida(n)
+    try:
+        # 1. Divisores: p - 1 cuantiles regulares de la muestra ordenada
+        rng = random.Random(n)
+        muestra = sorted(arr[i] for i in rng.sample(range(n), min(n, p * SOBREMUESTREO)))
+        divisores = [muestra[len(muestra) * k // p] for k in range(1, p)]
+
+        trozos = _trozos(n, p)
+        with ProcessPoolExecutor(max_workers=p) as pool:
+            # 2. Cada trozo se ordena en paralelo y devuelve sus límites de cubeta
+            futuros = [
+                pool.submit(_ordenar_trozo, shm_entrada.name, shm_trabajo.name, inicio, fin, divisores, algoritmo)
+                for inicio, fin in trozos
+            ]
+            limites = [[0, *futuro.result(), fin - inicio] for futuro, (inicio, fin) in zip(futuros, trozos)]
+
+            # 3. Cada cubeta se mezcla en paralelo en su lugar de la salida
+            futuros = []
+            destino = 0
+            for b in range(p):
+                tramos = [(inicio + lim[b], inicio + lim[b + 1]) for lim, (inicio, _) in zip(limites, trozos)]
+                futuros.append(pool.submit(_mezclar_tramos, shm_trabajo.name, shm_salida.name, tramos, destino))
+                destino += sum(fin - inicio for inicio, fin in tramos)
+            for futuro in futuros:
+                futuro.result()
+
+        return leer_memoria_compartida(shm_salida, n)
+    finally:
+        for shm in (shm_entrada, shm_trabajo, shm_salida):
+            shm.close()
+            shm.unlink()
+
+
+def merge_sort_paralelo(arr: list[int], procesos: int | None = None, algoritmo: str = ALGORITMO_LOCAL) -> list[int]:
+    """
+    Merge sort en varios procesos:
+    1. Cada proceso ordena un trozo contiguo de la entrada con `algoritmo`.
+    2. Los tramos ordenados se mezclan de a pares en forma de árbol: en cada nivel hay
+       la mitad de mezclas que en el anterior, cada una en su propio proceso, alternando
+       entre dos bloques de memoria compartida.
+    La última mezcla (de dos mitades) la hace un solo proceso.
+    Retorna una lista nueva ordenada.
+    """
+    p = _procesos(procesos)
+    if p == 1 or len(arr) < UMBRAL_PARALELO:
+        from sort_algorithms.Sort import get_algorithms
+        return get_algorithms("python")[algoritmo](list(arr))
+
+    shm_entrada, n = crear_memoria_compartida(arr)
+    shm_a = crear_memoria_salida(n)
+    shm_b = crear_memoria_salida(n)
+    try:
+        tramos = _trozos(n, p)
+        with ProcessPoolExecutor(max_workers=p) as pool:
+            # 1. Tramos ordenados en el bloque A
+            for futuro in [
+                pool.submit(_ordenar_trozo, shm_entrada.name, shm_a.name, inicio, fin, None, algoritmo)
+                for inicio, fin in tramos
+            ]:
+                futuro.result()
+
+            # 2. Mezcla por niveles: A → B → A ... hasta que quede un único tramo
+            origen, destino = shm_a, shm_b
+            while len(tramos) > 1:
+                futuros = []
+                siguientes = []
+                for i in range(0, len(tramos), 2):
+                    pares = tramos[i:i + 2]
+                    inicio, fin = pares[0][0], pares[-1][1]
+                    futuros.append(pool.submit(_mezclar_tramos, origen.name, destino.name, pares, inicio))
+                    siguientes.append((inicio, fin))
+                for futuro in futuros:
+                    futuro.result()
+                tramos = siguientes
+                origen, destino = destino, origen
+
+        return leer_memoria_compartida(origen, n)
+    finally:
+        for shm in (shm_entrada, shm_a, shm_b):
+            shm.close()
+            shm.unlink()
+
+
+def counting_sort_paralelo(arr: list[int], procesos: int | None = None) -> list[int]:
+    """
+    Counting sort en varios procesos:
+    1. Cada proceso cuenta las apariciones de cada valor en un trozo contiguo (histograma).
+    2. Los histogramas se suman (reducción) y se calcula en qué posición empieza cada valor.
+    3. Los valores se reparten entre los procesos de modo que a cada uno le toque una
+       cantidad parecida de posiciones; cada proceso escribe sus valores en la salida.
+    A diferencia de CountingSort, admite negativos y rangos amplios (el histograma solo
+    guarda los valores presentes); rinde con muchos valores repetidos, como CANTIDAD.
+    Retorna una lista nueva ordenada.
+    """
+    p = _procesos(procesos)
+    if p == 1 or len(arr) < UMBRAL_PARALELO:
+        cuentas = Counter(arr)
+        resultado = []
+        for valor in sorted(cuentas):
+            resultado.extend([valor] * cuentas[valor])
+        return resultado
+
+    shm_entrada, n = crear_memoria_compartida(arr)
+    shm_salida = crear_memoria_salida(n)
+    try:
+        with ProcessPoolExecutor(max_workers=p) as pool:
+            # 1. Histograma de cada trozo
+            futuros = [pool.submit(_histograma, shm_entrada.name, inicio, fin) for inicio, fin in _trozos(n, p)]
+
+            # 2. Reducción de los histogramas
+            total = Counter()
+            for futuro in futuros:
+                total.update(futuro.result())
+            cuentas = sorted(total.items())
+
+            # 3. Reparto de los valores en grupos de ~n / p posiciones y escritura paralela
+            futuros = []
+            grupo, inicio_grupo, posicion = [], 0, 0
+            for valor, cuenta in cuentas:
+                grupo.append((valor, cuenta))
+                posicion += cuenta
+                if posicion - inicio_grupo >= n / p:
+                    futuros.append(pool.submit(_rellenar_valores, shm_salida.name, grupo, inicio_grupo))
+                    grupo, inicio_grupo = [], posicion
+            if grupo:
+                futuros.append(pool.submit(_rellenar_valores, shm_salida.name, grupo, inicio_grupo))
+            for futuro in futuros:
+                futuro.result()
+
+        return leer_memoria_compartida(shm_salida, n)
+    finally:
+        for shm in (shm_entrada, shm_salida):
+            shm.close()
+            shm.unlink()
@@ -1,3 +1,7 @@
+from random import randint  # Posiciones de la muestra del pivote
+from sort_algorithms.insertionsort import insertion_sort_range  # Caso base de la versión in-place
+
+
 def quick_sort(arr: list[int]) -> list[int]:
     """
     Implementa Quick Sort de manera recursiva usando un pivote en el medio.
@@ -18,4 +22,68 @@ def quick_sort(arr: list[int]) -> list[int]:
     right = [x for x in arr if x > pivot]
 
     # Ordenamos recursivamente 'left' y 'right', luego concatenar
-    return quick_sort(left) + middle + quick_sort(right)
\ No newline at end of file
+    return quick_sort(left) + middle + quick_sort(right)
+
+# Por debajo de este tamaño los tramos se terminan con ordenamiento por inserción
+CORTE_INSERCION = 16
+
+
+def quick_sort_inplace(arr: list[int]) -> list[int]:
+    """
+    Implementa Quick Sort en su lugar, sin crear listas auxiliares.
+    - Pivote: mediana de tres elementos en posiciones al azar del tramo. Con posiciones
+      fijas (primero, medio y último), la partición deja el lado mayor en un orden que
+      vuelve a elegir malos pivotes y una entrada ya ordenada se acerca a O(n²).
+    - Partición en tres vías: (< pivote), (== pivote) y (> pivote), útil con muchos repetidos.
+    - Tramos de CORTE_INSERCION elementos o menos se ordenan por inserción.
+    - Usa una pila explícita en lugar de recursión: se apila el tramo más grande y se
+      continúa con el más pequeño, así la pila nunca supera log2(n) entradas.
+    Modifica `arr` y la retorna ordenada.
+    """
+    pila = [(0, len(arr) - 1)]
+
+    while pila:
+        lo, hi = pila.pop()
+
+        while hi - lo + 1 > CORTE_INSERCION:
+            # Elegimos el pivote como la mediana de tres elementos al azar
+            pivot = sorted((arr[randint(lo, hi)], arr[randint(lo, hi)], arr[randint(lo, hi)]))[1]
+
+            # Partimos el tramo: arr[lo:lt] < pivote, arr[lt:gt+1] == pivote, arr[gt+1:hi+1] > pivote
+            lt, gt = _particion_tres_vias(arr, lo, hi, pivot)
+
+            # Apilamos el lado más grande y seguimos iterando sobre el más pequeño
+            if lt - lo < hi - gt:
+                pila.append((gt + 1, hi))
+                hi = lt - 1
+            else:
+                pila.append((lo, lt - 1))
+                lo = gt + 1
+
+        # Tramo corto: inserción
+        insertion_sort_range(arr, lo, hi)
+
+    return arr
+
+
+def _particion_tres_vias(arr: list[int], lo: int, hi: int, pivot: int) -> tuple[int, int]:
+    """
+    Función auxiliar para quick_sort_inplace: partición de Dijkstra sobre arr[lo..hi].
+    Retorna (lt, gt), los límites del bloque de elementos iguales al pivote.
+    """
+    lt, i, gt = lo, lo, hi
+    while i <= gt:
+        x = arr[i]
+        if x < pivot:
+            # Menor: lo mandamos al bloque izquierdo
+            arr[lt], arr[i] = x, arr[lt]
+            lt += 1
+            i += 1
+        elif x > pivot:
+            # Mayor: lo mandamos al final y revisamos el elemento que llegó a 'i'
+            arr[i], arr[gt] = arr[gt], x
+            gt -= 1
+        else:
+            # Igual al pivote: se queda en el bloque central
+            i += 1
+    return lt, gt
@@ -10,6 +10,10 @@ def radix_sort(arr: list[int]) -> list[int]:
 
     # Encouentra el valor máximo para saber cuántas pasadas de dígitos hacer
     max_val = max(arr)
+    if min(arr) < 0:
+        # Con negativos, (a // exp) % 10 no es el dígito del número y el resultado
+        # quedaría desordenado. (sort_algorithms.adaptive los admite desplazando por el mínimo.)
+        raise ValueError("Radix Sort solo admite enteros no negativos.")
     exp = 1  # exponent (1 → dígito de las unidades, 10 → decenas, etc.)
     data = arr.copy()  # Copiar la lista original para no modificarla in situ
 
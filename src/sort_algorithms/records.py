@@ -0,0 +1,172 @@
+import numpy as np  # Columnas tipadas, claves codificadas y permutaciones
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+from database.sql_connection import COLUMNAS_VENTAS, TAM_LOTE
+from export.columnar_export import columna_tipada
+from instrumentacion.metricas import medir
+
+# Métodos para calcular la permutación:
+# - "radix":   Radix Sort LSD estable, un byte por pasada, sobre las claves codificadas.
+# - "lexsort": np.lexsort sobre las mismas claves (un ordenamiento por comparación en C).
+METODOS = ("radix", "lexsort")
+
+# Sentidos de orden aceptados en cada clave
+SENTIDOS = ("asc", "desc")
+
+# Radix Sort procesa un byte de la clave por pasada (base 256), como radix_sort_np
+BITS_DIGITO = 8
+BASE_RADIX = 1 << BITS_DIGITO
+
+# Bit de signo de un entero de 64 bits: al invertirlo, el orden de los enteros con signo
+# coincide con el de los mismos bits leídos como enteros sin signo
+SIGNO_64 = np.uint64(1 << 63)
+
+# Tipo: una clave es el nombre de la columna ("FECHA_VENTA") o (nombre, "asc" | "desc")
+Clave = str | Tuple[str, str]
+
+
+def columnas_de_lotes(lotes: Iterable[list[tuple]], columnas: Sequence[str] = COLUMNAS_VENTAS) -> Dict[str, np.ndarray]:
+    """
+    Transpone lotes de filas (p.ej. de iter_batches) a un arreglo tipado por columna,
+    con los mismos tipos que el formato columnar (ver columnar_export.TIPOS_COLUMNAS).
+    """
+    filas = [fila for lote in lotes for fila in lote]
+    if not filas:
+        return {columna: columna_tipada((), columna) for columna in columnas}
+    return {columna: columna_tipada(valores, columna) for columna, valores in zip(columnas, zip(*filas))}
+
+
+def codificar_clave(valores: np.ndarray, descendente: bool = False) -> np.ndarray:
+    """
+    Convierte una columna en enteros uint64 cuyo orden (como enteros sin signo) es el
+    mismo que el de los valores originales, para ordenar cualquier tipo con radix:
+    - enteros y fechas (datetime64): se invierte el bit de signo.
+    - flotantes (PRECIO_UNITARIO, DESCUENTO): bits IEEE 754; los negativos se invierten
+      completos y los positivos solo en el signo. NaN (NULL) queda al final.
+    - texto (FORMA_PAGO) y otros: código del valor en el diccionario ordenado de valores
+      distintos (np.unique), como una columna categórica.
+    Si `descendente` es True se invierten todos los bits de la clave.
+    """
+    valores = np.asarray(valores)
+    tipo = valores.dtype.kind
+    if tipo in "bu":
+        clave = valores.astype(np.uint64)
+    elif tipo in "imM":
+        clave = valores.astype(np.int64).view(np.uint64) ^ SIGNO_64
+    elif tipo == "f":
+        # + 0.0 convierte -0.0 en 0.0; todos los NaN pasan a ser el mismo NaN positivo
+        flotantes = valores.astype(np.float64) + 0.0
+        flotantes[np.isnan(flotantes)] = np.nan
+        bits = flotantes.view(np.uint64)
+        clave = np.where((bits & SIGNO_64) != 0, ~bits, bits | SIGNO_64)
+    else:
+        # Decimal y objetos mixtos se ordenan por su valor; el texto, por diccionario
+        _, clave = np.unique(valores, return_inverse=True)
+        clave = clave.astype(np.uint64).ravel()
+    return ~clave if descendente else clave
+
+
+def _normalizar_claves(claves: Sequence[Clave]) -> List[Tuple[str, bool]]:
+    """
+    Convierte cada clave en (columna, descendente) y valida el sentido.
+    """
+    normalizadas = []
+    for clave in claves:
+        columna, sentido = (clave, "asc") if isinstance(clave, str) else clave
+        if sentido not in SENTIDOS:
+            raise ValueError(f"Sentido desconocido para {columna!r}: {sentido!r}. Opciones: {SENTIDOS}")
+        normalizadas.append((columna, sentido == "desc"))
+    return normalizadas
+
+
+def _radix_permutacion(claves: List[np.ndarray], n: int) -> np.ndarray:
+    """
+    Radix Sort LSD estable sobre varias claves codificadas: empieza por la clave menos
+    importante y, dentro de cada una, por el byte menos significativo. Cada pasada reordena
+    la permutación de forma estable según un byte (argsort estable de uint8, que NumPy
+    resuelve con un counting sort lineal). Nunca se mueven las filas, solo los índices.
+    """
+    orden = np.arange(n, dtype=np.int64)
+    for clave in reversed(claves):
+        # Restar el mínimo deja en cero los bytes altos comunes a todas las filas: no se recorren
+        actual = clave[orden] - clave.min()
+        desplazamiento = 0
+        maximo = int(actual.max())
+        while maximo >> desplazamiento > 0:
+            digitos = ((actual >> np.uint64(desplazamiento)) & np.uint64(BASE_RADIX - 1)).astype(np.uint8)
+            # Si todas las filas tienen el mismo byte, la pasada no cambia nada
+            if np.bincount(digitos, minlength=BASE_RADIX).max() < n:
+                indices = np.argsort(digitos, kind="stable")
+                orden = orden[indices]
+                actual = actual[indices]
+            desplazamiento += BITS_DIGITO
+    return orden
+
+
+@medir("sort/registros")
+def ordenar_registros(
+    columnas: Dict[str, np.ndarray],
+    claves: Sequence[Clave],
+    metodo: str = "radix"
+) -> np.ndarray:
+    """
+    Calcula el orden de las filas de una tabla columnar según una clave compuesta, sin
+    mover las filas: retorna la permutación (índices) que las deja ordenadas.
+    El ordenamiento es estable: las filas con claves iguales conservan su orden original.
+
+    Parámetros:
+    - columnas: Diccionario {columna: arreglo} con la tabla (p.ej. de columnas_de_lotes
+      o de load_columnar_tabla); todas las columnas tienen el mismo largo.
+    - claves: Columnas de la clave, de la más importante a la menos importante; cada una
+      es un nombre o (nombre, "asc" | "desc"), p.ej.
+      ["FECHA_VENTA", "ID_CLIENTE", ("PRECIO_UNITARIO", "desc")].
+    - metodo: "radix" (LSD por bytes) o "lexsort" (np.lexsort).
+
+    Retorno:
+    - Arreglo int64 con los índices de las filas en orden.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"metodo debe ser uno de {METODOS}, no {metodo!r}.")
+    normalizadas = _normalizar_claves(claves)
+    if not normalizadas:
+        raise ValueError("Se necesita al menos una clave para ordenar.")
+    for columna, _ in normalizadas:
+        if columna not in columnas:
+            raise KeyError(f"La columna {columna!r} no existe. Opciones: {list(columnas)}")
+
+    n = len(columnas[normalizadas[0][0]])
+    codificadas = [codificar_clave(columnas[columna], descendente) for columna, descendente in normalizadas]
+    if n == 0:
+        return np.arange(0, dtype=np.int64)
+    if metodo == "lexsort":
+        # np.lexsort toma la clave principal al final
+        return np.lexsort(codificadas[::-1]).astype(np.int64, copy=False)
+    return _radix_permutacion(codificadas, n)
+
+
+def _a_python(valores: np.ndarray) -> list:
+    """
+    Convierte un trozo de columna en valores de Python como los que entrega MySQL:
+    datetime64 → datetime.date, NaN → None.
+    """
+    lista = valores.tolist()
+    if valores.dtype.kind == "f":
+        return [None if v != v else v for v in lista]  # v != v solo es cierto para NaN
+    return lista
+
+
+def iter_filas_ordenadas(
+    columnas: Dict[str, np.ndarray],
+    orden: np.ndarray,
+    nombres: Sequence[str] = COLUMNAS_VENTAS,
+    batch_size: int = TAM_LOTE
+) -> Iterator[list[tuple]]:
+    """
+    Aplica la permutación `orden` de forma perezosa: entrega lotes de tuplas (como
+    iter_batches) armando cada lote recién cuando se pide, con las columnas `nombres`.
+    Así el resultado puede ir directo a escribir_csv, escribir_json o escribir_columnar
+    sin construir una copia ordenada de la tabla completa.
+    """
+    for inicio in range(0, len(orden), batch_size):
+        indices = orden[inicio:inicio + batch_size]
+        trozos = [_a_python(columnas[nombre][indices]) for nombre in nombres]
+        yield list(zip(*trozos))
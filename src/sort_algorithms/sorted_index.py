@@ -0,0 +1,268 @@
+import heapq                      # Recorrido ordenado de todos los tramos a la vez
+import json                       # Metadatos del índice (marca de ID_VENTA y tramos)
+import math                       # ceil para el percentil
+import mmap                       # Los tramos se consultan mapeados, sin cargarlos
+import os                         # Rutas, reemplazo atómico y borrado de tramos
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List
+from sort_algorithms.Sort import get_algorithms
+from sort_algorithms.external import escribir_tramo, leer_tramo, mezclar_en_tramo, TIPO_TRAMO, MAX_BUFFER_TRAMO
+from database.sql_connection import get_connection, iter_batches, TAM_LOTE
+from instrumentacion.metricas import medir, contar
+
+# Carpeta donde se guarda el índice por defecto
+DIR_INDICE = ".indice_cantidad"
+
+# Archivo con los metadatos dentro de la carpeta del índice
+META = "meta.json"
+
+# Valores por tramo al absorber filas nuevas: cada tramo se ordena en memoria
+TAM_TRAMO = 1_000_000
+
+# Compactación (método logarítmico): el tramo más nuevo se mezcla con el anterior
+# mientras el anterior no sea más de FACTOR_COMPACTACION veces más grande.
+# Así quedan O(log n) tramos de tamaños crecientes.
+FACTOR_COMPACTACION = 2
+
+# Consulta de las filas nuevas: solo las que superan la marca de ID_VENTA
+CONSULTA_NUEVAS = "SELECT ID_VENTA, {columna} FROM UN.VENTAS WHERE ID_VENTA > %s ORDER BY ID_VENTA"
+
+
+class IndiceOrdenado:
+    """
+    Índice ordenado y persistente de una columna entera de UN.VENTAS (por defecto CANTIDAD),
+    guardado como una estructura de tramos ordenados (tipo LSM) en `directorio`:
+    - Cada actualización agrega solo las filas con ID_VENTA mayor que la marca guardada,
+      ordenadas con un algoritmo existente, como tramos nuevos (int64 binario).
+    - Los tramos se compactan con una mezcla (heapq.merge) para que queden pocos.
+    - Las consultas (posición, percentil, conteo y valores de un rango) se responden con
+      búsqueda binaria sobre los tramos mapeados en memoria, sin volver a ordenar.
+    Los metadatos se reemplazan de forma atómica al final de cada actualización: si algo
+    falla a mitad de camino, el índice anterior sigue siendo válido.
+    """
+
+    def __init__(self, directorio: str = DIR_INDICE, columna: str = "CANTIDAD", algoritmo: str = "Adaptativo",
+                 backend: str = "adaptativo"):
+        self.directorio = directorio
+        self.columna = columna
+        self._ordenar = get_algorithms(backend)[algoritmo]
+        os.makedirs(directorio, exist_ok=True)
+        self._meta = self._leer_meta()
+        self._vistas: dict[str, tuple[mmap.mmap, memoryview]] = {}
+
+    # --- Persistencia -------------------------------------------------------
+
+    def _leer_meta(self) -> dict:
+        try:
+            with open(os.path.join(self.directorio, META), encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return {"columna": self.columna, "marca_id": 0, "siguiente": 0, "tramos": []}
+        if meta["columna"] != self.columna:
+            raise ValueError(f"El índice de {self.directorio!r} es de la columna {meta['columna']!r}, "
+                             f"no de {self.columna!r}.")
+        return meta
+
+    def _guardar_meta(self) -> None:
+        temporal = os.path.join(self.directorio, META + ".tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self._meta, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, os.path.join(self.directorio, META))
+
+    def _numero(self) -> int:
+        """
+        Número único para el nombre del próximo archivo de tramo.
+        """
+        numero = self._meta["siguiente"]
+        self._meta["siguiente"] += 1
+        return numero
+
+    def _ruta(self, tramo: dict) -> str:
+        return os.path.join(self.directorio, tramo["archivo"])
+
+    def _vista(self, tramo: dict) -> memoryview:
+        """
+        Vista de solo lectura (int64) del tramo, mapeada en memoria la primera vez.
+        """
+        if tramo["archivo"] not in self._vistas:
+            with open(self._ruta(tramo), "rb") as f:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._vistas[tramo["archivo"]] = (mapa, memoryview(mapa).cast(TIPO_TRAMO))
+        return self._vistas[tramo["archivo"]][1]
+
+    def cerrar(self) -> None:
+        """
+        Libera los tramos mapeados en memoria.
+        """
+        for mapa, vista in self._vistas.values():
+            vista.release()
+            mapa.close()
+        self._vistas.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+    # --- Actualización -------------------------------------------------------
+
+    def _compactar(self) -> None:
+        """
+        Mezcla el tramo más nuevo con el anterior mientras sean de tamaño parecido.
+        Los tramos mezclados no se borran aquí: siguen siendo los del índice publicado
+        hasta que se guarden los metadatos nuevos (ver _borrar_huerfanos).
+        """
+        tramos = self._meta["tramos"]
+        while len(tramos) >= 2 and tramos[-2]["n"] <= FACTOR_COMPACTACION * tramos[-1]["n"]:
+            ultimos = tramos[-2:]
+            self.cerrar()
+            ruta = mezclar_en_tramo([self._ruta(t) for t in ultimos], self.directorio, self._numero(),
+                                    MAX_BUFFER_TRAMO, borrar=False)
+            tramos[-2:] = [{"archivo": os.path.basename(ruta), "n": sum(t["n"] for t in ultimos)}]
+            contar("indice/compactaciones")
+
+    @medir("indice/agregar")
+    def agregar(self, filas: Iterable[Iterable[tuple]]) -> int:
+        """
+        Absorbe lotes de filas (ID_VENTA, valor). Las filas con ID_VENTA menor o igual
+        que la marca ya están en el índice y se ignoran (dentro de una misma llamada se
+        supone que cada ID_VENTA aparece una sola vez). Retorna las filas agregadas.
+        """
+        marca = self._meta["marca_id"]
+        nueva_marca = marca
+        pendiente: List[int] = []
+        agregadas = 0
+
+        def volcar() -> None:
+            ruta = escribir_tramo(self._ordenar(pendiente), self.directorio, self._numero())
+            self._meta["tramos"].append({"archivo": os.path.basename(ruta), "n": len(pendiente)})
+            self._compactar()
+
+        # 1. Tramos ordenados de a TAM_TRAMO valores nuevos
+        for lote in filas:
+            for id_venta, valor in lote:
+                if id_venta > marca:
+                    pendiente.append(valor)
+                    nueva_marca = max(nueva_marca, id_venta)
+            if len(pendiente) >= TAM_TRAMO:
+                agregadas += len(pendiente)
+                volcar()
+                pendiente = []
+        if pendiente:
+            agregadas += len(pendiente)
+            volcar()
+
+        # 2. Recién ahora se publica la nueva marca: los tramos ya están escritos
+        self._meta["marca_id"] = nueva_marca
+        self._guardar_meta()
+        self._borrar_huerfanos()
+        contar("indice/filas", agregadas)
+        return agregadas
+
+    def _borrar_huerfanos(self) -> None:
+        """
+        Borra los archivos de tramo que ya no figuran en los metadatos (p.ej. de una
+        actualización que se interrumpió antes de guardarlos).
+        """
+        vigentes = {t["archivo"] for t in self._meta["tramos"]}
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(".bin") and nombre not in vigentes:
+                os.remove(os.path.join(self.directorio, nombre))
+
+    def actualizar(self, batch_size: int = TAM_LOTE) -> int | None:
+        """
+        Lee de UN.VENTAS solo las filas con ID_VENTA mayor que la marca y las agrega.
+        Retorna las filas agregadas, o None si no hay conexión.
+        """
+        conn = get_connection()
+        if conn is None:
+            print("No se pudo conectar a la base de datos para actualizar el índice.")
+            return None
+        try:
+            consulta = CONSULTA_NUEVAS.format(columna=self.columna)
+            return self.agregar(iter_batches(conn, consulta, batch_size, (self._meta["marca_id"],)))
+        finally:
+            conn.close()
+
+    # --- Consultas -----------------------------------------------------------
+
+    @property
+    def marca_id(self) -> int:
+        """
+        Mayor ID_VENTA incluido en el índice.
+        """
+        return self._meta["marca_id"]
+
+    def __len__(self) -> int:
+        return sum(t["n"] for t in self._meta["tramos"])
+
+    def posicion(self, valor: int) -> int:
+        """
+        Cantidad de valores menores que `valor` (su posición en la columna ordenada).
+        """
+        return sum(bisect_left(self._vista(t), valor) for t in self._meta["tramos"])
+
+    def contar_rango(self, desde: int, hasta: int) -> int:
+        """
+        Cantidad de valores v con desde <= v <= hasta.
+        """
+        return sum(
+            bisect_right(vista, hasta) - bisect_left(vista, desde)
+            for vista in map(self._vista, self._meta["tramos"])
+        )
+
+    def k_esimo(self, k: int) -> int:
+        """
+        Valor en la posición `k` (desde 0) de la columna ordenada.
+        Búsqueda binaria sobre los valores: el menor v con más de k valores <= v.
+        """
+        n = len(self)
+        if not 0 <= k < n:
+            raise IndexError(f"k = {k} fuera de rango para un índice de {n} valores.")
+        vistas = [self._vista(t) for t in self._meta["tramos"]]
+        bajo = min(vista[0] for vista in vistas)
+        alto = max(vista[-1] for vista in vistas)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if sum(bisect_right(vista, medio) for vista in vistas) > k:
+                alto = medio
+            else:
+                bajo = medio + 1
+        return bajo
+
+    def percentil(self, p: float) -> int:
+        """
+        Percentil `p` (0 a 100) por el método del rango más cercano.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError(f"El percentil debe estar entre 0 y 100, no {p}.")
+        return self.k_esimo(max(0, math.ceil(p / 100 * len(self)) - 1))
+
+    def valores_rango(self, desde: int, hasta: int) -> Iterator[int]:
+        """
+        Recorre en orden los valores v con desde <= v <= hasta.
+        """
+        tramos = []
+        for vista in map(self._vista, self._meta["tramos"]):
+            tramos.append(self._recorrer(vista, bisect_left(vista, desde), bisect_right(vista, hasta)))
+        return heapq.merge(*tramos)
+
+    @staticmethod
+    def _recorrer(vista: memoryview, inicio: int, fin: int) -> Iterator[int]:
+        """
+        Recorre vista[inicio:fin] copiando de a trozos, para no dejar vistas abiertas
+        sobre el tramo mapeado (que impedirían cerrarlo).
+        """
+        paso = MAX_BUFFER_TRAMO // 8
+        for i in range(inicio, fin, paso):
+            yield from vista[i:min(i + paso, fin)].tolist()
+
+    def iter_ordenados(self) -> Iterator[int]:
+        """
+        Recorre la columna completa en orden (mezcla de los tramos, sin ordenar de nuevo).
+        """
+        return heapq.merge(*(leer_tramo(self._ruta(t), MAX_BUFFER_TRAMO) for t in self._meta["tramos"]))
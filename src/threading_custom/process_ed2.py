@@ -0,0 +1,164 @@
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Dict, Iterable
+
+# Tipo de dato usado en la memoria compartida: entero con signo de 8 bytes.
+# Con 'q' cabe cualquier valor de CANTIDAD sin riesgo de desbordamiento.
+TIPO_ENTERO = "q"
+BYTES_ENTERO = array(TIPO_ENTERO).itemsize
+
+
+def crear_memoria_compartida(data: Iterable[int]) -> tuple[shared_memory.SharedMemory, int]:
+    """
+    Copia `data` una sola vez a un bloque de memoria compartida como enteros de 8 bytes.
+
+    Parámetros:
+    - data: Secuencia de enteros a compartir entre procesos.
+
+    Retorno:
+    - Tupla (shm, n): el bloque de memoria compartida y la cantidad de elementos escritos.
+      Quien crea el bloque es responsable de llamar a shm.close() y shm.unlink().
+    """
+    valores = array(TIPO_ENTERO, data)
+    n = len(valores)
+    # SharedMemory no admite tamaño 0, por eso reservamos al menos 1 byte
+    shm = shared_memory.SharedMemory(create=True, size=max(n * BYTES_ENTERO, 1))
+    shm.buf[:n * BYTES_ENTERO] = memoryview(valores).cast("B")
+    return shm, n
+
+
+def crear_memoria_salida(n: int) -> shared_memory.SharedMemory:
+    """
+    Reserva un bloque de memoria compartida con espacio para `n` enteros de 8 bytes,
+    donde un proceso trabajador dejará su lista ordenada.
+    """
+    return shared_memory.SharedMemory(create=True, size=max(n * BYTES_ENTERO, 1))
+
+
+def leer_memoria_compartida(shm: shared_memory.SharedMemory, n: int) -> List[int]:
+    """
+    Devuelve como lista de Python los primeros `n` enteros guardados en `shm`.
+    """
+    with shm.buf[:n * BYTES_ENTERO].cast(TIPO_ENTERO) as vista:
+        return vista.tolist()
+
+
+def ordenar_en_proceso(
+    algo_name: str,
+    nombre_entrada: str,
+    nombre_salida: str,
+    n: int,
+    backend: str = "python",
+    perfil: bool = False
+) -> Dict[str, float]:
+    """
+    Función que ejecuta cada proceso trabajador del pool.
+    Lee la lista de entrada desde memoria compartida, la ordena con el algoritmo
+    `algo_name` del backend `backend` y escribe el resultado en el bloque de salida.
+
+    Parámetros:
+    - algo_name:      Nombre del algoritmo en `Sort.algorithms` (p.ej. "QuickSort").
+    - nombre_entrada: Nombre del bloque de memoria compartida con los datos originales.
+    - nombre_salida:  Nombre del bloque donde se escribirá la lista ordenada.
+    - n:              Cantidad de elementos.
+    - backend:        Backend del registro `Sort.backends` ("python" o "numpy").
+    - perfil:         Si es True, el ordenamiento se perfila con cProfile en este proceso.
+
+    Retorno:
+    - Diccionario con "time" (tiempo de reloj en segundos), "cpu_time"
+      (tiempo de CPU consumido por este proceso durante el ordenamiento) y "perfil"
+      (el perfil capturado, o None).
+    """
+    # Importamos el registro dentro del trabajador: así la función viaja por nombre
+    # y cada proceso resuelve el algoritmo localmente (también funciona con 'spawn').
+    from sort_algorithms.Sort import get_algorithms
+    from instrumentacion.metricas import activar_perfiles, perfilar, registro
+    algorithms = get_algorithms(backend)
+    activar_perfiles(perfil)
+
+    shm_entrada = shared_memory.SharedMemory(name=nombre_entrada)
+    shm_salida = shared_memory.SharedMemory(name=nombre_salida)
+    try:
+        # 1. Cada proceso construye su propia lista a partir de la memoria compartida
+        data = leer_memoria_compartida(shm_entrada, n)
+
+        # 2. Medimos tiempo de reloj y tiempo de CPU del propio proceso
+        with perfilar(f"sort/{algo_name}"):
+            cpu_start = time.process_time()
+            start = time.perf_counter()
+            sorted_data = algorithms[algo_name](data)
+            elapsed = time.perf_counter() - start
+            cpu_elapsed = time.process_time() - cpu_start
+
+        # 3. Escribimos el resultado en el bloque de salida (sin pasar la lista por pickle)
+        with shm_salida.buf[:n * BYTES_ENTERO].cast(TIPO_ENTERO) as salida:
+            salida[:] = array(TIPO_ENTERO, sorted_data)
+    finally:
+        shm_entrada.close()
+        shm_salida.close()
+
+    # El registro de este proceso se pierde al terminar: el perfil vuelve con los tiempos
+    return {"time": elapsed, "cpu_time": cpu_elapsed, "perfil": registro.perfiles.get(f"sort/{algo_name}")}
+
+
+def run_sorts_in_processes(
+    data: List[int],
+    prefix: str,
+    algo_names: List[str],
+    max_workers: int | None = None,
+    backend: str = "python"
+) -> Dict[str, dict]:
+    """
+    Ordena `data` con cada algoritmo de `algo_names` en un pool de procesos.
+    La lista se copia una sola vez a memoria compartida; cada proceso la lee desde allí
+    en lugar de recibir una copia serializada con pickle.
+    Si los perfiles están activados, cada proceso perfila su ordenamiento y el perfil
+    queda en el registro de este proceso como "sort/<prefix>_<AlgorithmName>".
+
+    Parámetros:
+    - data:        Lista de enteros a ordenar.
+    - prefix:      Origen de los datos ("CSV" o "JSON"), usado para nombrar los resultados.
+    - algo_names:  Nombres de los algoritmos del registro `Sort.algorithms` a ejecutar.
+    - max_workers: Número de procesos del pool (por defecto, uno por algoritmo).
+    - backend:     Backend del registro `Sort.backends` ("python" o "numpy").
+
+    Retorna:
+    - Diccionario { "<prefix>_<AlgorithmName>": { "time", "cpu_time", "sorted" } }.
+    """
+    from instrumentacion import metricas
+    results: Dict[str, dict] = {}
+
+    # 1. Compartimos la entrada y reservamos un bloque de salida por algoritmo
+    shm_entrada, n = crear_memoria_compartida(data)
+    salidas = {algo_name: crear_memoria_salida(n) for algo_name in algo_names}
+
+    try:
+        # 2. Lanzamos un trabajo por algoritmo en el pool de procesos
+        with ProcessPoolExecutor(max_workers=max_workers or len(algo_names)) as pool:
+            futuros = {
+                algo_name: pool.submit(
+                    ordenar_en_proceso, algo_name, shm_entrada.name, shm_salida.name, n, backend,
+                    metricas.PERFIL_ACTIVO
+                )
+                for algo_name, shm_salida in salidas.items()
+            }
+
+            # 3. Recogemos tiempos y listas ordenadas en el orden del registro
+            for algo_name, futuro in futuros.items():
+                tiempos = futuro.result()
+                if tiempos["perfil"] is not None:
+                    metricas.registro.guardar_perfil(f"sort/{prefix}_{algo_name}", tiempos["perfil"])
+                results[f"{prefix}_{algo_name}"] = {
+                    "time": tiempos["time"],
+                    "cpu_time": tiempos["cpu_time"],
+                    "sorted": leer_memoria_compartida(salidas[algo_name], n)
+                }
+    finally:
+        # 4. Liberamos todos los bloques de memoria compartida
+        for shm in [shm_entrada, *salidas.values()]:
+            shm.close()
+            shm.unlink()
+
+    return results
@@ -1,16 +1,22 @@
 import time
 import threading
-from sort_algorithms.sort import algorithms
-from sockets.client_side import send_result
+from sort_algorithms.Sort import get_algorithms
+from sockets.reportero import reportar, vaciar_reportes
+from instrumentacion.metricas import registro, perfilar
+from threading_custom.process_ed2 import run_sorts_in_processes
 from typing import List, Dict, Callable
 
+# Modos de ejecución disponibles para run_sorts_in_threads
+EXECUTORS = ("threads", "processes", "sequential")
+
 def timed_sort(
     name: str,
     func: Callable[[List[int]], List[int]],
     data: List[int],
     results: Dict[str, dict],
     server_host: str,
-    server_port: int
+    server_port: int,
+    total: int | None = None
 ) -> None:
     """
     Ejecuta un algoritmo de ordenamiento sobre `data`, mide el tiempo que tarda,
@@ -24,15 +30,63 @@ def timed_sort(
     - data:         Lista de enteros que se va a ordenar. Se pasa una copia para no
                     alterar `data` en otros hilos.
     - results:      Diccionario compartido (global) donde guardaremos:
-                        results[name] = { "time": <float>, "sorted": <lista ordenada> }.
+                        results[name] = { "time": <float>, "cpu_time": <float>, "sorted": <lista ordenada> }.
                     Nota: dicho diccionario NO es thread-safe; estamos asumiendo
                     que no habrá conflictos de escritura concurrente en claves diferentes.
     - server_host:  IP o hostname del servidor de sockets.
     - server_port:  Puerto donde el servidor está escuchando.
+    - total:        Cantidad de algoritmos que se ejecutan para este origen (se informa al servidor).
     """
 
-    # 1. Separamos el prefijo (origen) y el nombre del algoritmo
-    #    Si name = "CSV_QuickSort", split obtiene ["CSV", "QuickSort"].
+    # 1. Medimos tiempo de reloj y tiempo de CPU del hilo actual.
+    #    perf_counter es monotónico y de alta resolución; thread_time solo cuenta
+    #    la CPU de este hilo, así que no incluye el trabajo de los demás hilos.
+    #    Con los perfiles activados (main.py --perfil) el algoritmo también se perfila.
+    with perfilar(f"sort/{name}"):
+        cpu_start = time.thread_time()
+        start = time.perf_counter()
+        sorted_data = func(data)  # Ejecuta el algoritmo sobre la copia de la lista
+        elapsed = time.perf_counter() - start
+        cpu_elapsed = time.thread_time() - cpu_start
+    registro.observar(f"sort/{name}", elapsed, cpu_elapsed)
+
+    # 2. Guardamos localmente en el diccionario `results`
+    #    Al terminar, results[name] contendrá {"time", "cpu_time", "sorted"}.
+    #    Esto permite consultar más tarde los tiempos y los datos ordenados.
+    results[name] = {
+        "time": elapsed,
+        "cpu_time": cpu_elapsed,
+        "sorted": sorted_data
+    }
+    print(f"[Thread:{name}] → Tiempo: {elapsed:.4f} s (CPU: {cpu_elapsed:.4f} s)")
+
+    # 3. Reportamos al servidor de sockets solo la información necesaria.
+    #    El envío lo hace el hilo reportero en segundo plano: este hilo no espera la red.
+    report_result(name, elapsed, server_host, server_port, total)
+
+
+def report_result(
+    name: str,
+    elapsed: float,
+    server_host: str,
+    server_port: int,
+    total: int | None = None
+) -> None:
+    """
+    Encola para el servidor de sockets el tiempo de un ordenamiento
+    (lo envía el hilo reportero, ver sockets.reportero).
+    Solo se envía origen (CSV/JSON), algoritmo ("QuickSort", ...) y tiempo (float);
+    NO enviamos la lista completa para no saturar la red con datos grandes.
+
+    Parámetros:
+    - name:         Cadena con el formato "<prefix>_<AlgorithmName>" (p.ej. "CSV_QuickSort").
+    - elapsed:      Tiempo de ejecución en segundos.
+    - server_host:  IP o hostname del servidor de sockets.
+    - server_port:  Puerto donde el servidor está escuchando.
+    - total:        Cantidad de algoritmos que se ejecutan para este origen.
+    """
+    # Separamos el prefijo (origen) y el nombre del algoritmo
+    # Si name = "CSV_QuickSort", split obtiene ["CSV", "QuickSort"].
     if "_" in name:
         origen, algoritmo = name.split("_", 1)
     else:
@@ -40,30 +94,13 @@ def timed_sort(
         origen = "UNKNOWN"
         algoritmo = name
 
-    # 2. Medimos tiempo de ejecución del algoritmo
-    start = time.time()
-    sorted_data = func(data)  # Ejecuta el algoritmo sobre la copia de la lista
-    end = time.time()
-    elapsed = end - start
-
-    # 3. Guardamos localmente en el diccionario `results`
-    #    Al terminar, results[name] contendrá {"time": elapsed, "sorted": sorted_data}.
-    #    Esto permite consultar más tarde los tiempos y los datos ordenados.
-    results[name] = {
-        "time": elapsed,
-        "sorted": sorted_data
-    }
-    print(f"[Thread:{name}] → Tiempo: {elapsed:.4f} s")
-
-    # 4. Enviamos al servidor de sockets solo la información necesaria:
-    #    origen (CSV/JSON), algoritmo ("QuickSort", ...), y tiempo (float).
-    #    NO enviamos la lista completa para no saturar la red con datos grandes.
-    send_result(
+    reportar(
         origen=origen,
         algoritmo=algoritmo,
         tiempo=elapsed,
         server_host=server_host,
-        server_port=server_port
+        server_port=server_port,
+        total=total
     )
 
 
@@ -71,11 +108,22 @@ def run_sorts_in_threads(
     data: List[int],
     prefix: str,
     server_host: str = "127.0.0.1",
-    server_port: int = 5000
+    server_port: int = 5000,
+    executor: str = "threads",
+    max_workers: int | None = None,
+    backend: str = "python"
 ) -> Dict[str, dict]:
     """
-    Lanza múltiples hilos para ordenar la misma lista `data` con cada uno de los algoritmos
-    disponibles: QuickSort, MergeSort, CountingSort y RadixSort. Cada hilo invoca a timed_sort().
+    Ordena la misma lista `data` con cada uno de los algoritmos disponibles:
+    QuickSort, MergeSort, CountingSort y RadixSort, más las variantes in-place
+    (QuickSortInPlace y MergeSortInPlace) en el backend "python".
+
+    Según `executor`:
+    - "threads":    un hilo por algoritmo; cada hilo invoca a timed_sort(). Como los algoritmos
+                    son Python puro, el GIL serializa los hilos y los tiempos se contaminan.
+    - "processes":  un pool de procesos; `data` se comparte una sola vez mediante memoria
+                    compartida (ver threading_custom.process_ed2). Tiempos comparables entre sí.
+    - "sequential": un algoritmo tras otro en el hilo actual, sin concurrencia.
 
     Parámetros:
     - data:         Lista de enteros a ordenar.
@@ -83,21 +131,48 @@ def run_sorts_in_threads(
                     nombrar los hilos y distinguir los resultados.
     - server_host:  IP o hostname del servidor de sockets (por defecto "127.0.0.1").
     - server_port:  Puerto donde el servidor está escuchando (por defecto 5000).
+    - executor:     "threads" (por defecto), "processes" o "sequential".
+    - max_workers:  Número de procesos del pool en modo "processes" (por defecto, uno por algoritmo).
+    - backend:      Implementación de los algoritmos en `Sort.backends` ("python" o "numpy").
 
     Retorna:
     - results: Diccionario con la siguiente estructura:
         {
-            "CSV_QuickSort":    { "time": <float>, "sorted": <list[int]> },
+            "CSV_QuickSort":    { "time": <float>, "cpu_time": <float>, "sorted": <list[int]> },
             "CSV_MergeSort":    { ... },
             "CSV_CountingSort": { ... },
             "CSV_RadixSort":    { ... }
         }
-      donde cada clave es "<prefix>_<AlgorithmName>".
+      donde cada clave es "<prefix>_<AlgorithmName>", "time" es el tiempo de reloj y
+      "cpu_time" el tiempo de CPU del hilo o proceso que ejecutó el algoritmo.
     """
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor debe ser uno de {EXECUTORS}, no {executor!r}.")
+    algorithms = get_algorithms(backend)
+
+    # Modo procesos: cada algoritmo corre en su propio proceso, sin competir por el GIL
+    if executor == "processes":
+        results = run_sorts_in_processes(data, prefix, list(algorithms), max_workers, backend)
+        for name, info in results.items():
+            print(f"[Process:{name}] → Tiempo: {info['time']:.4f} s (CPU: {info['cpu_time']:.4f} s)")
+            registro.observar(f"sort/{name}", info["time"], info["cpu_time"])
+            report_result(name, info["time"], server_host, server_port, len(algorithms))
+        vaciar_reportes()
+        return results
 
     # Este diccionario contendrá el tiempo y array ordenado de cada hilo.
     results: Dict[str, dict] = {}
 
+    # Modo secuencial: un algoritmo tras otro, sin hilos
+    if executor == "sequential":
+        for algo_name, func in algorithms.items():
+            timed_sort(
+                f"{prefix}_{algo_name}", func, data.copy(), results,
+                server_host, server_port, len(algorithms)
+            )
+        vaciar_reportes()
+        return results
+
     # Lista para almacenar los objetos Thread creados
     threads: List[threading.Thread] = []
 
@@ -110,7 +185,7 @@ def run_sorts_in_threads(
         copia_data = data.copy()  # Copia superficial de la lista original
         hilo = threading.Thread(
             target=timed_sort,
-            args=(full_name, func, copia_data, results, server_host, server_port)
+            args=(full_name, func, copia_data, results, server_host, server_port, len(algorithms))
         )
         threads.append(hilo)
 
@@ -122,7 +197,10 @@ def run_sorts_in_threads(
     for hilo in threads:
         hilo.join()
 
-    # 4. Al salir de aquí, `results` contendrá todos los tiempos y arrays ordenados
+    # 4. Esperamos a que el reportero envíe todos los resultados (fuera de la medición)
+    vaciar_reportes()
+
+    # 5. Al salir de aquí, `results` contendrá todos los tiempos y arrays ordenados
     return results
 
 